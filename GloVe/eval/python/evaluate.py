@@ -1,52 +1,133 @@
 import argparse
+import json
 import numpy as np
+import os
+import time
+from multiprocessing import Pool
+
+FILENAMES = [
+    'capital-common-countries.txt', 'capital-world.txt', 'currency.txt',
+    'city-in-state.txt', 'family.txt', 'gram1-adjective-to-adverb.txt',
+    'gram2-opposite.txt', 'gram3-comparative.txt', 'gram4-superlative.txt',
+    'gram5-present-participle.txt', 'gram6-nationality-adjective.txt',
+    'gram7-past-tense.txt', 'gram8-plural.txt', 'gram9-plural-verbs.txt',
+    ]
+PREFIX = './eval/question-data/'
+
+# to avoid memory overflow, the similarity matrix of a block of questions
+# is limited to this number of float32 entries (~128MB); can be overwritten
+# with --split_size
+MAX_BLOCK_ENTRIES = 2 ** 25
+
+# shared with the worker processes, see init_worker()
+W = None
+vocab = None
+split_size = None
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--vocab_file', default='vocab.txt', type=str)
     parser.add_argument('--vectors_file', default='vectors.txt', type=str)
+    parser.add_argument('--split_size', default=None, type=int,
+                        help='number of questions evaluated at once')
+    parser.add_argument('--num_workers', default=os.cpu_count(), type=int,
+                        help='number of question files evaluated in parallel')
+    parser.add_argument('--restrict_vocab', default=None, type=int,
+                        help='only use the N most frequent words, as questions '
+                        'and as answers')
+    parser.add_argument('--output_file', default=None, type=str,
+                        help='JSON file to write the results to')
     args = parser.parse_args()
 
-    with open(args.vocab_file, 'r') as f:
-        words = [x.rstrip().split(' ')[0] for x in f.readlines()]
-    with open(args.vectors_file, 'r') as f:
-        vectors = {}
-        for line in f:
-            vals = line.rstrip().split(' ')
-            vectors[vals[0]] = [float(x) for x in vals[1:]]
-
-    vocab_size = len(words)
+    W_norm, vocab = load_vectors(args.vocab_file, args.vectors_file,
+                                 args.restrict_vocab)
+    results = evaluate_vectors(W_norm, vocab, args.split_size,
+                               args.num_workers)
+
+    if args.output_file:
+        results['vectors_file'] = args.vectors_file
+        results['restrict_vocab'] = args.restrict_vocab
+        with open(args.output_file, 'w') as f:
+            json.dump(results, f, indent=4)
+
+def load_vectors(vocab_file, vectors_file, restrict_vocab=None):
+    """Read the vectors in vocabulary order into a normalized float32 matrix
+
+    If restrict_vocab is given, only the first restrict_vocab words of the
+    vocabulary (which is sorted by frequency) are kept.
+    """
+    with open(vocab_file, 'r') as f:
+        words = [x.rstrip().split(' ')[0] for x in f]
+    if restrict_vocab is not None:
+        words = words[:restrict_vocab]
     vocab = {w: idx for idx, w in enumerate(words)}
-    ivocab = {idx: w for idx, w in enumerate(words)}
 
-    vector_dim = len(vectors[ivocab[0]])
-    W = np.zeros((vocab_size, vector_dim))
-    for word, v in vectors.items():
-        if word == '<unk>':
-            continue
-        W[vocab[word], :] = v
+    W = None
+    with open(vectors_file, 'r') as f:
+        for line in f:
+            word, values = line.rstrip().split(' ', 1)
+            if word not in vocab:
+                # skips '<unk>'
+                continue
+            v = np.fromstring(values, dtype=np.float32, sep=' ')
+            if W is None:
+                W = np.zeros((len(words), len(v)), dtype=np.float32)
+            W[vocab[word], :] = v
 
     # normalize each word vector to unit length
-    W_norm = np.zeros(W.shape)
-    d = (np.sum(W ** 2, 1) ** (0.5))
-    W_norm = (W.T / d).T
-    evaluate_vectors(W_norm, vocab)
-
-def evaluate_vectors(W, vocab):
-    """Evaluate the trained word vectors on a variety of tasks"""
-
-    filenames = [
-        'capital-common-countries.txt', 'capital-world.txt', 'currency.txt',
-        'city-in-state.txt', 'family.txt', 'gram1-adjective-to-adverb.txt',
-        'gram2-opposite.txt', 'gram3-comparative.txt', 'gram4-superlative.txt',
-        'gram5-present-participle.txt', 'gram6-nationality-adjective.txt',
-        'gram7-past-tense.txt', 'gram8-plural.txt', 'gram9-plural-verbs.txt',
-        ]
-    prefix = './eval/question-data/'
-
-    # to avoid memory overflow, could be increased/decreased
-    # depending on system and vocab size
-    split_size = 100
+    d = np.sqrt(np.sum(W ** 2, 1))
+    d[d == 0] = 1
+    W /= d[:, np.newaxis]
+    return (W, vocab)
+
+def init_worker(W_shared, vocab_shared, split_size_shared):
+    global W, vocab, split_size
+    W = W_shared
+    vocab = vocab_shared
+    split_size = split_size_shared
+
+def evaluate_file(filename):
+    """Answer all questions of a single file, return the counts of the file"""
+    start_time = time.time()
+    with open('%s/%s' % (PREFIX, filename), 'r') as f:
+        full_data = [line.rstrip().split(' ') for line in f]
+        data = [x for x in full_data if all(word in vocab for word in x)]
+
+    if len(data) == 0:
+        return (filename, full_data, 0, 0, time.time() - start_time)
+
+    indices = np.array([[vocab[word] for word in row] for row in data])
+    ind1, ind2, ind3, ind4 = indices.T
+
+    block_size = split_size or max(1, MAX_BLOCK_ENTRIES // W.shape[0])
+    predictions = np.zeros((len(indices),), dtype=np.int64)
+    for start in range(0, len(indices), block_size):
+        subset = np.arange(start, min(start + block_size, len(indices)))
+
+        pred_vec = W[ind2[subset], :] - W[ind1[subset], :] + W[ind3[subset], :]
+        # cosine similarity if input W has been normalized
+        dist = np.dot(pred_vec, W.T)
+
+        # exclude the question words from the answers
+        rows = np.arange(len(subset))
+        dist[rows, ind1[subset]] = -np.inf
+        dist[rows, ind2[subset]] = -np.inf
+        dist[rows, ind3[subset]] = -np.inf
+
+        # predicted word index
+        predictions[subset] = np.argmax(dist, 1)
+
+    val = (ind4 == predictions) # correct predictions
+    return (filename, full_data, len(val), int(np.sum(val)),
+            time.time() - start_time)
+
+def evaluate_vectors(W, vocab, split_size=None, num_workers=1):
+    """Evaluate the trained word vectors on a variety of tasks
+
+    Return the results of each category and in total as dictionary.
+    """
+    start_time = time.time()
+    categories = {}
 
     correct_sem = 0; # count correct semantic questions
     correct_syn = 0; # count correct syntactic questions
@@ -56,51 +137,44 @@ def evaluate_vectors(W, vocab):
     count_tot = 0 # count all questions
     full_count = 0 # count all questions, including those with unknown words
 
-    for i in range(len(filenames)):
-        with open('%s/%s' % (prefix, filenames[i]), 'r') as f:
-            full_data = [line.rstrip().split(' ') for line in f]
-            full_count += len(full_data)
-            data = [x for x in full_data if all(word in vocab for word in x)]
-
-        if len(data) == 0:
-            print("ERROR: no lines of vocab kept for %s !" % filenames[i])
+    # the worker processes inherit the vectors instead of receiving a copy
+    init_worker(W, vocab, split_size)
+    num_workers = max(1, min(num_workers or 1, len(FILENAMES)))
+    if num_workers > 1:
+        pool = Pool(num_workers, initializer=init_worker,
+                    initargs=(W, vocab, split_size))
+        results = pool.imap(evaluate_file, FILENAMES)
+    else:
+        pool = None
+        results = map(evaluate_file, FILENAMES)
+
+    for i, (filename, full_data, count, correct, seconds) in enumerate(results):
+        full_count += len(full_data)
+        categories[filename[:-len('.txt')]] = {
+            'accuracy': correct / float(count) if count else None,
+            'correct': correct, 'seen': count, 'total': len(full_data),
+            'seconds': seconds}
+        if count == 0:
+            print("ERROR: no lines of vocab kept for %s !" % filename)
             print("Example missing line:", full_data[0])
             continue
 
-        indices = np.array([[vocab[word] for word in row] for row in data])
-        ind1, ind2, ind3, ind4 = indices.T
-
-        predictions = np.zeros((len(indices),))
-        num_iter = int(np.ceil(len(indices) / float(split_size)))
-        for j in range(num_iter):
-            subset = np.arange(j*split_size, min((j + 1)*split_size, len(ind1)))
-
-            pred_vec = (W[ind2[subset], :] - W[ind1[subset], :]
-                +  W[ind3[subset], :])
-            #cosine similarity if input W has been normalized
-            dist = np.dot(W, pred_vec.T)
-
-            for k in range(len(subset)):
-                dist[ind1[subset[k]], k] = -np.Inf
-                dist[ind2[subset[k]], k] = -np.Inf
-                dist[ind3[subset[k]], k] = -np.Inf
-
-            # predicted word index
-            predictions[subset] = np.argmax(dist, 0).flatten()
-
-        val = (ind4 == predictions) # correct predictions
-        count_tot = count_tot + len(ind1)
-        correct_tot = correct_tot + sum(val)
+        count_tot = count_tot + count
+        correct_tot = correct_tot + correct
         if i < 5:
-            count_sem = count_sem + len(ind1)
-            correct_sem = correct_sem + sum(val)
+            count_sem = count_sem + count
+            correct_sem = correct_sem + correct
         else:
-            count_syn = count_syn + len(ind1)
-            correct_syn = correct_syn + sum(val)
+            count_syn = count_syn + count
+            correct_syn = correct_syn + correct
 
-        print("%s:" % filenames[i])
+        print("%s:" % filename)
         print('ACCURACY TOP1: %.2f%% (%d/%d)' %
-            (np.mean(val) * 100, np.sum(val), len(val)))
+            (100 * correct / float(count), correct, count))
+
+    if pool is not None:
+        pool.close()
+        pool.join()
 
     print('Questions seen/total: %.2f%% (%d/%d)' %
         (100 * count_tot / float(full_count), count_tot, full_count))
@@ -110,6 +184,16 @@ def evaluate_vectors(W, vocab):
         (100 * correct_syn / float(count_syn), correct_syn, count_syn))
     print('Total accuracy: %.2f%%  (%i/%i)' % (100 * correct_tot / float(count_tot), correct_tot, count_tot))
 
+    return {
+        'categories': categories,
+        'semantic': {'accuracy': correct_sem / float(count_sem) if count_sem else None,
+                     'correct': correct_sem, 'seen': count_sem},
+        'syntactic': {'accuracy': correct_syn / float(count_syn) if count_syn else None,
+                      'correct': correct_syn, 'seen': count_syn},
+        'total': {'accuracy': correct_tot / float(count_tot) if count_tot else None,
+                  'correct': correct_tot, 'seen': count_tot, 'total': full_count},
+        'seconds': time.time() - start_time}
+
 
 if __name__ == "__main__":
     main()
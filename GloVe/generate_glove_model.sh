@@ -14,6 +14,9 @@ generate_glove_model () {
     VOCAB_FILE=$OUTPUT_DIR/$PREFIX-vocab.txt
     COOCCURRENCE_FILE=$OUTPUT_DIR/$PREFIX-cooccurrence.bin
     COOCCURRENCE_SHUF_FILE=$OUTPUT_DIR/$PREFIX-cooccurrence.shuf.bin
+    # Temporary files of cooccur and shuffle, per model, so that models can be generated concurrently
+    OVERFLOW_FILE=$OUTPUT_DIR/$PREFIX-overflow
+    TEMP_SHUFFLE_FILE=$OUTPUT_DIR/$PREFIX-temp_shuffle
     BUILDDIR=build
     SAVE_FILE=$OUTPUT_DIR/$PREFIX-vectors
     VERBOSE=2
@@ -25,6 +28,9 @@ generate_glove_model () {
     BINARY=2
     NUM_THREADS=8
     X_MAX=10
+    # Set EVAL_RESTRICT_VOCAB (e.g. to 30000) to evaluate analogies on the most frequent words only
+    EVAL_RESTRICT_VOCAB=${EVAL_RESTRICT_VOCAB:-}
+    EVAL_FILE=$SAVE_FILE-evaluation.json
     if hash python 2>/dev/null; then
         PYTHON=python
     else
@@ -34,14 +40,14 @@ generate_glove_model () {
     echo
     echo "$ $BUILDDIR/vocab_count -min-count $VOCAB_MIN_COUNT -verbose $VERBOSE < $CORPUS > $VOCAB_FILE"
     $BUILDDIR/vocab_count -min-count $VOCAB_MIN_COUNT -verbose $VERBOSE < $CORPUS > $VOCAB_FILE
-    echo "$ $BUILDDIR/cooccur -memory $MEMORY -vocab-file $VOCAB_FILE -verbose $VERBOSE -window-size $WINDOW_SIZE < $CORPUS > $COOCCURRENCE_FILE"
-    $BUILDDIR/cooccur -memory $MEMORY -vocab-file $VOCAB_FILE -verbose $VERBOSE -window-size $WINDOW_SIZE < $CORPUS > $COOCCURRENCE_FILE
-    echo "$ $BUILDDIR/shuffle -memory $MEMORY -verbose $VERBOSE < $COOCCURRENCE_FILE > $COOCCURRENCE_SHUF_FILE"
-    $BUILDDIR/shuffle -memory $MEMORY -verbose $VERBOSE < $COOCCURRENCE_FILE > $COOCCURRENCE_SHUF_FILE
+    echo "$ $BUILDDIR/cooccur -memory $MEMORY -vocab-file $VOCAB_FILE -verbose $VERBOSE -window-size $WINDOW_SIZE -overflow-file $OVERFLOW_FILE < $CORPUS > $COOCCURRENCE_FILE"
+    $BUILDDIR/cooccur -memory $MEMORY -vocab-file $VOCAB_FILE -verbose $VERBOSE -window-size $WINDOW_SIZE -overflow-file $OVERFLOW_FILE < $CORPUS > $COOCCURRENCE_FILE
+    echo "$ $BUILDDIR/shuffle -memory $MEMORY -verbose $VERBOSE -temp-file $TEMP_SHUFFLE_FILE < $COOCCURRENCE_FILE > $COOCCURRENCE_SHUF_FILE"
+    $BUILDDIR/shuffle -memory $MEMORY -verbose $VERBOSE -temp-file $TEMP_SHUFFLE_FILE < $COOCCURRENCE_FILE > $COOCCURRENCE_SHUF_FILE
     echo "$ $BUILDDIR/glove -save-file $SAVE_FILE -threads $NUM_THREADS -input-file $COOCCURRENCE_SHUF_FILE -x-max $X_MAX -iter $MAX_ITER -vector-size $VECTOR_SIZE -binary $BINARY -vocab-file $VOCAB_FILE -verbose $VERBOSE"
     $BUILDDIR/glove -save-file $SAVE_FILE -threads $NUM_THREADS -input-file $COOCCURRENCE_SHUF_FILE -x-max $X_MAX -iter $MAX_ITER -vector-size $VECTOR_SIZE -binary $BINARY -vocab-file $VOCAB_FILE -verbose $VERBOSE
 
 
-    echo "$ $PYTHON eval/python/evaluate.py"
-    $PYTHON eval/python/evaluate.py --vocab_file $VOCAB_FILE --vectors_file $SAVE_FILE.txt
+    echo "$ $PYTHON eval/python/evaluate.py --vocab_file $VOCAB_FILE --vectors_file $SAVE_FILE.txt --num_workers $NUM_THREADS --output_file $EVAL_FILE ${EVAL_RESTRICT_VOCAB:+--restrict_vocab $EVAL_RESTRICT_VOCAB}"
+    $PYTHON eval/python/evaluate.py --vocab_file $VOCAB_FILE --vectors_file $SAVE_FILE.txt --num_workers $NUM_THREADS --output_file $EVAL_FILE ${EVAL_RESTRICT_VOCAB:+--restrict_vocab $EVAL_RESTRICT_VOCAB}
 }
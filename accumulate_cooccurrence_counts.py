@@ -1,120 +1,110 @@
 import argparse
-import json
 import logging
 
+from os import path
+
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.lexicons import WEAT_TESTS_PATH, load_cooccurrence_tests
+from sbeval.results import (
+    COOCCURRENCE_RESULTS_PATTERN, accumulate_results_files, cooccurrence_results_files)
+
+# Columns of the accumulated table; one row per results file, test and target lexicon. Results files
+# are identified by their absolute path, since files of different corpora can have the same name
+COLUMNS = [
+    "corpus", "test", "target", "target_group", "association_a", "association_b",
+    "results_file"]
+
+
+def read_table(file_path: str):
+    """Read the accumulated table from a CSV or Parquet file, depending on its extension."""
+    if path.splitext(file_path)[1] == ".parquet":
+        return pd.read_parquet(file_path)
+
+    return pd.read_csv(file_path)
+
+
+def write_table(table, file_path: str) -> None:
+    """Write the accumulated table to a CSV or Parquet file, depending on its extension."""
+    if path.splitext(file_path)[1] == ".parquet":
+        table.to_parquet(file_path, index=False)
+    else:
+        table.to_csv(file_path, index=False)
 
 
 def main():
-    # Read evaluations file
-    with open(args.input, "r", encoding="utf-8") as f:
-        results = json.load(f)
-
-    # Read WEAT lexicons
-    with open(args.weat_lexicons, "r", encoding="utf-8") as f:
-        weat_tests = json.load(f)
-
-    logging.info(f"Printing accumulated results for corpus '{results['corpus']}'.")
-
-    # For each test result...
-    for test in results.keys():
-        # If the current key is "corpus", we can safely skip it
-        if test == "corpus":
-            continue
-
-        # Some of the lexicons have swapped attribute/target sets; in those cases, the tests might
-        # need special treatment
-        swapped_test_lexicons = ["test7", "test8"]
-
-        print("\n\n" + "=" * 45)
-        print(f"Current test: {test}")
-        print("-" * 45)
-
-        # Adopt the printed output to swapped tests
-        if test in swapped_test_lexicons:
-            target_descriptions = weat_tests[test]["attribute_words"].split(" vs. ")
-        else:
-            target_descriptions = weat_tests[test]["target_words"].split(" vs. ")
-
-        # For each target lexicon
-        for i, target in enumerate(results[test].keys()):
-            print(target, target_descriptions[i])
-
-            # For swapped lexicons, we also need to swap the X and Y groups before we lowercase all
-            # words
-            if test in swapped_test_lexicons:
-                if target == "X":
-                    all_target_words = [w.lower() for w in weat_tests[test]["A"] if w.lower()]
-                elif target == "Y":
-                    all_target_words = [w.lower() for w in weat_tests[test]["B"] if w.lower()]
-            else:
-                all_target_words = [w.lower() for w in weat_tests[test][target] if w.lower()]
-
-            # Collect all target words for which to accumulate the results from
-            relevant_target_keys = [
-                p for p in results[test][target].keys() if p in all_target_words]
-
-            target_total_pleasant = 0
-            target_total_unpleasant = 0
-
-            # Accumulate the counts for each of the target words identified above
-            for word_key in relevant_target_keys:
-                # Again, we need to treat the swapped lexicons as special case here
-                if test in swapped_test_lexicons:
-                    relevant_pleasant_words = [
-                        w.lower()
-                        for w in weat_tests[test]["X"]
-                        if w.lower() in results[test][target][word_key]]
-                    relevant_unpleasant_words = [
-                        w.lower()
-                        for w in weat_tests[test]["Y"]
-                        if w.lower() in results[test][target][word_key]]
-                else:
-                    relevant_pleasant_words = [
-                        w.lower()
-                        for w in weat_tests[test]["A"]
-                        if w.lower() in results[test][target][word_key]]
-                    relevant_unpleasant_words = [
-                        w.lower()
-                        for w in weat_tests[test]["B"]
-                        if w.lower() in results[test][target][word_key]]
-
-                # Add up all counts
-                pleasant_counts = sum([
-                    results[test][target][word_key][p_word]
-                    for p_word in relevant_pleasant_words])
-                unpleasant_counts = sum([
-                    results[test][target][word_key][u_word]
-                    for u_word in relevant_unpleasant_words])
-
-                target_total_pleasant += pleasant_counts
-                target_total_unpleasant += unpleasant_counts
-
-            # Print results to the console
-            print("Association-A:Association-B")
-            print(f"{target_total_pleasant}:{target_total_unpleasant}")
+    # Read and normalize the WEAT lexicons only once; the target and association words of the tests
+    # that switch them are switched back, as in the results files
+    weat_tests = load_cooccurrence_tests(file_path=args.weat_lexicons)
+
+    # Only results files that are not in the existing table yet need to be accumulated
+    table = None
+    known_files = set()
+    if args.output and path.isfile(args.output) and not args.rebuild:
+        table = read_table(args.output)
+        known_files = set(table["results_file"])
+        logging.info(f"Updating the table at {args.output} with {len(known_files)} results files.")
+
+        # Tables that identify results files by their name only can't be updated reliably
+        if not all(path.isabs(file_path) for file_path in known_files):
+            logging.warning(f"Rebuilding the table at {args.output}, since it lacks full paths.")
+            table = None
+            known_files = set()
+
+    rows = accumulate_results_files(
+        cooccurrence_results_files(args.input), weat_tests, known_files)
+
+    new_rows = pd.DataFrame(rows, columns=COLUMNS)
+    if len(new_rows) == 0:
+        logging.info("No new results files found.")
+    else:
+        print(new_rows.drop(columns="results_file").to_string(index=False))
+
+    if args.output:
+        table = pd.concat([table, new_rows]) if table is not None else new_rows
+        table = table.sort_values(["corpus", "test", "target", "results_file"])
+
+        logging.info(f"Exporting table to disk at {args.output}.")
+        write_table(table, args.output)
 
 
 if __name__ == "__main__":
     # Add cli parameters
     parser = argparse.ArgumentParser(
-        "A script to accumulate the weat co-occurrence counts.")
+        "A script to accumulate the weat co-occurrence counts of any number of corpora into a "
+        "single table.")
     parser.add_argument(
         "--input",
         "-i",
         required=True,
-        help="Path to the co-occurrence analysis results file.",
-        metavar="INPUT_FILE")
+        nargs="+",
+        help="Paths to co-occurrence analysis results files or to directories that contain them "
+             f"(as '{COOCCURRENCE_RESULTS_PATTERN}').",
+        metavar="INPUT")
     parser.add_argument(
         "--weat_lexicons",
         "-t",
-        required=True,
+        default=WEAT_TESTS_PATH,
         help="Path to the file that specifies the WEAT lexicons.",
         metavar="WEAT_LEXICONS")
+    parser.add_argument(
+        "--output",
+        "-o",
+        default=None,
+        help="Path to the table of the accumulated counts, as '.csv' or '.parquet' file. If it "
+             "exists already, only the counts of new results files are added. If not given, the "
+             "counts are only printed to the console.",
+        metavar="OUTPUT_FILE")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Accumulate all results files again, instead of updating an existing table.")
 
     args = parser.parse_args()
 
     logging.basicConfig(**LOGGING_CONFIG)
 
+    # Imported only now, so that '--help' does not need to wait for pandas
+    import pandas as pd
+
     main()
     print("Done.")
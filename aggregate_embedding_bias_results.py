@@ -0,0 +1,79 @@
+import argparse
+import logging
+
+from glob import glob
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.results import (
+    EVALUATION_RESULTS_PATTERN, aggregate_split_scores, iter_weat_scores, unique_results_file)
+
+
+def main():
+    trace = Trace("aggregate_embedding_bias_results", vars(args))
+
+    # Later runs of the same model replace earlier ones, so files are read in order of modification
+    results_files = sorted(
+        (f for f in glob(path.join(args.input, EVALUATION_RESULTS_PATTERN))
+         if not f.endswith(".trace.json")),
+        key=path.getmtime)
+
+    logging.info(f"Reading {len(results_files)} results files from {args.input}.")
+    with trace.stage("loading") as stage:
+        scores = pd.DataFrame(list(iter_weat_scores(results_files)))
+        stage.items = len(results_files)
+
+    if len(scores) == 0:
+        logging.error(f"No results files found in {args.input}.")
+        return
+
+    with trace.stage("aggregation") as stage:
+        aggregated = aggregate_split_scores(scores)
+        stage.items = len(scores)
+
+    print(aggregated.to_string(index=False))
+
+    # Export the results to disk
+    output_file = unique_results_file(
+        args.output, "embedding_bias_aggregation_results", extension=".csv")
+    logging.info(f"Exporting results to disk at {output_file}.")
+    aggregated.to_csv(output_file, index=False)
+
+    trace.save(output_file)
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to aggregate the WEAT scores of the models of the splits of each corpus, to "
+        "assess the stability of the results.")
+
+    parser.add_argument(
+        "-i",
+        "--input",
+        default=path.join("output", "embedding_model_evaluation"),
+        type=str,
+        help="Path to the directory with the results files of 'embedding_bias_evaluation.py'.",
+        metavar="INPUT_DIR")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=path.join("output", "stability_tests"),
+        type=str,
+        help="Path to the directory where the result file should be saved to.",
+        metavar="OUTPUT_DIR")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    # Imported only now, so that '--help' does not need to wait for pandas
+    import pandas as pd
+
+    with profiled(args.profile, "aggregate_embedding_bias_results"):
+        main()
+    print("Done.")
@@ -1,24 +1,7 @@
 #! /bin/bash
 
-# Add the number of tokens and the vector dimension to all full models
-for MODEL in ./output/glove/*-vectors.txt
-do
-    echo ""
-    echo -e "\e[1;31m================================================================================\e[0m"
-    echo -e "\e[1;31mConverting ${MODEL}...\e[0m"
-
-    MODEL_PATH="${MODEL}"
-    sed -i "1s/^/$(echo $(cat ${MODEL} | wc -l)) 300\n/" $MODEL
-done
-
-
-# Add the number of tokens and the vector dimension to all split models
-for MODEL in ./output/glove/splits/*-vectors.txt
-do
-    echo ""
-    echo -e "\e[1;31m================================================================================\e[0m"
-    echo -e "\e[1;31mConverting ${MODEL}...\e[0m"
-
-    MODEL_PATH="${MODEL}"
-    sed -i "1s/^/$(echo $(cat ${MODEL} | wc -l)) 300\n/" $MODEL
-done
+# Convert all full and split models to the binary word2vec format; the text files are kept as they
+# are and can still be evaluated directly
+python convert_glove_vectors.py \
+    --input ./output/glove/*-vectors.txt ./output/glove/splits/*-vectors.txt \
+    --format word2vec
@@ -0,0 +1,61 @@
+import argparse
+import logging
+
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.glove_files import convert_text_vectors
+
+# File extensions of the output formats
+OUTPUT_EXTENSIONS = {"word2vec": ".w2v.bin", "npy": ".npy"}
+
+
+def main():
+    for input_file in args.input:
+        output_file = f"{path.splitext(input_file)[0]}{OUTPUT_EXTENSIONS[args.format]}"
+
+        # Skip files that have already been converted since their last change
+        if not args.force and path.isfile(output_file) \
+                and path.getmtime(output_file) >= path.getmtime(input_file):
+            logging.info(f"'{output_file}' is up to date. Skipping.")
+            continue
+
+        logging.info(f"Converting '{input_file}' to '{output_file}'...")
+        n_vectors = convert_text_vectors(input_file, output_file, args.format)
+        logging.info(f"Converted {n_vectors} vectors.")
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to convert word vector files in GloVe (or word2vec) text format to the binary "
+        "word2vec or the numpy format, which both load considerably faster. The input files are "
+        "left untouched, so it is safe to run the script multiple times.")
+
+    parser.add_argument(
+        "--input",
+        "-i",
+        required=True,
+        nargs="+",
+        type=str,
+        help="Paths to the vector files to convert (whitespace separated).",
+        metavar="VECTOR_FILES")
+    parser.add_argument(
+        "--format",
+        "-f",
+        default="word2vec",
+        choices=list(OUTPUT_EXTENSIONS.keys()),
+        help="The output format. 'word2vec' writes '<name>.w2v.bin' files, 'npy' writes float32 "
+             "matrices as '<name>.npy' and their words as '<name>.words.txt'.",
+        metavar="FORMAT")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Whether to convert files even if the converted file is newer than the input.")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    main()
+    print("Done.")
@@ -0,0 +1,182 @@
+import argparse
+import json
+import logging
+import numpy as np
+
+from datetime import datetime
+from itertools import combinations
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.weat_test import effect_sizes, joint_associations, weat_difference_test
+from sbeval.word_vectors import CustomEmbeddings
+
+
+def load_lexicon_vectors(embedding_model: str, tokens: set) -> dict:
+    """Load the given embedding model and retrieve the vectors of all given tokens.
+
+    Return a dictionary of the in-vocabulary tokens and their vectors; the model itself is not kept
+    in memory.
+
+    Arguments:
+    embedding_model -- Path to the embedding model.
+    tokens -- The set of all lexicon tokens whose vectors should be retrieved.
+    """
+    logging.info(f"Loading embedding model '{embedding_model}' from disk...")
+    embeddings = CustomEmbeddings(embedding_model, glove_vectors=args.glove_vectors)
+
+    tokens = list(tokens)
+    matrix, oov_mask = embeddings.get_many(tokens)
+
+    return dict(zip([token for token, oov in zip(tokens, oov_mask) if not oov], matrix))
+
+
+def compare_models(lexicons: dict, vectors_by_model: dict) -> list:
+    """Compare the WEAT scores of all pairs of the given models. Return a list of table rows.
+
+    For each test, only the lexicon tokens that are in the vocabulary of all models are used, so
+    that the scores of all models are comparable.
+
+    Arguments:
+    lexicons -- The WEAT test lexicons, by test name.
+    vectors_by_model -- The vectors of all in-vocabulary lexicon tokens, by model path.
+    """
+    rows = []
+    for test_name, lexicon in lexicons.items():
+        # Align the lexicons to the vocabulary shared by all models
+        shared = {
+            key: [t for t in lexicon[key] if all(t in v for v in vectors_by_model.values())]
+            for key in ["X", "Y", "A", "B"]}
+        if any(len(tokens) == 0 for tokens in shared.values()):
+            logging.warning(
+                f"No shared in-vocabulary tokens for at least one lexicon of {test_name}.")
+            continue
+
+        # Calculate the joint associations of each model only once
+        associations = {
+            model: joint_associations(*[
+                np.array([vectors[t] for t in shared[key]]) for key in ["X", "Y", "A", "B"]])
+            for model, vectors in vectors_by_model.items()}
+        n_x = len(shared["X"])
+
+        for model_1, model_2 in combinations(vectors_by_model.keys(), 2):
+            difference, p_value = weat_difference_test(
+                associations[model_1],
+                associations[model_2],
+                n_x,
+                n_permutations=args.permutations)
+
+            rows.append({
+                "test": test_name,
+                "model_1": model_1,
+                "model_2": model_2,
+                "score_1": effect_sizes(associations[model_1], n_x),
+                "score_2": effect_sizes(associations[model_2], n_x),
+                "difference": difference,
+                "p_value": p_value,
+                **{f"n_{key}": len(tokens) for key, tokens in shared.items()}})
+
+    return rows
+
+
+def main():
+    trace = Trace("embedding_bias_comparison", vars(args))
+
+    # Load metric test lexicons
+    with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
+        weat_lexicons = json.load(f)
+
+    # If specified, lowercase all lexicons
+    lexicons = {
+        test_name: {
+            key: [token.lower() for token in lexicon[key]] if args.lowercase else lexicon[key]
+            for key in ["X", "Y", "A", "B"]}
+        for test_name, lexicon in weat_lexicons.items()}
+    all_tokens = {token for lexicon in lexicons.values() for ts in lexicon.values() for token in ts}
+
+    # Load each model once and keep only the vectors of the lexicon tokens; models are named by
+    # their path as given, since models of different runs often share a file name
+    with trace.stage("loading") as stage:
+        vectors_by_model = {
+            model: load_lexicon_vectors(model, all_tokens) for model in args.embedding_models}
+        stage.items = len(vectors_by_model)
+
+    logging.info("Comparing WEAT scores of all model pairs.")
+    with trace.stage("comparison") as stage:
+        results = pd.DataFrame(compare_models(lexicons, vectors_by_model))
+        stage.items = len(results)
+
+    # Export the results to disk
+    dt = datetime.today().strftime("%Y%m%d%H%M%S")
+    output_file = path.join(args.output, f"embedding_bias_comparison_results-{dt}.csv")
+    logging.info(f"Exporting results to disk at {output_file}.")
+    with trace.stage("export"):
+        results.to_csv(output_file, index=False)
+
+    trace.save(output_file)
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to compare the WEAT scores of two or more embedding models pairwise and test "
+        "the significance of their differences.")
+
+    parser.add_argument(
+        "-e",
+        "--embedding_models",
+        required=True,
+        nargs="+",
+        type=str,
+        help="Paths to the embedding models (whitespace separated). All formats of "
+             "'embedding_bias_evaluation.py' are supported.",
+        metavar="EMBEDDINGS")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=str,
+        help="Path to the directory where the result file should be written to.",
+        metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "-p",
+        "--permutations",
+        default=10000,
+        type=int,
+        help="The number of random permutations of the significance test.",
+        metavar="PERMUTATIONS")
+    parser.add_argument(
+        "-g",
+        "--glove_vectors",
+        default="sum",
+        choices=["sum", "word"],
+        help="Which vectors to use when reading GloVe's binary output: the sum of word and context "
+             "vectors (as in GloVe's text output) or the word vectors alone.",
+        metavar="GLOVE_VECTORS")
+    parser.add_argument(
+        "-l",
+        "--lowercase",
+        action="store_true",
+        help="Whether to lowercase all lexicons before testing or not. This is sometimes required "
+             "when the embedding model was generated on solely lowercased tokens.")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    if len(args.embedding_models) < 2:
+        parser.error("At least two embedding models are needed for a comparison.")
+    if len(set(args.embedding_models)) < len(args.embedding_models):
+        parser.error("Each embedding model can only be given once.")
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    # Imported only now, so that '--help' does not need to wait for pandas
+    import pandas as pd
+
+    with profiled(args.profile, "embedding_bias_comparison"):
+        main()
+
+    print("Done.")
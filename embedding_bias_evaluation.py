@@ -2,10 +2,12 @@ import argparse
 import json
 import logging
 
-from datetime import datetime
 from os import path
 
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.results import unique_results_file
 from sbeval.weat_test import weat_score
 from sbeval.word_vectors import CustomEmbeddings
 
@@ -50,9 +52,13 @@ def weat_evaluation(lexicons: dict, embeddings_model) -> dict:
 
 
 def main():
+    trace = Trace("embedding_bias_evaluation", vars(args))
+
     # Load the given embeddings model from disk
     logging.info("Loading embedding model from disk.")
-    embeddings_model = CustomEmbeddings(args.embedding_model)
+    with trace.stage("loading") as stage:
+        embeddings_model = CustomEmbeddings(args.embedding_model, glove_vectors=args.glove_vectors)
+        stage.items = len(embeddings_model.embeddings)
 
     # Load metric test lexicons
     with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
@@ -65,14 +71,20 @@ def main():
 
     # Conduct all WEAT test evaluations
     logging.info("Evaluating WEAT tests.")
-    results["weat"] = weat_evaluation(weat_lexicons, embeddings_model)
+    with trace.stage("weat") as stage:
+        results["weat"] = weat_evaluation(weat_lexicons, embeddings_model)
+        stage.items = len(weat_lexicons)
 
     # Export the results to disk
-    dt = datetime.today().strftime("%Y%m%d%H%M%S")
-    output_file = path.join(args.output, f"embedding_bias_evaluation_results-{dt}.json")
+    # The file name contains the model, so that runs of different models never overwrite each other
+    output_file = unique_results_file(
+        args.output, "embedding_bias_evaluation_results", args.embedding_model)
     logging.info(f"Exporting results to disk at {output_file}.")
-    with open(output_file, "w") as f:
-        json.dump(results, f, indent=4)
+    with trace.stage("export"):
+        with open(output_file, "w") as f:
+            json.dump(results, f, indent=4)
+
+    trace.save(output_file)
 
 
 if __name__ == "__main__":
@@ -85,7 +97,10 @@ if __name__ == "__main__":
         "--embedding_model",
         required=True,
         type=str,
-        help="Path to the embedding model. It needs to be in the word2vec format, binary or plain.",
+        help="Path to the embedding model. It needs to be in the word2vec format (binary or "
+             "plain), the GloVe text format or a '.npy' file written by "
+             "'convert_glove_vectors.py'. GloVe's binary output ('-vectors.bin') is read "
+             "directly if its '-vocab.txt' file is next to it.",
         metavar="EMBEDDINGS")
     parser.add_argument(
         "-o",
@@ -94,6 +109,14 @@ if __name__ == "__main__":
         type=str,
         help="Path to the directory where the result file should be written to.",
         metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "-g",
+        "--glove_vectors",
+        default="sum",
+        choices=["sum", "word"],
+        help="Which vectors to use when reading GloVe's binary output: the sum of word and context "
+             "vectors (as in GloVe's text output) or the word vectors alone.",
+        metavar="GLOVE_VECTORS")
     parser.add_argument(
         "-l",
         "--lowercase",
@@ -101,10 +124,13 @@ if __name__ == "__main__":
         help="Whether to lowercase all lexicons before testing or not. This is sometimes required "
              "when the embedding model was generated on solely lowercased tokens.")
 
+    add_profile_argument(parser)
+
     args = parser.parse_args()
 
     logging.basicConfig(**LOGGING_CONFIG)
 
-    main()
+    with profiled(args.profile, "embedding_bias_evaluation"):
+        main()
 
     print("Done.")
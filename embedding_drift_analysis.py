@@ -0,0 +1,185 @@
+import argparse
+import csv
+import json
+import logging
+import numpy as np
+
+from datetime import datetime
+from os import path
+
+from sbeval.alignment import ProcrustesAligner
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.glove_files import read_vectors
+
+
+def lexicon_drift(lexicon_displacements: dict, lexicons: dict) -> dict:
+    """Summarize the displacements of all lexicon words across models. Return them by test name.
+
+    Arguments:
+    lexicon_displacements -- The displacements of each lexicon word, by word and model name.
+    lexicons -- The WEAT test lexicons, by test name.
+    """
+    drift = {}
+    for test_name, lexicon in lexicons.items():
+        drift[test_name] = {}
+        for key in ["X", "Y", "A", "B"]:
+            drift[test_name][key] = {}
+            for token in lexicon[key]:
+                displacements = list(lexicon_displacements.get(token, {}).values())
+                if not displacements:
+                    drift[test_name][key][token] = "OOV in at least one model"
+                    continue
+
+                drift[test_name][key][token] = {
+                    "mean": float(np.mean(displacements)),
+                    "std": float(np.std(displacements)),
+                    "max": float(np.max(displacements)),
+                    "models": len(displacements)}
+
+    return drift
+
+
+def main():
+    trace = Trace("embedding_drift_analysis", vars(args))
+
+    # Load metric test lexicons
+    with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
+        weat_lexicons = json.load(f)
+
+    lexicons = {
+        test_name: {
+            key: [token.lower() for token in lexicon[key]] if args.lowercase else lexicon[key]
+            for key in ["X", "Y", "A", "B"]}
+        for test_name, lexicon in weat_lexicons.items()}
+    all_tokens = {token for lexicon in lexicons.values() for ts in lexicon.values() for token in ts}
+
+    with trace.stage("loading") as stage:
+        logging.info(f"Loading reference model '{args.reference}' from disk...")
+        reference_words, reference_vectors = read_vectors(args.reference, args.glove_vectors)
+        aligner = ProcrustesAligner(
+            args.reference,
+            reference_words,
+            reference_vectors,
+            cache_dir=args.cache_dir,
+            chunk_size=args.chunk_size,
+            glove_vectors=args.glove_vectors)
+
+        models = {}
+        for model in args.embedding_models:
+            logging.info(f"Loading embedding model '{model}' from disk...")
+            models[model] = read_vectors(model, args.glove_vectors)
+        stage.items = len(models) + 1
+
+    logging.info("Aligning all models to the reference model.")
+    with trace.stage("alignment") as stage:
+        rotations = aligner.rotations(models)
+        stage.items = len(rotations)
+
+    # Stream the displacement of every shared word to disk, model by model and chunk by chunk
+    dt = datetime.today().strftime("%Y%m%d%H%M%S")
+    output_file = path.join(args.output, f"embedding_drift_results-{dt}.csv")
+    logging.info(f"Exporting displacements to disk at {output_file}.")
+
+    lexicon_displacements = {}
+    with trace.stage("displacements") as stage, open(output_file, "w", newline="") as f:
+        stage.items = 0
+        writer = csv.writer(f)
+        writer.writerow(["model", "word", "displacement"])
+        for model, (words, vectors) in models.items():
+            model_name = path.basename(model)
+            for chunk_words, chunk_displacements in aligner.displacements(
+                    words, vectors, rotations[model]):
+                writer.writerows(
+                    (model_name, word, f"{d:.6f}")
+                    for word, d in zip(chunk_words, chunk_displacements))
+                stage.items += len(chunk_words)
+
+                for word, d in zip(chunk_words, chunk_displacements):
+                    if word in all_tokens:
+                        lexicon_displacements.setdefault(word, {})[model_name] = float(d)
+
+    # Lexicon words that are missing in one of the models are not comparable across all models
+    lexicon_displacements = {
+        word: displacements for word, displacements in lexicon_displacements.items()
+        if len(displacements) == len(models)}
+
+    summary_file = path.join(args.output, f"embedding_drift_lexicons-{dt}.json")
+    logging.info(f"Exporting lexicon drift summary to disk at {summary_file}.")
+    with trace.stage("lexicon_drift") as stage, open(summary_file, "w") as f:
+        json.dump({
+            "reference_model": path.basename(args.reference),
+            "embedding_models": [path.basename(model) for model in models],
+            "weat": lexicon_drift(lexicon_displacements, lexicons)}, f, indent=4)
+        stage.items = len(lexicon_displacements)
+
+    trace.save(output_file)
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to align embedding models to a reference model with orthogonal Procrustes and "
+        "report how far each word is displaced after the alignment.")
+
+    parser.add_argument(
+        "-r",
+        "--reference",
+        required=True,
+        type=str,
+        help="Path to the reference embedding model, e.g. the model trained on the full corpus.",
+        metavar="REFERENCE")
+    parser.add_argument(
+        "-e",
+        "--embedding_models",
+        required=True,
+        nargs="+",
+        type=str,
+        help="Paths to the embedding models to align (whitespace separated), e.g. the models "
+             "trained on the splits of the corpus. All formats of 'embedding_bias_evaluation.py' "
+             "are supported.",
+        metavar="EMBEDDINGS")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=str,
+        help="Path to the directory where the result files should be written to.",
+        metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "--chunk_size",
+        default=100000,
+        type=int,
+        help="The number of words whose vectors are processed at once.",
+        metavar="CHUNK_SIZE")
+    parser.add_argument(
+        "--cache_dir",
+        default=path.join("output", "alignment_cache"),
+        type=str,
+        help="Path to the directory where the rotation matrices are cached.",
+        metavar="CACHE_DIR")
+    parser.add_argument(
+        "-g",
+        "--glove_vectors",
+        default="sum",
+        choices=["sum", "word"],
+        help="Which vectors to use when reading GloVe's binary output: the sum of word and context "
+             "vectors (as in GloVe's text output) or the word vectors alone.",
+        metavar="GLOVE_VECTORS")
+    parser.add_argument(
+        "-l",
+        "--lowercase",
+        action="store_true",
+        help="Whether to lowercase all lexicons before summarizing their drift or not.")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    with profiled(args.profile, "embedding_drift_analysis"):
+        main()
+
+    print("Done.")
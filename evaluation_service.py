@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.service import EvaluationService, ModelCache
+
+
+async def serve():
+    with open(args.models, "r", encoding="utf-8") as f:
+        models = json.load(f)
+    logging.info(f"Serving {len(models)} models: {', '.join(models)}.")
+
+    # Models are loaded and scored in the same threads, so that they share the cached vectors
+    with ThreadPoolExecutor(max_workers=args.processing_cores) as executor:
+        cache = ModelCache(
+            models,
+            memory_budget=args.memory_budget * 2 ** 20,
+            executor=executor,
+            glove_vectors=args.glove_vectors)
+
+        for name in args.preload or []:
+            await cache.get(name)
+
+        service = EvaluationService(cache, executor)
+        server = await service.start(host=args.host, port=args.port, socket_path=args.socket)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logging.info("Stopped the service.")
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to serve WEAT and word similarity requests on embedding models that are kept "
+        "in memory between requests.")
+
+    parser.add_argument(
+        "-m",
+        "--models",
+        required=True,
+        type=str,
+        help="Path to a JSON file that maps the names of the models to their paths. The models "
+             "can be in any format of 'embedding_bias_evaluation.py'; '.npy' files written by "
+             "'convert_glove_vectors.py' are memory-mapped.",
+        metavar="MODELS_FILE")
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        type=str,
+        help="The host to listen at.",
+        metavar="HOST")
+    parser.add_argument(
+        "--port",
+        default=8080,
+        type=int,
+        help="The port to listen at.",
+        metavar="PORT")
+    parser.add_argument(
+        "--socket",
+        default=None,
+        type=str,
+        help="Path to a Unix socket to listen at, instead of the host and port.",
+        metavar="SOCKET")
+    parser.add_argument(
+        "-b",
+        "--memory_budget",
+        default=8192,
+        type=int,
+        help="The maximum memory of all loaded models in MiB. When a model does not fit anymore, "
+             "the least recently used models are evicted. Memory-mapped models don't count.",
+        metavar="MEMORY_BUDGET")
+    parser.add_argument(
+        "-c",
+        "--processing_cores",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of worker threads to load models and score requests with.",
+        metavar="PROCESSING_CORES")
+    parser.add_argument(
+        "-g",
+        "--glove_vectors",
+        default="sum",
+        choices=["sum", "word"],
+        help="Which vectors to use when reading GloVe's binary output: the sum of word and context "
+             "vectors (as in GloVe's text output) or the word vectors alone.",
+        metavar="GLOVE_VECTORS")
+    parser.add_argument(
+        "-p",
+        "--preload",
+        nargs="+",
+        default=None,
+        help="Names of models to load before serving the first request.",
+        metavar="MODEL")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    with profiled(args.profile, "evaluation_service"):
+        main()
+    print("Done.")
@@ -3,16 +3,15 @@ import codecs
 import json
 import logging
 import re
-import spacy
 
 from collections import Counter
 from datetime import datetime
-from nltk import ngrams
 from os import cpu_count, path
-from spacy.tokenizer import Tokenizer
 from tqdm import tqdm
 
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
 
 
 def tokenize_and_tag_posts(posts: list) -> list:
@@ -88,6 +87,16 @@ def extract_context(word_of_interest: str, posts: list, context_size: int = 10)
     return [*context_before_woi, *context_after_woi]
 
 
+def ngrams(tokens: list, n: int):
+    """Yield all n-grams of the given tokens as tuples.
+
+    Arguments:
+    tokens -- The list of tokens.
+    n -- The number of tokens per n-gram.
+    """
+    return zip(*[tokens[i:] for i in range(n)])
+
+
 def generate_statistics(contexts: list) -> dict:
     """Generate unigrams, bigrams and trigrams and generate statistics based on those.
 
@@ -162,10 +171,14 @@ def generate_statistics(contexts: list) -> dict:
 def main():
     global nlp
 
+    trace = Trace("lexical_corpus_evaluation", vars(args))
+
     logging.info("Reading data files...")
     # Read data file
-    with open(args.data, "r") as f:
-        posts = f.read().split("\n")
+    with trace.stage("loading") as stage:
+        with open(args.data, "r") as f:
+            posts = f.read().split("\n")
+        stage.items = len(posts)
 
     # Read list of words of interest
     with open(args.words_of_interst, "r") as f:
@@ -174,10 +187,11 @@ def main():
     # Initialize spacy language model and customize the tokenizer to not split the words of interest
     # (this is necessary for word combinations, such as 'african-american')
     logging.info("Loading spacy model...")
-    nlp = spacy.load("en_core_web_sm")
-    nlp.tokenizer = Tokenizer(
-        nlp.vocab,
-        rules={token: [{"ORTH": token}] for token in words_of_interest.keys()})
+    with trace.stage("spacy_model"):
+        nlp = spacy.load("en_core_web_sm")
+        nlp.tokenizer = Tokenizer(
+            nlp.vocab,
+            rules={token: [{"ORTH": token}] for token in words_of_interest.keys()})
 
     # For all words of interest...
     statistics_by_woi = {}
@@ -185,37 +199,48 @@ def main():
         print("")
         # Filter posts by occurence of words of interest
         logging.info(f"Filtering on posts containing '{woi}' and variants...")
-        posts_of_interest = list(
-            filter(lambda x: any([t in x.split() for t in woi_forms]), tqdm(posts)))
+        with trace.stage(f"{woi}/filtering") as stage:
+            posts_of_interest = list(
+                filter(lambda x: any([t in x.split() for t in woi_forms]), tqdm(posts)))
 
-        # Replace alternative writing forms
-        logging.info(f"Replacing all variants with '{woi}'...")
-        woi_pattern = re.compile(" | ".join(woi_forms))
-        posts_of_interest = [
-            re.sub(woi_pattern, f" {woi} ", post) for post in tqdm(posts_of_interest)]
+            # Replace alternative writing forms
+            logging.info(f"Replacing all variants with '{woi}'...")
+            woi_pattern = re.compile(" | ".join(woi_forms))
+            posts_of_interest = [
+                re.sub(woi_pattern, f" {woi} ", post) for post in tqdm(posts_of_interest)]
+            stage.items = len(posts)
 
         # Tokenize the texts, clean from unwanted tokens and extract PoS tags
         logging.info("Processing posts and extracting tokens...")
-        poi_tokenized = tokenize_and_tag_posts(posts_of_interest)
+        with trace.stage(f"{woi}/tagging") as stage:
+            poi_tokenized = tokenize_and_tag_posts(posts_of_interest)
+            stage.items = len(posts_of_interest)
 
         # Extracting contexts of WOI
         logging.info("Extracting contexts...")
-        woi_contexts = extract_context(woi, poi_tokenized)
+        with trace.stage(f"{woi}/contexts") as stage:
+            woi_contexts = extract_context(woi, poi_tokenized)
+            stage.items = len(poi_tokenized)
 
         # Generate n-gram counts
         logging.info("Generating n-gram statistics...")
-        statistics_by_woi[woi] = {
-            "total_posts": len(posts_of_interest),
-            "total_occurrences": len(woi_contexts),
-            **generate_statistics(woi_contexts)}
+        with trace.stage(f"{woi}/statistics") as stage:
+            statistics_by_woi[woi] = {
+                "total_posts": len(posts_of_interest),
+                "total_occurrences": len(woi_contexts),
+                **generate_statistics(woi_contexts)}
+            stage.items = len(woi_contexts)
 
     # Export statistics to file
     dt = datetime.today().strftime("%Y%m%d%H%M%S")
     output_file = path.join(args.output, f"lexical_corpus_evaluation_results-{dt}.json")
 
     logging.info(f"Exporting results to disk at {output_file}.")
-    with open(output_file, "w") as f:
-        json.dump({"corpus": path.basename(args.data), **statistics_by_woi}, f, indent=4)
+    with trace.stage("export"):
+        with open(output_file, "w") as f:
+            json.dump({"corpus": path.basename(args.data), **statistics_by_woi}, f, indent=4)
+
+    trace.save(output_file)
 
 
 if __name__ == "__main__":
@@ -272,13 +297,20 @@ if __name__ == "__main__":
         help="The number of processing cores to use for simultaneous computing of the scores.",
         metavar="PROCESSING_CORES")
 
+    add_profile_argument(parser)
+
     args = parser.parse_args()
 
     logging.basicConfig(**LOGGING_CONFIG)
 
+    # spacy is only imported after parsing the arguments, as it takes long to import
+    import spacy
+    from spacy.tokenizer import Tokenizer
+
     logging.info(
         "Please make sure that your input texts are whitespace separated tokens. The regex "
         "substitution might not work correctly otherwise.")
 
-    main()
+    with profiled(args.profile, "lexical_corpus_evaluation"):
+        main()
     print("Done.")
@@ -0,0 +1,139 @@
+import argparse
+import json
+import logging
+
+from datetime import datetime
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.neighbors import NeighborIndex
+from sbeval.word_vectors import CustomEmbeddings
+
+
+def load_index() -> NeighborIndex:
+    """Load the neighbor index of the embedding model, or build it if there is none yet. Return it.
+
+    A persisted index is only reused if it is newer than the embedding model.
+    """
+    if args.index and path.isfile(args.index) \
+            and path.getmtime(args.index) >= path.getmtime(args.embedding_model):
+        logging.info(f"Loading neighbor index from '{args.index}'.")
+        return NeighborIndex.load(args.index)
+
+    logging.info("Loading embedding model from disk.")
+    embeddings_model = CustomEmbeddings(args.embedding_model, glove_vectors=args.glove_vectors)
+
+    logging.info("Building neighbor index.")
+    index = NeighborIndex.from_embeddings(embeddings_model)
+    if args.index:
+        logging.info(f"Saving neighbor index to '{args.index}'.")
+        index.save(args.index)
+
+    return index
+
+
+def main():
+    trace = Trace("lexicon_neighbors", vars(args))
+
+    # Load metric test lexicons
+    with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
+        weat_lexicons = json.load(f)
+
+    lexicons = {
+        test_name: {
+            key: [token.lower() for token in lexicon[key]] if args.lowercase else lexicon[key]
+            for key in ["X", "Y", "A", "B"]}
+        for test_name, lexicon in weat_lexicons.items()}
+
+    with trace.stage("loading") as stage:
+        index = load_index()
+        stage.items = len(index.words)
+
+    # Query the neighbors of all lexicon tokens at once
+    logging.info("Finding the neighbors of all lexicon tokens.")
+    all_tokens = [token for lexicon in lexicons.values() for ts in lexicon.values() for token in ts]
+    with trace.stage("search") as stage:
+        neighbors = index.neighbors(all_tokens, k=args.neighbors)
+        stage.items = len(all_tokens)
+
+    results = {
+        "embeddings_model": path.basename(args.embedding_model),
+        "weat": {
+            test_name: {
+                key: {token: neighbors.get(token, "OOV") for token in tokens}
+                for key, tokens in lexicon.items()}
+            for test_name, lexicon in lexicons.items()}}
+
+    # Export the results to disk
+    dt = datetime.today().strftime("%Y%m%d%H%M%S")
+    output_file = path.join(args.output, f"lexicon_neighbors-{dt}.json")
+    logging.info(f"Exporting results to disk at {output_file}.")
+    with trace.stage("export"):
+        with open(output_file, "w") as f:
+            json.dump(results, f, indent=4)
+
+    trace.save(output_file)
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to find the nearest neighbors of all WEAT lexicon tokens in an embedding model.")
+
+    parser.add_argument(
+        "-e",
+        "--embedding_model",
+        required=True,
+        type=str,
+        help="Path to the embedding model. All formats of 'embedding_bias_evaluation.py' are "
+             "supported.",
+        metavar="EMBEDDINGS")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=str,
+        help="Path to the directory where the result file should be written to.",
+        metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "-k",
+        "--neighbors",
+        default=10,
+        type=int,
+        help="The number of neighbors to find per lexicon token.",
+        metavar="NEIGHBORS")
+    parser.add_argument(
+        "-i",
+        "--index",
+        default=None,
+        type=str,
+        help="Path to the '.npy' file of the neighbor index. If given, the index is built once and "
+             "reused in later runs, without loading the embedding model again.",
+        metavar="INDEX")
+    parser.add_argument(
+        "-g",
+        "--glove_vectors",
+        default="sum",
+        choices=["sum", "word"],
+        help="Which vectors to use when reading GloVe's binary output: the sum of word and context "
+             "vectors (as in GloVe's text output) or the word vectors alone.",
+        metavar="GLOVE_VECTORS")
+    parser.add_argument(
+        "-l",
+        "--lowercase",
+        action="store_true",
+        help="Whether to lowercase all lexicons before querying or not. This is sometimes required "
+             "when the embedding model was generated on solely lowercased tokens.")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    with profiled(args.profile, "lexicon_neighbors"):
+        main()
+
+    print("Done.")
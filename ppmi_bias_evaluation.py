@@ -0,0 +1,160 @@
+import argparse
+import json
+import logging
+
+from datetime import datetime
+from os import cpu_count, path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.cooccurrence import GLOVE_MIN_COUNT, GLOVE_WINDOW_SIZE
+from sbeval.glove_files import read_vocab_words
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+
+
+def ppmi_evaluation(lexicons: dict, ppmi, words: list) -> dict:
+    ppmi_results = {}
+
+    # For each of the tests...
+    for test_name, lexicon in lexicons.items():
+        # Catch if for at least one of the lexicons none of its words has any positive association
+        try:
+            test_result = ppmi_effect_size(
+                ppmi, words, lexicon["X"], lexicon["Y"], lexicon["A"], lexicon["B"])
+
+            ppmi_results[test_name] = {
+                "score": test_result[0],
+                "oov_tokens": test_result[1]}
+        except AttributeError as e:
+            ppmi_results[test_name] = f"No results possible: '{e}'"
+
+    return ppmi_results
+
+
+def main():
+    trace = Trace("ppmi_bias_evaluation", vars(args))
+
+    # Load metric test lexicons; the corpora are lowercased, so are the lexicons
+    with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
+        weat_lexicons = {
+            test_name: {key: [word.lower() for word in test[key]] for key in ["X", "Y", "A", "B"]}
+            for test_name, test in json.load(f).items()}
+    words = sorted({
+        word for lexicon in weat_lexicons.values() for key in ["X", "Y", "A", "B"]
+        for word in lexicon[key]})
+
+    # Only the PPMI rows of the lexicon words are needed
+    with trace.stage("ppmi") as stage:
+        if args.cooccurrence_file:
+            logging.info(f"Calculating PPMI from {args.cooccurrence_file}.")
+            ppmi = cooccurrence_file_ppmi(args.cooccurrence_file, words, args.vocab)
+        else:
+            logging.info(f"Calculating PPMI from {args.data}.")
+            ppmi = corpus_ppmi(
+                args.data,
+                words,
+                window_size=args.window_size,
+                min_count=args.min_count,
+                vocab=read_vocab_words(args.vocab) if args.vocab else None,
+                chunk_bytes=args.chunk_size * 2 ** 20,
+                n_process=args.processing_cores)
+        stage.items = len(words)
+
+    # Dict to store all test results
+    results = {
+        "corpus": path.basename(args.data or args.cooccurrence_file),
+        "window_size": None if args.cooccurrence_file else args.window_size,
+        "ppmi": {}}
+
+    logging.info("Evaluating WEAT tests on PPMI rows.")
+    with trace.stage("weat") as stage:
+        results["ppmi"] = ppmi_evaluation(weat_lexicons, ppmi, words)
+        stage.items = len(weat_lexicons)
+
+    # Export the results to disk
+    dt = datetime.today().strftime("%Y%m%d%H%M%S")
+    output_file = path.join(args.output, f"ppmi_bias_evaluation_results-{dt}.json")
+    logging.info(f"Exporting results to disk at {output_file}.")
+    with open(output_file, "w") as f:
+        json.dump(results, f, indent=4)
+
+    trace.save(output_file)
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to evaluate the WEAT tests on the positive pointwise mutual information (PPMI) "
+        "of the lexicon words in a corpus, without training an embedding model.")
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "-d",
+        "--data",
+        type=str,
+        help="Path to the corpus. Expects one whitespace separated post per line.",
+        metavar="DATA_PATH")
+    source.add_argument(
+        "-b",
+        "--cooccurrence_file",
+        type=str,
+        help="Path to the co-occurrence file GloVe wrote for the corpus "
+             "(`$PREFIX-cooccurrence.bin`).",
+        metavar="COOCCURRENCE_FILE")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=str,
+        help="Path to the directory where the result file should be saved to.",
+        metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "-v",
+        "--vocab",
+        default=None,
+        type=str,
+        help="Path to the GloVe vocabulary file of the corpus. Defaults to the matching "
+             "`$PREFIX-vocab.txt` for a co-occurrence file; for a corpus, the vocabulary is built "
+             "with `--min_count` if not given.",
+        metavar="VOCAB_FILE")
+    parser.add_argument(
+        "-w",
+        "--window_size",
+        default=GLOVE_WINDOW_SIZE,
+        type=int,
+        help="The number of context words to the left and to the right of a word, when counting "
+             "the co-occurrences of a corpus.",
+        metavar="WINDOW_SIZE")
+    parser.add_argument(
+        "-m",
+        "--min_count",
+        default=GLOVE_MIN_COUNT,
+        type=int,
+        help="The minimum number of occurrences of a word in the vocabulary built from a corpus.",
+        metavar="MIN_COUNT")
+    parser.add_argument(
+        "-c",
+        "--processing_cores",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of processing cores to count the chunks of the corpus with.",
+        metavar="PROCESSING_CORES")
+    parser.add_argument(
+        "--chunk_size",
+        default=32,
+        type=int,
+        help="The size of the chunks of the corpus that are counted at once, in MiB.",
+        metavar="CHUNK_SIZE")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    # Imported only now, so that '--help' does not need to wait for scipy
+    from sbeval.ppmi import cooccurrence_file_ppmi, corpus_ppmi, ppmi_effect_size
+
+    with profiled(args.profile, "ppmi_bias_evaluation"):
+        main()
+    print("Done.")
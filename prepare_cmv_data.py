@@ -1,11 +1,12 @@
 import argparse
-import json_lines
 import logging
 
 from os import path
 from tqdm import tqdm
 
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
 
 
 def get_all_texts(comment: dict) -> list:
@@ -29,34 +30,44 @@ def get_all_texts(comment: dict) -> list:
 
 
 def main():
+    trace = Trace("prepare_cmv_data", vars(args))
+
     # List to store all texts and comments
     thread_texts = []
 
     # Read thread file from disk
     logging.info("Reading file from disk.")
-    with open(args.input, "r") as f:
-        threads = [item for item in json_lines.reader(f)]
+    with trace.stage("loading") as stage:
+        with open(args.input, "r") as f:
+            threads = [item for item in json_lines.reader(f)]
+        stage.items = len(threads)
 
     # For each thread...
     logging.info("Extracting texts from threads and comments.")
-    for thread in tqdm(threads):
-        # If this thread (still) has a selftext, extract it
-        if "selftext" in thread.keys() and len(thread["selftext"]) > 0:
-            thread_texts.append(thread["selftext"])
+    with trace.stage("extraction") as stage:
+        for thread in tqdm(threads):
+            # If this thread (still) has a selftext, extract it
+            if "selftext" in thread.keys() and len(thread["selftext"]) > 0:
+                thread_texts.append(thread["selftext"])
 
-        # For each comment of this thread
-        for comment in thread["comments"]:
-            thread_texts.extend(get_all_texts(comment))
+            # For each comment of this thread
+            for comment in thread["comments"]:
+                thread_texts.extend(get_all_texts(comment))
 
-    # Remove all newlines inside the texts as they serve as separator in the final export
-    logging.info("Removing newlines from post texts.")
-    thread_texts = [text.replace("\n", " ") for text in tqdm(thread_texts)]
+        # Remove all newlines inside the texts as they serve as separator in the final export
+        logging.info("Removing newlines from post texts.")
+        thread_texts = [text.replace("\n", " ") for text in tqdm(thread_texts)]
+        stage.items = len(threads)
 
     # Write file of all included debate portal into a combined file
     output_file = path.join(args.output, "webis-cmv-20-texts_only.txt")
     logging.info(f"Writing extracted post texts to file at {output_file}.")
-    with open(output_file, "w") as f:
-        f.write("\n".join(thread_texts))
+    with trace.stage("export") as stage:
+        with open(output_file, "w") as f:
+            f.write("\n".join(thread_texts))
+        stage.items = len(thread_texts)
+
+    trace.save(output_file)
 
 
 if __name__ == "__main__":
@@ -76,9 +87,14 @@ if __name__ == "__main__":
         help="Path to the directory the output should be written to.",
         metavar="OUTPUT_DIR")
 
+    add_profile_argument(parser)
+
     args = parser.parse_args()
 
     logging.basicConfig(**LOGGING_CONFIG)
 
-    main()
+    import json_lines
+
+    with profiled(args.profile, "prepare_cmv_data"):
+        main()
     print("Done.")
@@ -2,16 +2,16 @@ import argparse
 import json
 import logging
 import os
-import pandas as pd
-import spacy
 
 from os import path
 from tqdm import tqdm
 
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
 
 
-def calculate_age_group(data: pd.DataFrame):
+def calculate_age_group(data: "pd.DataFrame"):
     """Calculate the age group of each user and add it is a column to the given DataFrame.
 
     Return the new DataFrame.
@@ -42,7 +42,7 @@ def calculate_age_group(data: pd.DataFrame):
     return data.drop(labels=["tmp_age"], axis=1)
 
 
-def extract_data(debates_data: dict, users_data: dict) -> pd.DataFrame:
+def extract_data(debates_data: dict, users_data: dict) -> "pd.DataFrame":
     """Extract and combines debates and user data into a single dataframe. Return the dataframe.
 
     Currently, only the birthday, education, gender and political orientation are extracted and
@@ -116,34 +116,49 @@ def prepare_data(source_text: str) -> str:
 
 
 def main():
+    trace = Trace("prepare_ddo_data", vars(args))
+
     # Read data from disk
     logging.info("Reading data from disk...")
-    with open(DEBATES_DATA_PATH, "r") as f:
-        debates_data = json.load(f)
+    with trace.stage("loading") as stage:
+        with open(DEBATES_DATA_PATH, "r") as f:
+            debates_data = json.load(f)
 
-    with open(USERS_DATA_PATH, "r") as f:
-        users_data = json.load(f)
+        with open(USERS_DATA_PATH, "r") as f:
+            users_data = json.load(f)
+        stage.items = len(debates_data)
 
     # Extract and combine data of interest
     logging.info("Collecting debate data...")
-    combined_data = extract_data(debates_data, users_data)
+    with trace.stage("extraction") as stage:
+        combined_data = extract_data(debates_data, users_data)
+        stage.items = len(debates_data)
 
     # Prepare textual data
     logging.info("Preparing debate data...")
-    # Modin does not yet support `progress_apply`
-    if args.multicore:
-        combined_data["argument_prepared"] = combined_data["argument"].apply(prepare_data)
-    else:
-        combined_data["argument_prepared"] = combined_data["argument"].progress_apply(prepare_data)
+    with trace.stage("preparation") as stage:
+        # Modin does not yet support `progress_apply`
+        if args.multicore:
+            combined_data["argument_prepared"] = combined_data["argument"].apply(prepare_data)
+        else:
+            combined_data["argument_prepared"] = \
+                combined_data["argument"].progress_apply(prepare_data)
+        stage.items = len(combined_data)
 
     # Calculate age groups
     logging.info("Calculating age groups...")
-    combined_data = calculate_age_group(combined_data)
+    with trace.stage("age_groups") as stage:
+        combined_data = calculate_age_group(combined_data)
+        stage.items = len(combined_data)
 
     # Write final data to disk
     logging.info(f"Writing final dataframe to {OUTPUT_PATH}...")
-    # Sort columns by labels before saving
-    combined_data[sorted(combined_data.columns.values)].to_csv(OUTPUT_PATH, index=False)
+    with trace.stage("export") as stage:
+        # Sort columns by labels before saving
+        combined_data[sorted(combined_data.columns.values)].to_csv(OUTPUT_PATH, index=False)
+        stage.items = len(combined_data)
+
+    trace.save(OUTPUT_PATH)
 
     logging.info("Done.")
 
@@ -184,6 +199,8 @@ if __name__ == "__main__":
         help="The number of processing cores to use. Only relevant if multicore flag is set.",
         metavar="PROCESSING_CORES")
 
+    add_profile_argument(parser)
+
     args = parser.parse_args()
 
     # Set data variables
@@ -193,17 +210,23 @@ if __name__ == "__main__":
 
     logging.basicConfig(**LOGGING_CONFIG)
 
-    # Import pandas if multicore is disabled, otherwise import modin
+    # Import pandas if multicore is disabled, otherwise import modin; both (and spacy) are only
+    # imported after parsing the arguments, as they take long to import
     if args.multicore:
         logging.info("Multicore enabled; using modin instead of pandas with {0} cores.".format(
             args.processing_cores))
         os.environ["MODIN_CPUS"] = str(args.processing_cores)
         import modin.pandas as pd
     else:
+        import pandas as pd
+
         # Enable tqdm pandas integration
         tqdm.pandas()
 
+    import spacy
+
     # Initialize spacy model
     nlp = spacy.load("en_core_web_sm")
 
-    main()
+    with profiled(args.profile, "prepare_ddo_data"):
+        main()
@@ -1,44 +1,43 @@
 import argparse
 import logging
-import spacy
 
 from os import cpu_count, path
-from tqdm import tqdm
 
 from sbeval.constants import LOGGING_CONFIG
-from sbeval.utils import split_corpus
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.tokenization import export_tokenized_corpus, load_tokenizer
 
 
 def main():
-    # Initialize spacy model
-    nlp = spacy.load("en_core_web_sm")
+    trace = Trace("prepare_glove_input_from_cmv", vars(args))
+
+    # Initialize a tokenizer-only spacy pipeline
+    with trace.stage("tokenizer"):
+        nlp = load_tokenizer(blank=args.blank_tokenizer)
 
     # Read data from disk
     logging.info("Reading data from disk...")
-    with open(DATA_PATH, "r") as f:
-        iac_posts = f.read().split("\n")
-
-    # Extract texts of interest from data
-    logging.info("Tokenizing posts...")
-    posts_parsed = list(
-        nlp.pipe(
-            tqdm(iac_posts),
-            disable=["tagger", "parser", "ner", "textcat"],
-            n_process=cpu_count() - 1))
-    logging.info("Joining tokens back together as space separated texts...")
-    posts_tokenized = [
-        " ".join([token.text.lower() for token in post]) for post in tqdm(posts_parsed)]
-
-    # Write extracted text to file
+    with trace.stage("loading") as stage:
+        with open(DATA_PATH, "r") as f:
+            posts = f.read().split("\n")
+        stage.items = len(posts)
+
+    # Tokenize posts and stream them to the corpus file and its random splits
     file_basename = "cmv-text_only--glove-format"
-    output_file = path.join(OUTPUT_DIR, f"{file_basename}.txt")
-    logging.info(f"Writing posts to disk at {output_file}.")
-    with open(output_file, "w") as f:
-        f.write("\n".join(posts_tokenized))
+    logging.info(f"Tokenizing posts and writing them to disk at {OUTPUT_DIR}...")
+    with trace.stage("tokenization") as stage:
+        export_tokenized_corpus(
+            posts,
+            nlp,
+            OUTPUT_DIR,
+            file_basename,
+            n_splits=args.splits,
+            batch_size=args.batch_size,
+            n_process=args.processing_cores)
+        stage.items = len(posts)
 
-    # Generate random corpus splits and write them to disk
-    logging.info("Generating random splits and writing them to disk...")
-    split_corpus(posts_tokenized, args.splits, OUTPUT_DIR, file_basename)
+    trace.save(path.join(OUTPUT_DIR, f"{file_basename}.txt"))
 
 
 if __name__ == "__main__":
@@ -66,6 +65,27 @@ if __name__ == "__main__":
         type=int,
         help="Number of random splits that should additionally be generated.",
         metavar="SPLITS")
+    parser.add_argument(
+        "--batch_size",
+        "-b",
+        default=1000,
+        type=int,
+        help="Number of posts that are sent to a tokenizer process at once.",
+        metavar="BATCH_SIZE")
+    parser.add_argument(
+        "--processing_cores",
+        "-c",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of processing cores to use for tokenization.",
+        metavar="PROCESSING_CORES")
+    parser.add_argument(
+        "--blank_tokenizer",
+        action="store_true",
+        help="Whether to only build the rule-based English tokenizer instead of loading the "
+             "spacy model. This speeds up the startup considerably, especially for small corpora.")
+
+    add_profile_argument(parser)
 
     args = parser.parse_args()
 
@@ -75,4 +95,5 @@ if __name__ == "__main__":
 
     logging.basicConfig(**LOGGING_CONFIG)
 
-    main()
+    with profiled(args.profile, "prepare_glove_input_from_cmv"):
+        main()
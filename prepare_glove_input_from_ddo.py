@@ -1,64 +1,74 @@
 import argparse
 import json
 import logging
-import pandas as pd
 
 from os import path
 from tqdm import tqdm
 
 from sbeval.constants import LOGGING_CONFIG
-from sbeval.utils import split_corpus
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.utils import CorpusWriter
 
 
 def main():
-    # Read data from disk
-    logging.info("Reading data from disk...")
-    data = pd.read_csv(DATA_PATH)
+    trace = Trace("prepare_glove_input_from_ddo", vars(args))
 
+    # Subgroups for which to export data; without any, all posts are exported to a single corpus
+    group_properties = {}
     if GROUP_PROPERTIES_PATH:
-        # Subgroups for which to export data
         with open(GROUP_PROPERTIES_PATH, "r") as f:
             group_properties = json.load(f)
 
-        # Extract texts of interest from data
-        logging.info("Extracting texts from groups of interests to separate files...")
-        for prop, values in tqdm(group_properties.items(), position=1):
-            for group in tqdm(values, position=2, leave=False):
-                # Collect group texts into a single string, newline separated
-                group_texts = data[data[prop] == group["column_value"]].argument_prepared.values
-
-                # Remove nan values
-                group_texts_clean = [text for text in group_texts if type(text) == str]
+    # Read data from disk, restricted to the columns that are needed for the export
+    logging.info("Reading data from disk...")
+    with trace.stage("loading") as stage:
+        data = pd.read_csv(DATA_PATH, usecols=["argument_prepared", *group_properties.keys()])
 
-                # Write extracted text to file
+        # Remove nan values
+        data = data[data.argument_prepared.notna()]
+        stage.items = len(data)
+
+    # Open one corpus writer (full file and splits) per output corpus, indexed by the column
+    # values that route a post to it
+    writers = {}
+    if group_properties:
+        for prop, values in group_properties.items():
+            group_sizes = data[prop].value_counts()
+            writers[prop] = {}
+            for group in values:
                 file_basename = f"debate_org-{prop}-{group['description']}-posts--glove-format"
-                output_file = path.join(
-                    OUTPUT_DIR, f"{file_basename}.txt")
-                logging.info(f"Writing posts to disk at '{output_file}'...")
-                with open(output_file, "w") as f:
-                    f.write("\n".join(group_texts_clean).lower())
-
-                # Generate random corpus splits and write them to disk
-                logging.info("Generating random splits and writing them to disk...")
-                split_corpus(group_texts_clean, args.splits, OUTPUT_DIR, file_basename)
+                writers[prop][group["column_value"]] = CorpusWriter(
+                    OUTPUT_DIR,
+                    file_basename,
+                    int(group_sizes.get(group["column_value"], 0)),
+                    args.splits)
     else:
-        # Collect all posts
-        logging.info("Extracting posts from given data...")
-        texts = data.argument_prepared.values
-
-        # Remove nan values
-        texts_clean = [text for text in texts if type(text) == str]
-
-        # Write extracted posts to file
-        file_basename = "debate_org-all_posts--glove-format"
-        output_file = path.join(OUTPUT_DIR, f"{file_basename}.txt")
-        logging.info(f"Writing posts to disk at '{output_file}'...")
-        with open(output_file, "w") as f:
-            f.write("\n".join(texts_clean).lower())
-
-        # Generate random corpus splits and write them to disk
-        logging.info("Generating random splits and writing them to disk...")
-        split_corpus(texts_clean, args.splits, OUTPUT_DIR, file_basename)
+        # Without groups, every post is routed to the same corpus
+        data["all_posts"] = True
+        writers["all_posts"] = {
+            True: CorpusWriter(
+                OUTPUT_DIR, "debate_org-all_posts--glove-format", len(data), args.splits)}
+
+    # Route each post to all corpora it belongs to in a single pass over the data
+    logging.info(f"Writing posts and their random splits to disk at '{OUTPUT_DIR}'...")
+    with trace.stage("export") as stage:
+        routing_columns = list(writers.keys())
+        rows = data[["argument_prepared", *routing_columns]].itertuples(index=False, name=None)
+        for text, *column_values in tqdm(rows, total=len(data)):
+            text = text.lower()
+            for column, value in zip(routing_columns, column_values):
+                writer = writers[column].get(value)
+                if writer is not None:
+                    writer.write(text)
+
+        for column_writers in writers.values():
+            for writer in column_writers.values():
+                writer.close()
+        stage.items = len(data)
+
+    # All corpora share the same trace, as they are written in a single pass
+    trace.save(path.join(OUTPUT_DIR, "debate_org--glove-format.txt"))
 
 
 if __name__ == "__main__":
@@ -96,6 +106,8 @@ if __name__ == "__main__":
         help="Number of random splits that should additionally be generated.",
         metavar="SPLITS")
 
+    add_profile_argument(parser)
+
     args = parser.parse_args()
 
     # Set data variables
@@ -105,6 +117,10 @@ if __name__ == "__main__":
 
     logging.basicConfig(**LOGGING_CONFIG)
 
-    main()
+    # Imported only now, so that '--help' does not need to wait for pandas
+    import pandas as pd
+
+    with profiled(args.profile, "prepare_glove_input_from_ddo"):
+        main()
 
     print("Done.")
@@ -1,45 +1,55 @@
 import argparse
 import logging
-import pandas as pd
-import re
-import spacy
 
-from os import path
-from tqdm import tqdm
+from os import cpu_count, path
 
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.tokenization import export_tokenized_corpus, load_tokenizer
 
 
 def main():
+    trace = Trace("prepare_glove_input_from_sbf", vars(args))
+
     # Read all data splits into a single pandas dataframe and extract only unqiue posts
     logging.info("Reading data from disk...")
-    sbf_data = pd.concat([
-        pd.read_csv(path.join(DATA_PATH, "SBFv2.trn.csv")),
-        pd.read_csv(path.join(DATA_PATH, "SBFv2.dev.csv")),
-        pd.read_csv(path.join(DATA_PATH, "SBFv2.tst.csv"))])
-    sbf_posts = list(set(sbf_data.post.values))
+    with trace.stage("loading") as stage:
+        sbf_data = pd.concat([
+            pd.read_csv(path.join(DATA_PATH, "SBFv2.trn.csv")),
+            pd.read_csv(path.join(DATA_PATH, "SBFv2.dev.csv")),
+            pd.read_csv(path.join(DATA_PATH, "SBFv2.tst.csv"))])
+        sbf_posts = sbf_data.post.drop_duplicates()
+        stage.items = len(sbf_data)
 
     logging.info("Cleaning posts...")
-    posts_cleaned = []
-    for post in tqdm(sbf_posts):
+    with trace.stage("cleaning") as stage:
         # Remove twitter mentions
-        # post_no_mentions = re.sub(r"\@\w*", "", post)
+        # sbf_posts = sbf_posts.str.replace(r"\@\w*", "", regex=True)
         # Remove html entities
-        post_no_html_entities = re.sub(r"(&.+?;)", "", post)
+        posts_cleaned = sbf_posts.str.replace(r"(&.+?;)", "", regex=True)
         # Remove linefeeds, twitter RTs, twitter mentions and replace ticks
-        post_clean = post_no_html_entities.replace(
-            "\n", " ").replace("RT", "").replace("@", "").replace("’", "'")
-        # Tokenize and lowercase the post (and remove punctuation)
-        # post_final = [t.text.lower() for t in nlp(post_clean) if not t.is_punct]
-        post_final = [t.text.lower() for t in nlp(post_clean)]
-
-        posts_cleaned.append(" ".join(post_final))
-
-    # Write all cleaned posts to file, joined by a linefeed
-    output_file = path.join(OUTPUT_DIR, "sbf_posts--glove_format.txt")
-    logging.info(f"Exporting clean posts to disk at '{output_file}'...")
-    with open(output_file, "w") as f:
-        f.write("\n".join(posts_cleaned))
+        posts_cleaned = (
+            posts_cleaned
+            .str.replace("\n", " ", regex=False)
+            .str.replace("RT", "", regex=False)
+            .str.replace("@", "", regex=False)
+            .str.replace("’", "'", regex=False))
+        stage.items = len(posts_cleaned)
+
+    # Tokenize and lowercase the posts, and stream them to disk, joined by a linefeed
+    logging.info(f"Tokenizing posts and exporting them to disk at '{OUTPUT_DIR}'...")
+    with trace.stage("tokenization") as stage:
+        export_tokenized_corpus(
+            posts_cleaned.tolist(),
+            nlp,
+            OUTPUT_DIR,
+            "sbf_posts--glove_format",
+            batch_size=args.batch_size,
+            n_process=args.processing_cores)
+        stage.items = len(posts_cleaned)
+
+    trace.save(path.join(OUTPUT_DIR, "sbf_posts--glove_format.txt"))
 
 
 if __name__ == "__main__":
@@ -60,6 +70,27 @@ if __name__ == "__main__":
         default="output",
         help="Path to directory where output files should be placed.",
         metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "--batch_size",
+        "-b",
+        default=1000,
+        type=int,
+        help="Number of posts that are sent to a tokenizer process at once.",
+        metavar="BATCH_SIZE")
+    parser.add_argument(
+        "--processing_cores",
+        "-c",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of processing cores to use for tokenization.",
+        metavar="PROCESSING_CORES")
+    parser.add_argument(
+        "--blank_tokenizer",
+        action="store_true",
+        help="Whether to only build the rule-based English tokenizer instead of loading the "
+             "spacy model. This speeds up the startup considerably, especially for small corpora.")
+
+    add_profile_argument(parser)
 
     args = parser.parse_args()
 
@@ -69,9 +100,13 @@ if __name__ == "__main__":
 
     logging.basicConfig(**LOGGING_CONFIG)
 
-    # Initialize stanza pipeline
-    nlp = spacy.load("en_core_web_sm")
+    # Imported only now, so that '--help' does not need to wait for pandas
+    import pandas as pd
+
+    # Initialize a tokenizer-only spacy pipeline
+    nlp = load_tokenizer(blank=args.blank_tokenizer)
 
-    main()
+    with profiled(args.profile, "prepare_glove_input_from_sbf"):
+        main()
 
     print("Done.")
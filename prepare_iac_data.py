@@ -1,14 +1,19 @@
 import argparse
 import logging
-import pandas as pd
 
-from os import path
-from sqlalchemy import create_engine
+from os import environ, path
 
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.profiling import add_profile_argument, profiled
 
 
 def main():
+    # The database password must not end up in the trace
+    trace = Trace(
+        "prepare_iac_data",
+        {key: value for key, value in vars(args).items() if key != "mysql_password"})
+
     # List to save all posts from all databases
     all_posts = []
     debate_portal_db_names = [
@@ -29,23 +34,32 @@ def main():
 
         # Read textual post data from database
         logging.info("Reading post data from database...")
-        posts_df = pd.read_sql("SELECT * FROM post_view", db_connection)
-        debate_portal_posts = [text.replace("\n", " ").lower() for text in posts_df.text.values]
-        all_posts.extend(debate_portal_posts)
+        with trace.stage(f"{debate_portal}/loading") as stage:
+            posts_df = pd.read_sql("SELECT * FROM post_view", db_connection)
+            debate_portal_posts = [
+                text.replace("\n", " ").lower() for text in posts_df.text.values]
+            all_posts.extend(debate_portal_posts)
+            stage.items = len(debate_portal_posts)
 
         # Write data of single debate portal to file
         output_file = path.join(args.output, f"iacv2-{debate_portal}-texts.txt")
         logging.info(f"Writing posts to text file at {output_file}.")
-        with open(output_file, "w") as f:
-            f.write("\n".join(debate_portal_posts))
+        with trace.stage(f"{debate_portal}/export") as stage:
+            with open(output_file, "w") as f:
+                f.write("\n".join(debate_portal_posts))
+            stage.items = len(debate_portal_posts)
 
         logging.info(f"Debate portal '{debate_portal}' done.\n")
 
     # Write file of all included debate portal into a combined file
     output_file = path.join(args.output, "iacv2-combined-texts.txt")
     logging.info(f"Writing combined posts (all portals) to text file at {output_file}.")
-    with open(output_file, "w") as f:
-        f.write("\n".join(all_posts))
+    with trace.stage("export") as stage:
+        with open(output_file, "w") as f:
+            f.write("\n".join(all_posts))
+        stage.items = len(all_posts)
+
+    trace.save(output_file)
 
 
 if __name__ == "__main__":
@@ -67,8 +81,10 @@ if __name__ == "__main__":
     parser.add_argument(
         "--mysql_password",
         "-p",
-        required=True,
-        help="Password for the given MySQL user.",
+        default=environ.get("MYSQL_PASSWORD"),
+        required="MYSQL_PASSWORD" not in environ,
+        help="Password for the given MySQL user. Defaults to the 'MYSQL_PASSWORD' environment "
+             "variable, which keeps the password out of the process list.",
         metavar="MYSQL_PASSWORD")
     parser.add_argument(
         "--convinceme_db_name",
@@ -95,9 +111,16 @@ if __name__ == "__main__":
         help="Path to the directory the output should be written to.",
         metavar="OUTPUT_DIR")
 
+    add_profile_argument(parser)
+
     args = parser.parse_args()
 
     logging.basicConfig(**LOGGING_CONFIG)
 
-    main()
+    # Imported only now, so that '--help' does not need to wait for them
+    import pandas as pd
+    from sqlalchemy import create_engine
+
+    with profiled(args.profile, "prepare_iac_data"):
+        main()
     print("Done.")
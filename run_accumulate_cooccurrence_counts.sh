@@ -1,5 +1,6 @@
 #! /bin/bash
 
 python accumulate_cooccurrence_counts.py \
-    --input "output/weat_cooccurrence_analysis/weat-cooccurrence-analysis_results-20201105122930.json" \
-    --weat_lexicons "sbeval/tests/weat_tests.json"
+    --input "output/weat_cooccurrence_analysis" \
+    --weat_lexicons "sbeval/tests/weat_tests.json" \
+    --output "output/weat_cooccurrence_analysis/accumulated_counts.csv"
@@ -0,0 +1,13 @@
+#! /bin/bash
+
+# Compare the debate.org models of all demographic subgroups pairwise
+python embedding_bias_comparison.py \
+    --embedding_models \
+        "output/glove/debate_org-female-vectors.txt" \
+        "output/glove/debate_org-male-vectors.txt" \
+        "output/glove/debate_org-african-american-vectors.txt" \
+        "output/glove/debate_org-european-american-vectors.txt" \
+        "output/glove/debate_org-22-below-vectors.txt" \
+        "output/glove/debate_org-23-up-vectors.txt" \
+    --output "output/embedding_model_evaluation" \
+    --lowercase
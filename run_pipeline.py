@@ -0,0 +1,321 @@
+import argparse
+import logging
+import sys
+
+from os import cpu_count, environ, makedirs, path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.pipeline import Pipeline, Stage
+
+# Number of random splits generated for each corpus
+N_SPLITS = 5
+
+# Number of threads used by GloVe, see `NUM_THREADS` in `GloVe/generate_glove_model.sh`
+GLOVE_THREADS = 8
+
+# Name of the embedding model and the prepared GloVe input file for each corpus
+MODELS_BY_CORPUS = {
+    "cmv": {
+        "webis_cmv": "cmv-text_only--glove-format"},
+    "ddo": {
+        "debate_org": "debate_org-all_posts--glove-format",
+        "debate_org-female": "debate_org-gender-female-posts--glove-format",
+        "debate_org-male": "debate_org-gender-male-posts--glove-format",
+        "debate_org-african-american": "debate_org-ethnicity-african-american-posts--glove-format",
+        "debate_org-european-american":
+            "debate_org-ethnicity-european-american-posts--glove-format",
+        "debate_org-22-below": "debate_org-age_groups-22-below-posts--glove-format",
+        "debate_org-23-up": "debate_org-age_groups-23-up-posts--glove-format"},
+    "iac": {
+        "iac_combined": "iac_posts_combined--glove-format",
+        "iac_convinceme": "iac_posts_convinceme--glove-format",
+        "iac_createdebate": "iac_posts_createdebate--glove-format",
+        "iac_fourforums": "iac_posts_fourforums--glove-format"}}
+
+# Debate portals of the Internet Argument Corpus
+IAC_PORTALS = ["convinceme", "createdebate", "fourforums"]
+
+GLOVE_FORMAT_DIR = path.join("output", "glove_format")
+GLOVE_DIR = path.join("output", "glove")
+EVALUATION_DIR = path.join("output", "embedding_model_evaluation")
+
+
+def _glove_input_files(basename: str) -> list:
+    """Return the paths of a prepared GloVe input corpus and all of its splits.
+
+    Arguments:
+    basename -- The base filename of the corpus.
+    """
+    return [
+        path.join(GLOVE_FORMAT_DIR, f"{basename}.txt"),
+        *[path.join(GLOVE_FORMAT_DIR, "splits", f"{basename}__split{i}.txt")
+          for i in range(N_SPLITS)]]
+
+
+def data_preparation_stages(cores: int) -> list:
+    """Define the stages that extract the raw texts of each corpus. Return them as list.
+
+    Arguments:
+    cores -- The number of cores that a single stage may use.
+    """
+    return [
+        Stage(
+            "prepare_cmv_data",
+            ["python", "prepare_cmv_data.py",
+             "--input", "data/threads.jsonl",
+             "--output", "output"],
+            inputs=["data/threads.jsonl"],
+            outputs=["output/webis-cmv-20-texts_only.txt"]),
+        Stage(
+            "prepare_ddo_data",
+            ["python", "prepare_ddo_data.py",
+             "--debates", "data/debates.json",
+             "--users", "data/users.json",
+             "--output", "output",
+             "--multicore",
+             "--processing_cores", str(cores)],
+            inputs=["data/debates.json", "data/users.json"],
+            outputs=["output/debates_data-prepared.csv"],
+            cores=cores),
+        Stage(
+            "prepare_iac_data",
+            ["python", "prepare_iac_data.py",
+             "--mysql_address", args.mysql_address,
+             "--mysql_user", args.mysql_user,
+             "--convinceme_db_name", "convinceme",
+             "--createdebate_db_name", "createdebate",
+             "--fourforums_db_name", "fourforums",
+             "--output", "output"],
+            outputs=[
+                *[f"output/iacv2-{portal}-texts.txt" for portal in IAC_PORTALS],
+                "output/iacv2-combined-texts.txt"],
+            # The password is passed via the environment, so that it never shows up in the logs
+            env={"MYSQL_PASSWORD": args.mysql_password})]
+
+
+def glove_input_stages(cores: int) -> list:
+    """Define the stages that tokenize and split the texts of each corpus. Return them as list.
+
+    Arguments:
+    cores -- The number of cores that a single stage may use.
+    """
+    stages = [
+        Stage(
+            "prepare_cmv_glove_input",
+            ["python", "prepare_glove_input_from_cmv.py",
+             "--input", "output/webis-cmv-20-texts_only.txt",
+             "--output", GLOVE_FORMAT_DIR,
+             "--splits", str(N_SPLITS),
+             "--processing_cores", str(cores)],
+            inputs=["output/webis-cmv-20-texts_only.txt"],
+            outputs=_glove_input_files(MODELS_BY_CORPUS["cmv"]["webis_cmv"]),
+            cores=cores),
+        Stage(
+            "prepare_ddo_glove_input",
+            ["python", "prepare_glove_input_from_ddo.py",
+             "--input", "output/debates_data-prepared.csv",
+             "--output", GLOVE_FORMAT_DIR,
+             "--splits", str(N_SPLITS)],
+            inputs=["output/debates_data-prepared.csv"],
+            outputs=_glove_input_files(MODELS_BY_CORPUS["ddo"]["debate_org"])),
+        Stage(
+            "prepare_ddo_groups_glove_input",
+            ["python", "prepare_glove_input_from_ddo.py",
+             "--input", "output/debates_data-prepared.csv",
+             "--groups", "data/groups_of_interest.json",
+             "--output", GLOVE_FORMAT_DIR,
+             "--splits", str(N_SPLITS)],
+            inputs=["output/debates_data-prepared.csv", "data/groups_of_interest.json"],
+            outputs=[
+                output_file
+                for model, basename in MODELS_BY_CORPUS["ddo"].items() if model != "debate_org"
+                for output_file in _glove_input_files(basename)])]
+
+    for portal in [*IAC_PORTALS, "combined"]:
+        stages.append(Stage(
+            f"prepare_iac_{portal}_glove_input",
+            ["python", "prepare_glove_input_from_iac.py",
+             "--input", f"output/iacv2-{portal}-texts.txt",
+             "--output", GLOVE_FORMAT_DIR,
+             "--filename_postfix", f"_{portal}",
+             "--splits", str(N_SPLITS),
+             "--processing_cores", str(cores)],
+            inputs=[f"output/iacv2-{portal}-texts.txt"],
+            outputs=_glove_input_files(MODELS_BY_CORPUS["iac"][f"iac_{portal}"]),
+            cores=cores))
+
+    return stages
+
+
+def glove_model_stage(corpus_file: str, output_dir: str, prefix: str) -> Stage:
+    """Define the stage that trains a GloVe model on the given corpus. Return it.
+
+    The training itself is done by the `generate_glove_model` function of the GloVe scripts. It
+    writes the temporary files of `cooccur` and `shuffle` next to the model files, so that models
+    can be trained concurrently in the same working directory.
+
+    Arguments:
+    corpus_file -- The path to the prepared GloVe input file.
+    output_dir -- The directory the model files should be written to.
+    prefix -- The prefix of all model files.
+    """
+    vectors_file = path.join(output_dir, f"{prefix}-vectors.txt")
+    script = (
+        "source generate_glove_model.sh && "
+        f"generate_glove_model '../{corpus_file}' '../{output_dir}' '{prefix}'")
+
+    return Stage(
+        f"glove_model:{prefix}",
+        ["bash", "-c", script],
+        inputs=[corpus_file, "GloVe/generate_glove_model.sh"],
+        outputs=[vectors_file, path.join(output_dir, f"{prefix}-vocab.txt")],
+        cwd="GloVe",
+        cores=GLOVE_THREADS,
+        after=["build_glove"])
+
+
+def evaluation_stage(vectors_file: str) -> Stage:
+    """Define the stage that evaluates the social bias of the given embedding model. Return it.
+
+    Arguments:
+    vectors_file -- The path to the vectors file of the model.
+    """
+    return Stage(
+        f"embedding_bias_evaluation:{path.basename(vectors_file)}",
+        ["python", "embedding_bias_evaluation.py",
+         "--embedding_model", vectors_file,
+         "--output", EVALUATION_DIR,
+         "--lowercase"],
+        inputs=[vectors_file, "sbeval/tests/weat_tests.json"])
+
+
+def define_stages(corpora: list, cores: int) -> list:
+    """Define all stages of the pipeline for the given corpora. Return them as list.
+
+    Arguments:
+    corpora -- The corpora (out of 'cmv', 'ddo' and 'iac') to include.
+    cores -- The number of cores that a single stage may use.
+    """
+    # The names of the preparation stages contain the corpus as second part, e.g. 'prepare_cmv_data'
+    stages = [
+        stage for stage in [*data_preparation_stages(cores), *glove_input_stages(cores)]
+        if stage.name.split("_")[1] in corpora]
+    stages.append(Stage("build_glove", ["make"], cwd="GloVe"))
+
+    for corpus in corpora:
+        for model, basename in MODELS_BY_CORPUS[corpus].items():
+            corpus_files = _glove_input_files(basename)
+            model_stages = [glove_model_stage(corpus_files[0], GLOVE_DIR, model)]
+            for i in range(N_SPLITS):
+                model_stages.append(glove_model_stage(
+                    corpus_files[i + 1], path.join(GLOVE_DIR, "splits"), f"{model}__split{i}"))
+
+            stages.extend(model_stages)
+            stages.extend([evaluation_stage(stage.outputs[0]) for stage in model_stages])
+
+    return stages
+
+
+def main():
+    stages = define_stages(args.corpora, args.processing_cores)
+    pipeline = Pipeline(stages, args.cache_file)
+
+    if args.list:
+        for name in sorted(pipeline.stages):
+            print(name)
+        return 0
+
+    # Concurrent stages write into the same output directories, so they are created upfront
+    if not args.dry_run:
+        for directory in [
+                path.join(GLOVE_FORMAT_DIR, "splits"), path.join(GLOVE_DIR, "splits"),
+                EVALUATION_DIR]:
+            makedirs(directory, exist_ok=True)
+
+    status = pipeline.run(
+        targets=args.targets,
+        max_cores=args.processing_cores,
+        force=args.force,
+        dry_run=args.dry_run)
+
+    # Summarize the run
+    for state in ["cached", "done", "pending", "skipped", "failed"]:
+        names = sorted(name for name, s in status.items() if s == state)
+        if names:
+            logging.info(f"{len(names)} stage(s) {state}: {', '.join(names)}")
+
+    return 1 if "failed" in status.values() else 0
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to run the full pipeline, from the raw corpora to the bias evaluation of all "
+        "embedding models. Stages whose inputs and parameters did not change since their last "
+        "successful run are skipped.")
+
+    parser.add_argument(
+        "--corpora",
+        nargs="+",
+        default=list(MODELS_BY_CORPUS.keys()),
+        choices=list(MODELS_BY_CORPUS.keys()),
+        help="The corpora to include in the pipeline (whitespace separated).",
+        metavar="CORPORA")
+    parser.add_argument(
+        "--targets",
+        "-t",
+        nargs="+",
+        default=None,
+        help="Names of the stages to bring up to date, including everything they depend on. "
+             "All stages are run by default; use '--list' to show the names of all stages.",
+        metavar="TARGETS")
+    parser.add_argument(
+        "--processing_cores",
+        "-c",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of processing cores all concurrently running stages may use.",
+        metavar="PROCESSING_CORES")
+    parser.add_argument(
+        "--cache_file",
+        default=path.join("output", ".pipeline_cache.json"),
+        type=str,
+        help="Path to the file that stores the state of previous runs.",
+        metavar="CACHE_FILE")
+    parser.add_argument(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Whether to run all stages, even if their results are up to date.")
+    parser.add_argument(
+        "--dry_run",
+        "-n",
+        action="store_true",
+        help="Whether to only show which stages would run.")
+    parser.add_argument(
+        "--list",
+        "-l",
+        action="store_true",
+        help="Whether to only list the names of all stages.")
+    parser.add_argument(
+        "--mysql_address",
+        default="localhost",
+        help="Address of the MySQL server that provides read access to the IAC databases.",
+        metavar="MYSQL_ADDRESS")
+    parser.add_argument(
+        "--mysql_user",
+        default="mysql",
+        help="User that is able to access the database at the specified MySQL address.",
+        metavar="MYSQL_USER")
+    parser.add_argument(
+        "--mysql_password",
+        default=environ.get("MYSQL_PASSWORD", "mysql"),
+        help="Password for the given MySQL user. Defaults to the 'MYSQL_PASSWORD' environment "
+             "variable.",
+        metavar="MYSQL_PASSWORD")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    sys.exit(main())
@@ -0,0 +1,181 @@
+import hashlib
+import logging
+import numpy as np
+
+from os import makedirs, path, stat
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.glove_files import matching_vocab_file
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+
+def shared_vocabulary(reference_words: list, words: list) -> tuple:
+    """Find the words two models have in common.
+
+    Return a tuple of two index arrays, pointing to the shared words in the reference and in the
+    other model respectively, in the order of the reference vocabulary.
+
+    Arguments:
+    reference_words -- The vocabulary of the reference model.
+    words -- The vocabulary of the other model.
+    """
+    word_index = {word: i for i, word in enumerate(words)}
+    pairs = [
+        (i, word_index[word]) for i, word in enumerate(reference_words) if word in word_index]
+    if not pairs:
+        return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+    reference_indices, indices = zip(*pairs)
+    return (np.array(reference_indices), np.array(indices))
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale all rows of the given matrix to unit length. Return the scaled float32 matrix.
+
+    Arguments:
+    vectors -- The matrix whose rows should be normalized.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+
+    return vectors / norms
+
+
+def _cross_covariance(
+        vectors: np.ndarray,
+        indices: np.ndarray,
+        reference_vectors: np.ndarray,
+        reference_indices: np.ndarray,
+        chunk_size: int) -> np.ndarray:
+    """Calculate $X^T Y$ over the given rows of two models. Return it as float32 matrix.
+
+    Rows are selected and normalized to unit length chunk by chunk, so that no copy of the full
+    matrices is needed.
+    """
+    covariance = np.zeros((vectors.shape[1], reference_vectors.shape[1]), dtype=np.float32)
+    for start in range(0, len(indices), chunk_size):
+        covariance += np.dot(
+            normalize_rows(vectors[indices[start:start + chunk_size]]).T,
+            normalize_rows(reference_vectors[reference_indices[start:start + chunk_size]]))
+
+    return covariance
+
+
+def procrustes_rotations(covariances: np.ndarray) -> np.ndarray:
+    """Solve the orthogonal Procrustes problem for a batch of cross-covariance matrices.
+
+    Return the rotation matrices $R = U V^T$, where $U \Sigma V^T$ is the singular value
+    decomposition of $X^T Y$. $R$ minimizes $||X R - Y||_F$ among all orthogonal matrices. All SVDs
+    are computed in a single batched call.
+
+    Arguments:
+    covariances -- Array of shape (models, dimension, dimension) of the matrices $X^T Y$.
+    """
+    u, _, vt = np.linalg.svd(np.asarray(covariances, dtype=np.float32))
+    return np.matmul(u, vt)
+
+
+class ProcrustesAligner:
+    """Align the vectors of any number of models to a reference model with orthogonal Procrustes.
+
+    All models are aligned over the vocabulary they share with the reference model, after their
+    vectors were normalized to unit length. The rotation matrices are cached on disk, keyed by the
+    paths, sizes and modification times of the model files and their GloVe vocabulary files, and by
+    the vectors used from GloVe's binary format.
+
+    Arguments:
+    reference_path -- The path to the reference model.
+    reference_words -- The vocabulary of the reference model.
+    reference_vectors -- The vectors of the reference model.
+    cache_dir -- The directory to cache the rotation matrices in; no caching if `None`.
+    chunk_size -- The number of rows to process at once.
+    glove_vectors -- Which vectors the models were read with from GloVe's binary format, see
+                     `read_glove_binary()`.
+    """
+
+    def __init__(
+            self,
+            reference_path: str,
+            reference_words: list,
+            reference_vectors: np.ndarray,
+            cache_dir: str = None,
+            chunk_size: int = 100000,
+            glove_vectors: str = "sum"):
+        self.reference_path = reference_path
+        self.reference_words = reference_words
+        self.reference_vectors = reference_vectors
+        self.cache_dir = cache_dir
+        self.chunk_size = chunk_size
+        self.glove_vectors = glove_vectors
+
+        if cache_dir:
+            makedirs(cache_dir, exist_ok=True)
+
+    def _cache_file(self, model_path: str) -> str:
+        """Return the path of the cache file for the rotation of the given model."""
+        # The vocabulary of GloVe's binary format is read from a separate file
+        files = [self.reference_path, model_path]
+        files += [vocab_path for vocab_path in map(matching_vocab_file, files) if vocab_path]
+
+        signature = {
+            "files": [[path.abspath(p), stat(p).st_size, stat(p).st_mtime_ns] for p in files],
+            "glove_vectors": self.glove_vectors}
+        key = hashlib.sha256(repr(signature).encode("utf-8")).hexdigest()
+
+        return path.join(self.cache_dir, f"{path.basename(model_path)}-{key[:16]}.npy")
+
+    def rotations(self, models: dict) -> dict:
+        """Calculate the rotation matrices that align each of the given models to the reference.
+
+        Return them by model path. Matrices that are not cached yet are calculated in a single
+        batched SVD.
+
+        Arguments:
+        models -- Tuples of the vocabulary and the vectors of each model, by model path.
+        """
+        rotations = {}
+        covariances = {}
+        for model_path, (words, vectors) in models.items():
+            if self.cache_dir and path.isfile(self._cache_file(model_path)):
+                logging.debug(f"Using cached rotation of '{model_path}'.")
+                rotations[model_path] = np.load(self._cache_file(model_path))
+                continue
+
+            reference_indices, indices = shared_vocabulary(self.reference_words, words)
+            covariances[model_path] = _cross_covariance(
+                vectors, indices, self.reference_vectors, reference_indices, self.chunk_size)
+
+        if covariances:
+            logging.info(f"Calculating {len(covariances)} rotation(s)...")
+            for model_path, rotation in zip(
+                    covariances.keys(), procrustes_rotations(list(covariances.values()))):
+                rotations[model_path] = rotation
+                if self.cache_dir:
+                    np.save(self._cache_file(model_path), rotation)
+
+        return rotations
+
+    def displacements(self, words: list, vectors: np.ndarray, rotation: np.ndarray):
+        """Calculate the displacement of each shared word after aligning a model to the reference.
+
+        The displacement is the cosine distance between the aligned vector of a word and its
+        vector in the reference model. Yield tuples of the words and their displacements, chunk by
+        chunk, in the order of the reference vocabulary.
+
+        Arguments:
+        words -- The vocabulary of the model.
+        vectors -- The vectors of the model.
+        rotation -- The rotation matrix that aligns the model to the reference.
+        """
+        reference_indices, indices = shared_vocabulary(self.reference_words, words)
+        for start in range(0, len(indices), self.chunk_size):
+            chunk_indices = indices[start:start + self.chunk_size]
+            chunk_reference_indices = reference_indices[start:start + self.chunk_size]
+            aligned = np.dot(normalize_rows(vectors[chunk_indices]), rotation)
+            reference = normalize_rows(self.reference_vectors[chunk_reference_indices])
+
+            yield (
+                [self.reference_words[i] for i in chunk_reference_indices],
+                1 - np.sum(aligned * reference, axis=1))
@@ -0,0 +1,331 @@
+import argparse
+import codecs
+import json
+import logging
+import numpy as np
+import statistics
+import sys
+import time
+import tracemalloc
+
+from argparse import Namespace
+from importlib import import_module
+from itertools import product
+from os import cpu_count, path, register_at_fork
+from tempfile import TemporaryDirectory
+
+from sbeval.benchmarks.synthetic import (
+    generate_contexts, generate_posts, generate_vocabulary, write_vectors)
+from sbeval.constants import LOGGING_CONFIG
+
+# Word lists used by the lexical corpus evaluation
+POSITIVE_WORD_LIST = path.join("data", "positive-words.txt")
+NEGATIVE_WORD_LIST = path.join("data", "negative-words.txt")
+
+# Tracing memory allocations in forked pool workers would slow them down considerably, while their
+# memory is not reported anyways
+register_at_fork(after_in_child=tracemalloc.stop)
+
+
+def measure(function, repeats: int) -> dict:
+    """Run the given function repeatedly and measure its wall time and peak memory.
+
+    Return the median and minimum wall time in seconds, the number of items the function reported
+    to have processed and its peak memory in MiB. The peak memory is measured with `tracemalloc` in
+    a separate run, as tracing slows down the function; it only covers the main process.
+
+    Arguments:
+    function -- A function without arguments that returns the number of items it processed.
+    repeats -- The number of timed runs.
+    """
+    wall_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items = function()
+        wall_times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(wall_times)
+    return {
+        "median": median,
+        "min": min(wall_times),
+        "items": items,
+        "throughput": items / median if median > 0 else None,
+        "peak_memory_mib": peak_memory / 2 ** 20}
+
+
+def _weat_lexicons() -> dict:
+    """Load the WEAT test lexicons, lowercased. Return them by test name."""
+    with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
+        weat_tests = json.load(f)
+
+    return {
+        test_name: {key: [token.lower() for token in test[key]] for key in ["X", "Y", "A", "B"]}
+        for test_name, test in weat_tests.items()}
+
+
+def benchmark_embeddings_loading(vectors_file: str) -> int:
+    """Load the synthetic vector file with `CustomEmbeddings`. Return the number of vectors."""
+    from sbeval.word_vectors import CustomEmbeddings
+
+    return len(CustomEmbeddings(vectors_file).embeddings)
+
+
+def benchmark_weat_score(embeddings, lexicons: dict) -> int:
+    """Calculate the WEAT scores of all tests. Return the number of tests."""
+    from sbeval.weat_test import weat_score
+
+    for lexicon in lexicons.values():
+        weat_score(
+            lexicon["X"], lexicon["Y"], lexicon["A"], lexicon["B"], word_vector_getter=embeddings)
+
+    return len(lexicons)
+
+
+def benchmark_candidate_posts(analysis, pairs: list) -> int:
+    """Find the candidate posts of all pairs. Return the number of searched posts."""
+    analysis.calculate_candidate_posts(pairs)
+    return len(analysis.posts)
+
+
+def benchmark_cooccurrences(analysis, pairs: list) -> int:
+    """Collect the co-occurrence sentences of all pairs. Return the number of searched sentences."""
+    analysis.calculate_cooccurrences(pairs)
+    return len(analysis.sentences)
+
+
+def benchmark_statistics(evaluation, contexts: list) -> int:
+    """Generate the n-gram statistics of all contexts. Return the number of contexts."""
+    evaluation.generate_statistics(contexts)
+    return len(contexts)
+
+
+def benchmark_split_corpus(posts: list, output_dir: str) -> int:
+    """Split the posts into five splits and write them to disk. Return the number of posts."""
+    from sbeval.utils import split_corpus
+
+    split_corpus(list(posts), 5, output_dir, "benchmark")
+    return len(posts)
+
+
+def define_benchmarks(tmp_dir: str) -> dict:
+    """Generate the synthetic data and define all benchmarks on it. Return them by name.
+
+    Each benchmark is a function without arguments that returns the number of processed items.
+
+    Arguments:
+    tmp_dir -- The directory to write the synthetic files to.
+    """
+    logging.info("Generating synthetic data...")
+    words = generate_vocabulary(args.vocab_size, random_state=args.seed)
+    vectors_file = path.join(tmp_dir, "synthetic-vectors.txt")
+    write_vectors(vectors_file, words, args.dimension, random_state=args.seed)
+    posts = generate_posts(words, args.posts, args.post_length, random_state=args.seed)
+
+    # The contexts contain sentiment words as well, so that all statistics are non-trivial
+    sentiment_words = []
+    for word_list in [POSITIVE_WORD_LIST, NEGATIVE_WORD_LIST]:
+        with codecs.open(word_list, "r", encoding="latin1") as f:
+            sentiment_words.extend(f.read().split("\r\n")[31:])
+    contexts = generate_contexts(
+        [*words[:1000], *sentiment_words], args.contexts, random_state=args.seed)
+
+    # Pairs of target and attribute words, the same as in the co-occurrence analysis; as the
+    # analysis searches all posts once per pair, only a random sample of the pairs is used
+    lexicons = _weat_lexicons()
+    pairs = sorted({
+        pair for lexicon in lexicons.values()
+        for pair in product([*lexicon["X"], *lexicon["Y"]], [*lexicon["A"], *lexicon["B"]])})
+    random_generator = np.random.RandomState(args.seed)
+    pairs = [
+        pairs[i] for i in random_generator.choice(
+            len(pairs), size=min(args.pairs, len(pairs)), replace=False)]
+
+    # The functions of the scripts read their inputs and parameters from module globals
+    analysis = import_module("weat_cooccurrence_analysis")
+    analysis.args = Namespace(processing_cores=args.processing_cores)
+    analysis.posts = posts
+    analysis.sentences = posts
+
+    evaluation = import_module("lexical_corpus_evaluation")
+    evaluation.args = Namespace(
+        most_common=10,
+        positive_word_list=POSITIVE_WORD_LIST,
+        negative_word_list=NEGATIVE_WORD_LIST)
+
+    from sbeval.word_vectors import CustomEmbeddings
+    embeddings = CustomEmbeddings(vectors_file)
+
+    return {
+        "embeddings_loading": lambda: benchmark_embeddings_loading(vectors_file),
+        "weat_score": lambda: benchmark_weat_score(embeddings, lexicons),
+        "calculate_candidate_posts": lambda: benchmark_candidate_posts(analysis, pairs),
+        "calculate_cooccurrences": lambda: benchmark_cooccurrences(analysis, pairs),
+        "generate_statistics": lambda: benchmark_statistics(evaluation, contexts),
+        "split_corpus": lambda: benchmark_split_corpus(posts, tmp_dir)}
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        benchmarks = define_benchmarks(tmp_dir)
+
+        results = {}
+        for name in args.benchmarks or benchmarks.keys():
+            logging.info(f"Running benchmark '{name}'...")
+            results[name] = measure(benchmarks[name], args.repeats)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if baseline["parameters"] != parameters():
+            logging.warning("The baseline was measured with different parameters.")
+        baseline = baseline["benchmarks"]
+
+    # Report the results
+    regressions = []
+    for name, result in results.items():
+        line = (
+            f"{name:<28} {result['median']:8.3f}s  {result['throughput']:12.1f} items/s  "
+            f"{result['peak_memory_mib']:8.1f} MiB")
+        if name in baseline:
+            line += f"  baseline {baseline[name]['median']:.3f}s"
+            if result["median"] > baseline[name]["median"] * args.tolerance + args.slack:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.output:
+        logging.info(f"Exporting results to disk at {args.output}.")
+        with open(args.output, "w") as f:
+            json.dump({"parameters": parameters(), "benchmarks": results}, f, indent=4)
+
+    if regressions:
+        logging.error(f"Benchmarks regressed: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+def parameters() -> dict:
+    """Return the parameters that define the synthetic data of a benchmark run."""
+    return {
+        "vocab_size": args.vocab_size,
+        "dimension": args.dimension,
+        "posts": args.posts,
+        "post_length": args.post_length,
+        "contexts": args.contexts,
+        "pairs": args.pairs,
+        "seed": args.seed,
+        "processing_cores": args.processing_cores}
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A benchmark of the WEAT and co-occurrence hot paths on synthetic data. Run it from the "
+        "root directory of the repository with 'python -m sbeval.benchmarks.hot_paths'.")
+
+    parser.add_argument(
+        "-b",
+        "--benchmarks",
+        nargs="+",
+        default=None,
+        choices=[
+            "embeddings_loading", "weat_score", "calculate_candidate_posts",
+            "calculate_cooccurrences", "generate_statistics", "split_corpus"],
+        help="Names of the benchmarks to run (whitespace separated); all by default.",
+        metavar="BENCHMARKS")
+    parser.add_argument(
+        "--vocab_size",
+        default=50000,
+        type=int,
+        help="The number of words of the synthetic embedding model and corpus.",
+        metavar="VOCAB_SIZE")
+    parser.add_argument(
+        "--dimension",
+        default=300,
+        type=int,
+        help="The number of dimensions of the synthetic vectors.",
+        metavar="DIMENSION")
+    parser.add_argument(
+        "--posts",
+        default=20000,
+        type=int,
+        help="The number of posts of the synthetic corpus.",
+        metavar="POSTS")
+    parser.add_argument(
+        "--post_length",
+        default=50,
+        type=int,
+        help="The mean number of words per synthetic post.",
+        metavar="POST_LENGTH")
+    parser.add_argument(
+        "--contexts",
+        default=50000,
+        type=int,
+        help="The number of synthetic contexts of the lexical corpus evaluation.",
+        metavar="CONTEXTS")
+    parser.add_argument(
+        "--pairs",
+        default=500,
+        type=int,
+        help="The number of target-attribute pairs searched by the co-occurrence analysis.",
+        metavar="PAIRS")
+    parser.add_argument(
+        "--seed",
+        default=42,
+        type=int,
+        help="The seed to be used for generating the synthetic data.",
+        metavar="SEED")
+    parser.add_argument(
+        "-c",
+        "--processing_cores",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of processing cores of the co-occurrence analysis.",
+        metavar="PROCESSING_CORES")
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        default=3,
+        type=int,
+        help="The number of timed runs per benchmark; the median wall time is reported.",
+        metavar="REPEATS")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        type=str,
+        help="Path to a JSON file the results should be written to, e.g. to serve as baseline.",
+        metavar="OUTPUT_FILE")
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        type=str,
+        help="Path to the results of a previous run. Benchmarks that got slower are reported as "
+             "regressions and make the benchmark exit with a non-zero code.",
+        metavar="BASELINE_FILE")
+    parser.add_argument(
+        "--tolerance",
+        default=1.25,
+        type=float,
+        help="The factor by which a benchmark may be slower than in the baseline.",
+        metavar="TOLERANCE")
+    parser.add_argument(
+        "--slack",
+        default=0.01,
+        type=float,
+        help="Additional seconds a benchmark may be slower than in the baseline, to absorb noise.",
+        metavar="SLACK")
+
+    args = parser.parse_args()
+    args.processing_cores = max(args.processing_cores, 1)
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import argparse
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+
+from glob import glob
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+
+# The root directory of the repository, which contains all scripts
+REPOSITORY_DIR = path.dirname(path.dirname(path.dirname(path.abspath(__file__))))
+
+
+def find_scripts() -> list:
+    """Find all runnable scripts in the root directory of the repository. Return their filenames."""
+    scripts = []
+    for script in sorted(glob(path.join(REPOSITORY_DIR, "*.py"))):
+        with open(script, "r") as f:
+            if 'if __name__ == "__main__":' in f.read():
+                scripts.append(path.basename(script))
+
+    return scripts
+
+
+def measure_startup(script: str, repeats: int) -> list:
+    """Measure how long it takes to run the given script with `--help`. Return all wall times.
+
+    Raise a `subprocess.CalledProcessError` if the script fails, e.g. due to a missing dependency.
+
+    Arguments:
+    script -- The filename of the script.
+    repeats -- The number of runs.
+    """
+    wall_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, script, "--help"],
+            cwd=REPOSITORY_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True)
+        wall_times.append(time.perf_counter() - start)
+
+    return wall_times
+
+
+def slowest_imports(script: str, n: int) -> list:
+    """Find the top-level imports that take the longest when running the given script with `--help`.
+
+    Return a list of the module names and their cumulative import times in seconds, as reported by
+    Python's `-X importtime` option.
+
+    Arguments:
+    script -- The filename of the script.
+    n -- The number of imports to return.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", script, "--help"],
+        cwd=REPOSITORY_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True)
+
+    imports = []
+    for line in result.stderr.splitlines():
+        # Lines look like 'import time:       self [us] |  cumulative | imported package', where
+        # nested imports are indented
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        if not module.startswith("  "):
+            imports.append((module.strip(), int(cumulative) / 1e6))
+
+    return sorted(imports, key=lambda i: i[1], reverse=True)[:n]
+
+
+def main():
+    scripts = args.scripts or find_scripts()
+
+    results = {}
+    for script in scripts:
+        try:
+            wall_times = measure_startup(script, args.repeats)
+        except subprocess.CalledProcessError as e:
+            logging.warning(f"Skipping '{script}', which failed: {e.stderr.decode().strip()}")
+            continue
+
+        results[script] = {"median": statistics.median(wall_times), "min": min(wall_times)}
+        if args.imports:
+            results[script]["slowest_imports"] = slowest_imports(script, args.imports)
+
+    # Report the results, slowest script first
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["scripts"]
+
+    regressions = []
+    for script, result in sorted(results.items(), key=lambda r: r[1]["median"], reverse=True):
+        line = f"{script:<40} {result['median']:7.3f}s (min {result['min']:.3f}s)"
+        if script in baseline:
+            limit = baseline[script]["median"] * args.tolerance + args.slack
+            line += f"  baseline {baseline[script]['median']:.3f}s"
+            if result["median"] > limit:
+                line += "  REGRESSION"
+                regressions.append(script)
+        print(line)
+
+        for module, seconds in result.get("slowest_imports", []):
+            print(f"    {module:<36} {seconds:7.3f}s")
+
+    if args.output:
+        logging.info(f"Exporting results to disk at {args.output}.")
+        with open(args.output, "w") as f:
+            json.dump({"python": sys.version, "scripts": results}, f, indent=4)
+
+    if regressions:
+        logging.error(f"Startup time regressed for: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A benchmark of the startup time of all scripts, measured by running them with '--help'. "
+        "Run it from the root directory of the repository with 'python -m "
+        "sbeval.benchmarks.import_time'.")
+
+    parser.add_argument(
+        "-s",
+        "--scripts",
+        nargs="+",
+        default=None,
+        help="Filenames of the scripts to measure (whitespace separated); all scripts by default.",
+        metavar="SCRIPTS")
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        default=5,
+        type=int,
+        help="The number of runs per script; the median wall time is reported.",
+        metavar="REPEATS")
+    parser.add_argument(
+        "-i",
+        "--imports",
+        default=0,
+        type=int,
+        help="The number of slowest top-level imports to report per script.",
+        metavar="IMPORTS")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        type=str,
+        help="Path to a JSON file the results should be written to, e.g. to serve as baseline.",
+        metavar="OUTPUT_FILE")
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        default=None,
+        type=str,
+        help="Path to the results of a previous run. Scripts that got slower are reported as "
+             "regressions and make the benchmark exit with a non-zero code.",
+        metavar="BASELINE_FILE")
+    parser.add_argument(
+        "--tolerance",
+        default=1.5,
+        type=float,
+        help="The factor by which a script may be slower than in the baseline.",
+        metavar="TOLERANCE")
+    parser.add_argument(
+        "--slack",
+        default=0.05,
+        type=float,
+        help="Additional seconds a script may be slower than in the baseline, to absorb noise.",
+        metavar="SLACK")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import json
+import numpy as np
+
+from os import path
+
+# Parts of speech assigned to the synthetic context tokens, see `generate_contexts()`
+POS_TAGS = ["NOUN", "VERB", "ADJ", "ADV", "PROPN"]
+
+
+def lexicon_tokens() -> list:
+    """Return all (lowercased) tokens of the WEAT test lexicons, sorted alphabetically."""
+    with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
+        weat_tests = json.load(f)
+
+    return sorted({
+        token.lower() for test in weat_tests.values()
+        for key in ["X", "Y", "A", "B"] for token in test[key]})
+
+
+def generate_vocabulary(size: int, random_state: int = 42) -> list:
+    """Generate a vocabulary that contains all lexicon tokens. Return it, ordered by frequency rank.
+
+    The lexicon tokens are placed at random ranks; all other words are synthetic.
+
+    Arguments:
+    size -- The number of words of the vocabulary; at least the number of lexicon tokens.
+    random_state -- The seed to be used for placing the lexicon tokens.
+    """
+    lexicon = lexicon_tokens()
+    words = [f"word{i}" for i in range(max(size - len(lexicon), 0))]
+
+    random_generator = np.random.RandomState(random_state)
+    for token, rank in zip(lexicon, random_generator.randint(0, len(words) + 1, len(lexicon))):
+        words.insert(rank, token)
+
+    return words
+
+
+def write_vectors(file_path: str, words: list, dimension: int, random_state: int = 42) -> None:
+    """Write random vectors for the given words to a file in GloVe text format (without header).
+
+    Arguments:
+    file_path -- The path to the output file.
+    words -- The words to write vectors for.
+    dimension -- The number of dimensions of each vector.
+    random_state -- The seed to be used for generating the vectors.
+    """
+    random_generator = np.random.RandomState(random_state)
+    with open(file_path, "w") as f:
+        for word in words:
+            vector = random_generator.normal(size=dimension)
+            f.write(f"{word} {' '.join(f'{value:.6f}' for value in vector)}\n")
+
+
+def _zipf_probabilities(n: int) -> np.ndarray:
+    """Return the probabilities of $n$ frequency ranks following Zipf's law."""
+    probabilities = 1 / np.arange(1, n + 1)
+    return probabilities / probabilities.sum()
+
+
+def generate_posts(
+        words: list,
+        n_posts: int,
+        post_length: int,
+        random_state: int = 42) -> list:
+    """Generate posts of whitespace separated words, sampled following Zipf's law. Return them.
+
+    Arguments:
+    words -- The vocabulary, ordered by frequency rank.
+    n_posts -- The number of posts to generate.
+    post_length -- The mean number of words per post.
+    random_state -- The seed to be used for generating the posts.
+    """
+    random_generator = np.random.RandomState(random_state)
+    lengths = random_generator.poisson(post_length, size=n_posts) + 1
+    tokens = random_generator.choice(
+        len(words), size=lengths.sum(), p=_zipf_probabilities(len(words)))
+
+    posts = []
+    start = 0
+    for length in lengths:
+        posts.append(" ".join(words[i] for i in tokens[start:start + length]))
+        start += length
+
+    return posts
+
+
+def generate_contexts(
+        words: list,
+        n_contexts: int,
+        context_size: int = 10,
+        random_state: int = 42) -> list:
+    """Generate contexts of (token, PoS tag) tuples, as extracted by the lexical corpus evaluation.
+
+    Return them as list of lists.
+
+    Arguments:
+    words -- The vocabulary, ordered by frequency rank.
+    n_contexts -- The number of contexts to generate.
+    context_size -- The number of tokens per context.
+    random_state -- The seed to be used for generating the contexts.
+    """
+    random_generator = np.random.RandomState(random_state)
+    tokens = random_generator.choice(
+        len(words), size=(n_contexts, context_size), p=_zipf_probabilities(len(words)))
+    tags = random_generator.randint(0, len(POS_TAGS), size=(n_contexts, context_size))
+
+    return [
+        [(words[t], POS_TAGS[p]) for t, p in zip(context_tokens, context_tags)]
+        for context_tokens, context_tags in zip(tokens, tags)]
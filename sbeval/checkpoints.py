@@ -0,0 +1,82 @@
+import hashlib
+import json
+import logging
+import numpy as np
+import os
+import shutil
+
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+
+def checkpoint_key(files: list, params: dict) -> str:
+    """Compute a key that identifies a run by its input files and parameters. Return it.
+
+    Files are identified by their path, size and modification time, so that large corpora don't
+    need to be hashed.
+
+    Arguments:
+    files -- Paths to all input files of the run.
+    params -- All parameters that change the results of the run; need to be JSON serializable.
+    """
+    file_stats = {}
+    for file_path in files:
+        stat = os.stat(file_path)
+        file_stats[path.abspath(file_path)] = [stat.st_size, stat.st_mtime_ns]
+
+    return hashlib.sha256(
+        json.dumps({"files": file_stats, "params": params}, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+class Checkpoints:
+    """A directory of named checkpoints, i.e. intermediate results of a long running script.
+
+    Each checkpoint is written to a temporary file first and renamed afterwards, so that a crash
+    while writing never leaves a partial checkpoint behind.
+
+    Arguments:
+    directory -- The directory to store the checkpoints in; created with the first checkpoint.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, name: str, extension: str) -> str:
+        return path.join(self.directory, f"{name}{extension}")
+
+    def exists(self, name: str) -> bool:
+        """Return whether a checkpoint of the given name exists."""
+        return any(path.isfile(self._path(name, extension)) for extension in [".npy", ".json"])
+
+    def _write(self, name: str, extension: str, write) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        file_path = self._path(name, extension)
+        with open(f"{file_path}.tmp", "wb") as f:
+            write(f)
+        os.replace(f"{file_path}.tmp", file_path)
+
+    def save_array(self, name: str, array: np.ndarray) -> None:
+        """Save the given array as checkpoint of the given name."""
+        self._write(name, ".npy", lambda f: np.save(f, array))
+
+    def load_array(self, name: str) -> np.ndarray:
+        """Load the array of the checkpoint of the given name. Return it."""
+        return np.load(self._path(name, ".npy"))
+
+    def save_json(self, name: str, data) -> None:
+        """Save the given JSON serializable data as checkpoint of the given name."""
+        self._write(name, ".json", lambda f: f.write(json.dumps(data).encode("utf-8")))
+
+    def load_json(self, name: str):
+        """Load the data of the checkpoint of the given name. Return it."""
+        with open(self._path(name, ".json"), "r") as f:
+            return json.load(f)
+
+    def clear(self) -> None:
+        """Remove all checkpoints, including the directory."""
+        logging.info(f"Removing checkpoints at {self.directory}.")
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,345 @@
+import logging
+import numpy as np
+
+from collections import Counter
+from itertools import repeat
+from multiprocessing import Pool
+from os import path
+from tqdm import tqdm
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+# Codes of the tokens that are not one of the counted words, see `encode_lines()`
+OTHER_WORD = -1
+OUT_OF_VOCABULARY = -2
+
+# Context window size of GloVe's `cooccur` and minimum count of GloVe's `vocab_count`, as used by
+# `GloVe/generate_glove_model.sh`
+GLOVE_WINDOW_SIZE = 15
+GLOVE_MIN_COUNT = 5
+
+# Globals of the worker processes, see `_init_worker()`
+_codes = None
+_n_words = None
+_window_size = None
+_default_code = None
+_row_lookup = None
+
+
+def token_codes(words: list, vocab: set = None) -> tuple:
+    """Map all tokens that need to be distinguished when counting co-occurrences to integer codes.
+
+    Return a tuple of the mapping and the code of all tokens that are not in the mapping. The
+    counted words are mapped to their index in `words`. If a vocabulary is given, all other words
+    of the vocabulary are mapped to `OTHER_WORD`, while any other token is `OUT_OF_VOCABULARY`.
+
+    Arguments:
+    words -- The words whose co-occurrences should be counted.
+    vocab -- The vocabulary of the embedding model, e.g. read from GloVe's `-vocab.txt` file. Tokens
+             that are not in the vocabulary are skipped, just as GloVe does. If `None`, all tokens
+             are in the vocabulary.
+    """
+    if vocab is None:
+        return ({word: i for i, word in enumerate(words)}, OTHER_WORD)
+
+    codes = dict.fromkeys(vocab, OTHER_WORD)
+    codes.update({word: i for i, word in enumerate(words) if word in vocab})
+
+    return (codes, OUT_OF_VOCABULARY)
+
+
+def encode_lines(lines: list, codes: dict, default_code: int) -> tuple:
+    """Encode the whitespace separated tokens of the given lines as integer codes.
+
+    Return a tuple of the codes of all tokens and the index of the line of each token.
+
+    Arguments:
+    lines -- The lines of a corpus, one document per line.
+    codes -- The code of each known token, see `token_codes()`.
+    default_code -- The code of all tokens that are not in `codes`.
+    """
+    encoded = []
+    lengths = []
+    for line in lines:
+        # GloVe splits on spaces and tabs only and ignores carriage returns
+        tokens = [t for t in line.replace("\r", "").replace("\t", " ").split(" ") if t]
+        encoded.extend(map(codes.get, tokens, repeat(default_code)))
+        lengths.append(len(tokens))
+
+    return (
+        np.array(encoded, dtype=np.int32),
+        np.repeat(np.arange(len(lines), dtype=np.int64), lengths))
+
+
+def window_counts(codes: np.ndarray, lines: np.ndarray, n_words: int, window_size: int) -> tuple:
+    """Count the co-occurrences of all words within a symmetric context window, as GloVe does.
+
+    Out-of-vocabulary tokens are removed before the distance of two tokens is determined, and the
+    window never reaches across lines. Each co-occurrence at distance $d$ adds 1 to the raw and
+    $1/d$ to the weighted count of both words.
+
+    Return a tuple of the symmetric matrices of raw and weighted counts of all word pairs.
+
+    Arguments:
+    codes -- The codes of all tokens, see `encode_lines()`.
+    lines -- The index of the line of each token.
+    n_words -- The number of counted words.
+    window_size -- The number of context words to the left and to the right of a word.
+    """
+    in_vocab = codes != OUT_OF_VOCABULARY
+    codes, lines = codes[in_vocab], lines[in_vocab]
+
+    # Only the positions of the counted words are needed to find all of their co-occurrences
+    positions = np.flatnonzero(codes >= 0)
+    words = codes[positions].astype(np.int64)
+    word_lines = lines[positions]
+
+    raw = np.zeros(n_words * n_words, dtype=np.float64)
+    weighted = np.zeros(n_words * n_words, dtype=np.float64)
+
+    # Compare each counted word to the `shift`-th next one; as positions are strictly increasing,
+    # no word further than `window_size` counted words away can be in the window
+    for shift in range(1, min(window_size, len(positions) - 1) + 1):
+        distances = positions[shift:] - positions[:-shift]
+        in_window = (distances <= window_size) & (word_lines[shift:] == word_lines[:-shift])
+        if not in_window.any():
+            break
+
+        pairs = words[:-shift][in_window] * n_words + words[shift:][in_window]
+        raw += np.bincount(pairs, minlength=n_words * n_words)
+        weighted += np.bincount(
+            pairs, weights=1.0 / distances[in_window], minlength=n_words * n_words)
+
+    raw = raw.reshape(n_words, n_words)
+    weighted = weighted.reshape(n_words, n_words)
+
+    # The left context of one word is the right context of the other
+    return (raw + raw.T, weighted + weighted.T)
+
+
+def context_counts(
+        codes: np.ndarray,
+        lines: np.ndarray,
+        row_lookup: np.ndarray,
+        window_size: int) -> tuple:
+    """Count the weighted co-occurrences of some words with all words of the vocabulary.
+
+    Uses the same window semantics as `window_counts()`, but the tokens are encoded by their index
+    in the vocabulary, so that every word of the vocabulary is a context.
+
+    Return a tuple of the unique (row, context) pairs, encoded as `row * vocab size + context`,
+    their weighted counts and the weighted counts of each vocabulary word with all contexts (i.e.
+    the row sums of the full co-occurrence matrix).
+
+    Arguments:
+    codes -- The vocabulary index of all tokens, see `encode_lines()`.
+    lines -- The index of the line of each token.
+    row_lookup -- The row of each vocabulary word, or -1 for words whose contexts are not needed.
+    window_size -- The number of context words to the left and to the right of a word.
+    """
+    n_contexts = len(row_lookup)
+    in_vocab = codes != OUT_OF_VOCABULARY
+    codes, lines = codes[in_vocab].astype(np.int64), lines[in_vocab]
+    token_indices = np.arange(len(codes))
+
+    # The sum of the weights of all contexts of a token only depends on its position in the line
+    harmonic_numbers = np.concatenate([[0.0], np.cumsum(1.0 / np.arange(1, window_size + 1))])
+    left = token_indices - np.searchsorted(lines, lines, side="left")
+    right = np.searchsorted(lines, lines, side="right") - 1 - token_indices
+    context_weights = harmonic_numbers[np.minimum(left, window_size)] \
+        + harmonic_numbers[np.minimum(right, window_size)]
+    marginals = np.bincount(codes, weights=context_weights, minlength=n_contexts)
+
+    rows = np.flatnonzero(row_lookup[codes] >= 0)
+    row_keys = row_lookup[codes[rows]] * n_contexts
+    pairs = []
+    weights = []
+    for distance in range(1, window_size + 1):
+        for contexts in [rows - distance, rows + distance]:
+            in_window = (contexts >= 0) & (contexts < len(codes))
+            in_window[in_window] = lines[contexts[in_window]] == lines[rows[in_window]]
+            pairs.append(row_keys[in_window] + codes[contexts[in_window]])
+            weights.append(np.full(np.count_nonzero(in_window), 1.0 / distance))
+
+    pairs, inverse = np.unique(np.concatenate(pairs), return_inverse=True)
+    return (pairs, np.bincount(inverse, weights=np.concatenate(weights)), marginals)
+
+
+def _line_aligned_chunks(file_path: str, chunk_bytes: int) -> list:
+    """Split a file into chunks of about the given size that end at a newline.
+
+    Return the (file path, start, end) tuples of the chunks, with byte offsets.
+    """
+    file_size = path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, "rb") as f:
+        while boundaries[-1] < file_size:
+            f.seek(min(boundaries[-1] + chunk_bytes, file_size))
+            f.readline()
+            boundaries.append(min(f.tell(), file_size))
+
+    return [(file_path, start, end) for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+
+def _read_chunk(chunk: tuple) -> list:
+    """Read the lines of the given chunk of a corpus, see `_line_aligned_chunks()`. Return them."""
+    file_path, start, end = chunk
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start).decode("utf-8", errors="replace").split("\n")
+
+
+def _map_chunks(function, file_path: str, chunk_bytes: int, n_process: int, initargs: tuple = None):
+    """Apply the given function to all chunks of a corpus in a pool of processes. Yield the results.
+
+    Arguments:
+    function -- The function to apply to each chunk.
+    file_path -- The path to the corpus.
+    chunk_bytes -- The approximate size of the chunks in bytes.
+    n_process -- The number of processes to use.
+    initargs -- The arguments to initialize the processes with, see `_init_worker()`.
+    """
+    chunks = _line_aligned_chunks(file_path, chunk_bytes)
+
+    pool = Pool(
+        processes=n_process,
+        initializer=_init_worker if initargs else None,
+        initargs=initargs or ())
+    yield from tqdm(pool.imap(function, chunks), total=len(chunks))
+
+    pool.close()
+    pool.join()
+
+
+def _init_worker(
+        codes: dict,
+        default_code: int,
+        n_words: int,
+        window_size: int,
+        row_lookup: np.ndarray = None) -> None:
+    global _codes, _default_code, _n_words, _window_size, _row_lookup
+
+    _codes = codes
+    _default_code = default_code
+    _n_words = n_words
+    _window_size = window_size
+    _row_lookup = row_lookup
+
+
+def _count_chunk(chunk: tuple) -> tuple:
+    """Count the co-occurrences in the given chunk of the corpus. Return raw and weighted counts."""
+    return window_counts(
+        *encode_lines(_read_chunk(chunk), _codes, _default_code), _n_words, _window_size)
+
+
+def _count_chunk_tokens(chunk: tuple) -> Counter:
+    """Count the tokens in the given chunk of the corpus, split as in `encode_lines()`."""
+    return Counter(
+        token for line in _read_chunk(chunk)
+        for token in line.replace("\r", "").replace("\t", " ").split(" ") if token)
+
+
+def _count_chunk_contexts(chunk: tuple) -> tuple:
+    """Count the contexts of the rows in the given chunk of the corpus, see `context_counts()`."""
+    return context_counts(
+        *encode_lines(_read_chunk(chunk), _codes, _default_code), _row_lookup, _window_size)
+
+
+def count_window_cooccurrences(
+        file_path: str,
+        words: list,
+        window_size: int = GLOVE_WINDOW_SIZE,
+        vocab: set = None,
+        chunk_bytes: int = 2 ** 25,
+        n_process: int = 1) -> tuple:
+    """Count the co-occurrences of the given words in a corpus with the window semantics of GloVe.
+
+    The corpus is processed in chunks of lines in parallel, see `window_counts()` for the counting.
+    Return a tuple of the symmetric matrices of raw and weighted counts, in the order of `words`.
+
+    Arguments:
+    file_path -- The path to the corpus, with one document of whitespace separated tokens per line,
+                 e.g. a `--glove-format.txt` file.
+    words -- The words whose co-occurrences should be counted.
+    window_size -- The number of context words to the left and to the right of a word.
+    vocab -- The vocabulary of the embedding model; all other tokens are skipped, see
+             `token_codes()`.
+    chunk_bytes -- The approximate size of the chunks in bytes.
+    n_process -- The number of processes to count the chunks with.
+    """
+    codes, default_code = token_codes(words, vocab)
+
+    raw = np.zeros((len(words), len(words)), dtype=np.float64)
+    weighted = np.zeros((len(words), len(words)), dtype=np.float64)
+    for chunk_raw, chunk_weighted in _map_chunks(
+            _count_chunk, file_path, chunk_bytes, n_process,
+            initargs=(codes, default_code, len(words), window_size)):
+        raw += chunk_raw
+        weighted += chunk_weighted
+
+    return (raw, weighted)
+
+
+def count_vocab(
+        file_path: str,
+        min_count: int = GLOVE_MIN_COUNT,
+        chunk_bytes: int = 2 ** 25,
+        n_process: int = 1) -> list:
+    """Build the vocabulary of a corpus, as GloVe's `vocab_count` does.
+
+    Return the words that occur at least `min_count` times, by descending count.
+
+    Arguments:
+    file_path -- The path to the corpus, with one document of whitespace separated tokens per line.
+    min_count -- The minimum number of occurrences of a word.
+    chunk_bytes -- The approximate size of the chunks in bytes.
+    n_process -- The number of processes to count the chunks with.
+    """
+    counts = Counter()
+    for chunk_counts in _map_chunks(_count_chunk_tokens, file_path, chunk_bytes, n_process):
+        counts.update(chunk_counts)
+
+    return [word for word, count in counts.most_common() if count >= min_count]
+
+
+def count_context_rows(
+        file_path: str,
+        words: list,
+        vocab: list,
+        window_size: int = GLOVE_WINDOW_SIZE,
+        chunk_bytes: int = 2 ** 25,
+        n_process: int = 1) -> tuple:
+    """Count the weighted co-occurrences of the given words with all words of the vocabulary.
+
+    These are the rows of the given words in the co-occurrence matrix GloVe would build from the
+    corpus, see `context_counts()`. Return a tuple of the unique (row, context) pairs, encoded as
+    `row * len(vocab) + context`, their weighted counts and the row sums of all vocabulary words.
+
+    Arguments:
+    file_path -- The path to the corpus, with one document of whitespace separated tokens per line.
+    words -- The words of the rows; words that are not in the vocabulary have no contexts.
+    vocab -- The vocabulary, e.g. as returned by `count_vocab()`; all other tokens are skipped.
+    window_size -- The number of context words to the left and to the right of a word.
+    chunk_bytes -- The approximate size of the chunks in bytes.
+    n_process -- The number of processes to count the chunks with.
+    """
+    codes = {word: i for i, word in enumerate(vocab)}
+    row_lookup = np.full(len(vocab), -1, dtype=np.int64)
+    for i, word in enumerate(words):
+        if word in codes:
+            row_lookup[codes[word]] = i
+
+    pairs = np.zeros(0, dtype=np.int64)
+    counts = np.zeros(0, dtype=np.float64)
+    marginals = np.zeros(len(vocab), dtype=np.float64)
+    for chunk_pairs, chunk_counts, chunk_marginals in _map_chunks(
+            _count_chunk_contexts, file_path, chunk_bytes, n_process,
+            initargs=(codes, OUT_OF_VOCABULARY, len(vocab), window_size, row_lookup)):
+        # Merge the pairs of the chunk into the ones counted so far
+        pairs, inverse = np.unique(np.concatenate([pairs, chunk_pairs]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([counts, chunk_counts]))
+        marginals += chunk_marginals
+
+    return (pairs, counts, marginals)
@@ -0,0 +1,502 @@
+import logging
+import mmap
+import numpy as np
+
+from abc import ABC, abstractmethod
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+# Number of rows to allocate at once if the number of vectors in a file is unknown
+_ROWS_PER_ALLOCATION = 100000
+
+# Number of bytes reserved for the headers of streamed output files, so that they can be filled in
+# after the number of vectors is known
+_WORD2VEC_HEADER_SIZE = 32
+_NPY_HEADER_SIZE = 128
+
+# Suffixes of the files written by `GloVe/generate_glove_model.sh` besides `$PREFIX-vocab.txt`
+_GLOVE_FILE_SUFFIXES = ["-vectors", "-cooccurrence", "-cooccurrence.shuf"]
+
+# A record of GloVe's co-occurrence files, i.e. the packed `CREC` struct of `GloVe/src/common.h`:
+# the 1-based vocabulary ids of both words and their (distance weighted) co-occurrence count
+COOCCURRENCE_RECORD = np.dtype([("word1", "<i4"), ("word2", "<i4"), ("value", "<f8")])
+
+# Number of co-occurrence records to process at once
+_RECORDS_PER_CHUNK = 2 ** 22
+
+
+def read_word2vec_header(file_path: str) -> tuple:
+    """Read the header of a word vector file in word2vec text format.
+
+    Return a tuple of the number of vectors and their dimension, or `None` if the first line of the
+    file is not a word2vec header, e.g. for GloVe output files.
+
+    Arguments:
+    file_path -- The path to the word vector file.
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        first_line = f.readline().split()
+
+    if len(first_line) == 2 and all(value.isdigit() for value in first_line):
+        return (int(first_line[0]), int(first_line[1]))
+
+    return None
+
+
+def matching_vocab_file(file_path: str) -> str:
+    """Find the vocabulary file GloVe wrote alongside the given vectors or co-occurrence file.
+
+    Return its path or `None` if there is no such file. GloVe models are expected to follow the
+    naming scheme of `GloVe/generate_glove_model.sh`, i.e. `$PREFIX-vectors.*`,
+    `$PREFIX-cooccurrence.bin` and `$PREFIX-vocab.txt`.
+
+    Arguments:
+    file_path -- The path to the vectors or co-occurrence file.
+    """
+    prefix = path.splitext(file_path)[0]
+    for suffix in _GLOVE_FILE_SUFFIXES:
+        if prefix.endswith(suffix):
+            vocab_path = f"{prefix[:-len(suffix)]}-vocab.txt"
+            return vocab_path if path.isfile(vocab_path) else None
+
+    return None
+
+
+def count_lines(file_path: str) -> int:
+    """Count the lines of the given file. Return the count.
+
+    Arguments:
+    file_path -- The path to the file.
+    """
+    with open(file_path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(2 ** 20), b""))
+
+
+def iter_text_vectors(file_path: str):
+    """Read a word vector file in GloVe or word2vec text format. Yield tuples of words and vectors.
+
+    Whether the file starts with a word2vec header is detected automatically. Since some
+    vocabularies contain words with whitespace, lines are split from the right, using the dimension
+    given in the header or inferred from the first vector.
+
+    Arguments:
+    file_path -- The path to the word vector file.
+    """
+    header = read_word2vec_header(file_path)
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        dimension = None
+        if header:
+            f.readline()
+            dimension = header[1]
+
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+
+            if dimension is None:
+                dimension = len(line.rstrip(" ").split(" ")) - 1
+
+            values = line.rstrip(" ").rsplit(" ", dimension)
+            yield (values[0], np.array(values[1:], dtype=np.float32))
+
+
+def read_text_vectors(file_path: str, vocab_path: str = None) -> tuple:
+    """Read a word vector file in GloVe or word2vec text format into memory.
+
+    Return a tuple of the list of words and the matrix of their vectors (as float32). The matrix is
+    allocated up front if the number of vectors is known, either from a word2vec header or from the
+    given (or matching) GloVe vocabulary file. Otherwise, it grows while the file is read.
+
+    Arguments:
+    file_path -- The path to the word vector file.
+    vocab_path -- The path to the GloVe vocabulary file of the model. If `None`, a vocabulary file
+                  that matches the GloVe naming scheme is used, if present.
+    """
+    header = read_word2vec_header(file_path)
+    vocab_path = vocab_path or matching_vocab_file(file_path)
+
+    if header:
+        capacity = header[0]
+    elif vocab_path:
+        # GloVe additionally writes a vector for the '<unk>' token
+        capacity = count_lines(vocab_path) + 1
+    else:
+        capacity = _ROWS_PER_ALLOCATION
+
+    words = []
+    vectors = None
+    for i, (word, vector) in enumerate(iter_text_vectors(file_path)):
+        if vectors is None:
+            vectors = np.empty((capacity, vector.shape[0]), dtype=np.float32)
+        elif i == vectors.shape[0]:
+            vectors = np.concatenate(
+                [vectors, np.empty((_ROWS_PER_ALLOCATION, vectors.shape[1]), dtype=np.float32)])
+
+        words.append(word)
+        vectors[i] = vector
+
+    if vectors is None:
+        raise ValueError(f"The file '{file_path}' does not contain any vectors.")
+
+    return (words, vectors[:len(words)])
+
+
+def read_vocab_words(vocab_path: str) -> list:
+    """Read the words of a GloVe vocabulary file. Return them in file order.
+
+    Arguments:
+    vocab_path -- The path to the vocabulary file, which contains one word and its count per line.
+    """
+    with open(vocab_path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n").rsplit(" ", 1)[0] for line in f if line.strip()]
+
+
+def glove_binary_dimension(bin_path: str, vocab_path: str = None) -> int:
+    """Determine the vector dimension of a parameter file written by GloVe with `-binary 1/2`.
+
+    Return the dimension or `None` if the file is not a GloVe parameter file, e.g. since it is a
+    binary word2vec file, or if there is no vocabulary file to check it against.
+
+    Arguments:
+    bin_path -- The path to the binary parameter file.
+    vocab_path -- The path to the GloVe vocabulary file of the model. If `None`, a vocabulary file
+                  that matches the GloVe naming scheme is used, if present.
+    """
+    vocab_path = vocab_path or matching_vocab_file(bin_path)
+    if not vocab_path:
+        return None
+
+    # The file consists of word and context vectors, each followed by their bias, as doubles
+    n_values = path.getsize(bin_path) / np.dtype("<f8").itemsize
+    row_length = n_values / (2 * count_lines(vocab_path))
+    if row_length != int(row_length) or row_length < 2:
+        return None
+
+    return int(row_length) - 1
+
+
+def read_glove_binary(bin_path: str, vocab_path: str = None, vectors: str = "sum") -> tuple:
+    """Read the parameter file written by GloVe with `-binary 1/2` (`$PREFIX-vectors.bin`).
+
+    Return a tuple of the list of words and the matrix of their vectors (as float32). The file is
+    memory-mapped and holds, in vocabulary file order, all word vectors $W$ and their biases,
+    followed by all context vectors $\\tilde{W}$ and their biases.
+
+    Arguments:
+    bin_path -- The path to the binary parameter file.
+    vocab_path -- The path to the GloVe vocabulary file of the model. If `None`, a vocabulary file
+                  that matches the GloVe naming scheme is used.
+    vectors -- Either 'sum' to return $W + \\tilde{W}$ (the same as GloVe's text output) or 'word'
+               to return $W$ alone.
+    """
+    vocab_path = vocab_path or matching_vocab_file(bin_path)
+    dimension = glove_binary_dimension(bin_path, vocab_path)
+    if dimension is None:
+        raise ValueError(f"'{bin_path}' is not a GloVe parameter file of the given vocabulary.")
+
+    words = read_vocab_words(vocab_path)
+    parameters = np.memmap(bin_path, dtype="<f8", mode="r").reshape(2, len(words), dimension + 1)
+
+    if vectors == "sum":
+        return (words, (parameters[0, :, :-1] + parameters[1, :, :-1]).astype(np.float32))
+    if vectors == "word":
+        return (words, parameters[0, :, :-1].astype(np.float32))
+
+    raise ValueError(f"Unknown vectors '{vectors}'; use 'sum' or 'word'.")
+
+
+def read_cooccurrence_records(bin_path: str) -> np.memmap:
+    """Memory-map a co-occurrence file written by GloVe's `cooccur` (`$PREFIX-cooccurrence.bin`).
+
+    Return the records as structured array with the fields of `COOCCURRENCE_RECORD`.
+
+    Arguments:
+    bin_path -- The path to the co-occurrence file.
+    """
+    return np.memmap(bin_path, dtype=COOCCURRENCE_RECORD, mode="r")
+
+
+def vocab_lookup(words: list, vocab_ids: dict, vocab_size: int) -> np.ndarray:
+    """Build a table that maps the vocabulary ids of GloVe to the indices of the given words.
+
+    Return an array with one entry per id (and the unused id 0), that holds the index of the word
+    in `words` or -1 for all other words.
+
+    Arguments:
+    words -- The words to look up; words that are not in the vocabulary are ignored.
+    vocab_ids -- The 1-based vocabulary id of each word, as used in GloVe's co-occurrence files.
+    vocab_size -- The number of words in the vocabulary.
+    """
+    table = np.full(vocab_size + 1, -1, dtype=np.int64)
+    for i, word in enumerate(words):
+        if word in vocab_ids:
+            table[vocab_ids[word]] = i
+
+    return table
+
+
+def cooccurrence_submatrix(
+        bin_path: str,
+        rows: list,
+        columns: list,
+        vocab_path: str = None) -> np.ndarray:
+    """Extract the co-occurrence counts of the given words from a GloVe co-occurrence file.
+
+    The file is memory-mapped and scanned in chunks; the records of the given words are selected
+    with vectorized lookups of their vocabulary ids. Return a matrix of the summed counts with one
+    row per word in `rows` and one column per word in `columns`. Rows and columns of words that are
+    not in the vocabulary are zero.
+
+    Arguments:
+    bin_path -- The path to the co-occurrence file.
+    rows -- The (unique) words of the rows, e.g. the target words of the WEAT tests.
+    columns -- The (unique) words of the columns, e.g. the attribute words of the WEAT tests.
+    vocab_path -- The path to the GloVe vocabulary file of the co-occurrence file. If `None`, a
+                  vocabulary file that matches the GloVe naming scheme is used.
+    """
+    vocab_path = vocab_path or matching_vocab_file(bin_path)
+    if not vocab_path:
+        raise ValueError(f"No vocabulary file found for '{bin_path}'.")
+
+    vocab = read_vocab_words(vocab_path)
+    vocab_ids = {word: i + 1 for i, word in enumerate(vocab)}
+    row_lookup = vocab_lookup(rows, vocab_ids, len(vocab))
+    column_lookup = vocab_lookup(columns, vocab_ids, len(vocab))
+
+    records = read_cooccurrence_records(bin_path)
+    counts = np.zeros(len(rows) * len(columns), dtype=np.float64)
+    for start in range(0, len(records), _RECORDS_PER_CHUNK):
+        chunk = records[start:start + _RECORDS_PER_CHUNK]
+        row_indices = row_lookup[chunk["word1"]]
+        column_indices = column_lookup[chunk["word2"]]
+        selected = (row_indices >= 0) & (column_indices >= 0)
+
+        counts += np.bincount(
+            row_indices[selected] * len(columns) + column_indices[selected],
+            weights=chunk["value"][selected],
+            minlength=len(counts))
+
+    return counts.reshape(len(rows), len(columns))
+
+
+def read_word2vec_binary(file_path: str) -> tuple:
+    """Read a word vector file in binary word2vec format into memory.
+
+    Return a tuple of the list of words and the matrix of their vectors (as float32).
+
+    Arguments:
+    file_path -- The path to the word vector file.
+    """
+    with open(file_path, "rb") as f:
+        n_vectors, dimension = (int(value) for value in f.readline().split())
+        position = f.tell()
+
+        # The file is memory-mapped, so that it is not held in memory besides the vectors
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            vector_size = dimension * np.dtype("<f4").itemsize
+            words = []
+            vectors = np.empty((n_vectors, dimension), dtype=np.float32)
+            for i in range(n_vectors):
+                # Words are terminated by a space; vectors may be followed by a newline
+                word_end = content.find(b" ", position)
+                words.append(
+                    content[position:word_end].lstrip(b"\n").decode("utf-8", errors="replace"))
+                vectors[i] = np.frombuffer(
+                    content, dtype="<f4", count=dimension, offset=word_end + 1)
+                position = word_end + 1 + vector_size
+
+    return (words, vectors)
+
+
+def read_vectors(file_path: str, glove_vectors: str = "sum") -> tuple:
+    """Read a word vector file in any of the supported formats.
+
+    Return a tuple of the list of words and the matrix of their vectors. Supported are the word2vec
+    formats (binary or text), the GloVe text format (i.e. without header), GloVe's binary format
+    (alongside its `-vocab.txt` file) and `.npy` matrices written by `NpyWriter`, which are
+    memory-mapped.
+
+    Arguments:
+    file_path -- The path to the word vector file.
+    glove_vectors -- Which vectors to use from GloVe's binary format, see `read_glove_binary()`.
+    """
+    file_extension = path.splitext(file_path)[1]
+    if file_extension == ".npy":
+        return read_npy_vectors(file_path)
+    if file_extension == ".bin":
+        if glove_binary_dimension(file_path):
+            return read_glove_binary(file_path, vectors=glove_vectors)
+        return read_word2vec_binary(file_path)
+
+    return read_text_vectors(file_path)
+
+
+class _StreamedVectorWriter(ABC):
+    """Base class for writers that stream vectors to a file whose header contains their count.
+
+    A fixed number of bytes is reserved for the header, which is filled in when the writer is
+    closed.
+
+    Arguments:
+    file_path -- The path to the output file.
+    header_size -- The number of bytes to reserve for the header.
+    """
+
+    def __init__(self, file_path: str, header_size: int):
+        self.n_vectors = 0
+        self.dimension = None
+        self._header_size = header_size
+        self._file = open(file_path, "wb")
+        self._file.write(b" " * header_size)
+
+    @abstractmethod
+    def _header(self) -> bytes:
+        """Return the header of the file, once all vectors are written."""
+        pass
+
+    @abstractmethod
+    def write(self, word: str, vector: np.ndarray) -> None:
+        """Write a single word and its vector."""
+        pass
+
+    def close(self) -> None:
+        """Fill in the header and close the file."""
+        header = self._header()
+        if len(header) > self._header_size:
+            raise ValueError("The header does not fit into the reserved space.")
+
+        self._file.seek(0)
+        self._file.write(header)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Word2VecBinaryWriter(_StreamedVectorWriter):
+    """Stream word vectors into a file in binary word2vec format.
+
+    Words are terminated by a space in this format, so words that contain one can't be written;
+    use `NpyWriter` for such vocabularies.
+
+    Arguments:
+    file_path -- The path to the output file.
+    """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path, _WORD2VEC_HEADER_SIZE)
+
+    def _header(self) -> bytes:
+        # Pad the header with whitespace; readers split it by whitespace
+        header = f"{self.n_vectors} {self.dimension}".encode("utf-8")
+        return header.ljust(self._header_size - 1) + b"\n"
+
+    def write(self, word: str, vector: np.ndarray) -> None:
+        """Write a single word and its vector.
+
+        Arguments:
+        word -- The word.
+        vector -- The vector of the word.
+        """
+        if " " in word:
+            raise ValueError(f"The word '{word}' contains a space, which word2vec can't store.")
+
+        self.dimension = vector.shape[0]
+        self._file.write(word.encode("utf-8") + b" " + vector.astype("<f4").tobytes() + b"\n")
+        self.n_vectors += 1
+
+
+class NpyWriter(_StreamedVectorWriter):
+    """Stream word vectors into a float32 `.npy` matrix and their words into a separate text file.
+
+    The words are written to the file returned by `npy_words_file()`, one word per line, in the
+    order of the matrix rows.
+
+    Arguments:
+    file_path -- The path to the output `.npy` file.
+    """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path, _NPY_HEADER_SIZE)
+        self._words_file = open(npy_words_file(file_path), "w", encoding="utf-8")
+
+    def _header(self) -> bytes:
+        # See https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html; the header is
+        # padded with spaces and terminated by a newline
+        header = str({
+            "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+            "fortran_order": False,
+            "shape": (self.n_vectors, self.dimension)}).encode("latin1")
+        magic = np.lib.format.magic(1, 0)
+        header_length = self._header_size - len(magic) - 2
+
+        return magic + np.uint16(header_length).tobytes() + header.ljust(header_length - 1) + b"\n"
+
+    def write(self, word: str, vector: np.ndarray) -> None:
+        """Write a single word and its vector.
+
+        Arguments:
+        word -- The word.
+        vector -- The vector of the word.
+        """
+        self.dimension = vector.shape[0]
+        self._file.write(vector.astype("<f4").tobytes())
+        self._words_file.write(f"{word}\n")
+        self.n_vectors += 1
+
+    def close(self) -> None:
+        """Fill in the header and close both files."""
+        super().close()
+        self._words_file.close()
+
+
+def npy_words_file(npy_path: str) -> str:
+    """Return the path of the file holding the words of the given `.npy` vector matrix.
+
+    Arguments:
+    npy_path -- The path to the `.npy` file.
+    """
+    return f"{path.splitext(npy_path)[0]}.words.txt"
+
+
+def read_npy_vectors(npy_path: str, mmap: bool = True) -> tuple:
+    """Read a vector matrix written by `NpyWriter` and its words.
+
+    Return a tuple of the list of words and the matrix of their vectors.
+
+    Arguments:
+    npy_path -- The path to the `.npy` file.
+    mmap -- Whether to memory-map the matrix instead of reading it into memory.
+    """
+    with open(npy_words_file(npy_path), "r", encoding="utf-8") as f:
+        words = f.read().split("\n")[:-1]
+
+    return (words, np.load(npy_path, mmap_mode="r" if mmap else None))
+
+
+def convert_text_vectors(input_path: str, output_path: str, output_format: str) -> int:
+    """Convert a word vector file in GloVe or word2vec text format in a single streaming pass.
+
+    The input may or may not have a word2vec header, so converting a file multiple times is safe.
+    Return the number of converted vectors.
+
+    Arguments:
+    input_path -- The path to the word vector file in text format.
+    output_path -- The path to the output file.
+    output_format -- Either 'word2vec' (binary word2vec format) or 'npy'.
+    """
+    writers = {"word2vec": Word2VecBinaryWriter, "npy": NpyWriter}
+
+    with writers[output_format](output_path) as writer:
+        for word, vector in iter_text_vectors(input_path):
+            writer.write(word, vector)
+
+    return writer.n_vectors
@@ -0,0 +1,164 @@
+import json
+import logging
+import resource
+import sys
+import time
+
+from contextlib import contextmanager
+from datetime import datetime
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+# `ru_maxrss` is reported in kilobytes on Linux, but in bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 2 ** 10
+
+
+def trace_file(output_file: str) -> str:
+    """Return the path of the trace file that belongs to the given output file.
+
+    Arguments:
+    output_file -- The path to the output file, e.g. `*_results-<timestamp>.json`.
+    """
+    return f"{path.splitext(output_file)[0]}.trace.json"
+
+
+def _cpu_time() -> float:
+    """Return the CPU time (user and system) of this process and its terminated children."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the peak resident set size of this process, if supported. Return whether it was reset.
+
+    Only Linux supports this, by writing to `/proc/self/clear_refs`.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> float:
+    """Return the peak resident set size of this process in MiB.
+
+    On Linux, this is the peak since the last `_reset_peak_rss()`; otherwise, since the start.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 2 ** 10
+    except OSError:
+        pass
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT / 2 ** 20
+
+
+class StageRecord:
+    """The measurements of a single stage of a script.
+
+    The number of items a stage processed is not known to the instrumentation and has to be set by
+    the stage itself, e.g. `stage.items = len(posts)`.
+
+    Arguments:
+    name -- The name of the stage.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = None
+        self.wall_time = None
+        self.cpu_time = None
+        self.peak_rss_mib = None
+        self.children_peak_rss_mib = None
+
+    def to_dict(self) -> dict:
+        """Return the measurements in a JSON serializable form."""
+        return {
+            "name": self.name,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "peak_rss_mib": self.peak_rss_mib,
+            "children_peak_rss_mib": self.children_peak_rss_mib,
+            "items": self.items,
+            "items_per_second":
+                self.items / self.wall_time if self.items and self.wall_time else None}
+
+
+class Trace:
+    """Record the wall time, CPU time, peak memory and item count of each stage of a script.
+
+    The CPU time includes the time spent in worker processes, as soon as they terminated (e.g. when
+    a `multiprocessing.Pool` was joined). The peak memory of workers is only available as the peak
+    of the largest worker since the start of the script.
+
+    Arguments:
+    script -- The name of the script that is traced.
+    parameters -- The parameters of the run, e.g. `vars(args)`, to be stored alongside the stages.
+    """
+
+    def __init__(self, script: str, parameters: dict = None):
+        self.script = script
+        self.parameters = parameters or {}
+        self.started = datetime.today().isoformat()
+        self.stages = []
+        self._start_time = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the code run within the context as stage of the given name.
+
+        Yield the `StageRecord` of the stage, so that the stage can set the number of items it
+        processed.
+
+        Arguments:
+        name -- The name of the stage.
+        """
+        record = StageRecord(name)
+        _reset_peak_rss()
+        start_cpu_time = _cpu_time()
+        start_wall_time = time.perf_counter()
+
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - start_wall_time
+            record.cpu_time = _cpu_time() - start_cpu_time
+            record.peak_rss_mib = _peak_rss()
+            record.children_peak_rss_mib = resource.getrusage(
+                resource.RUSAGE_CHILDREN).ru_maxrss * _MAXRSS_UNIT / 2 ** 20
+            self.stages.append(record)
+
+            logging.info(
+                f"Stage '{name}' took {record.wall_time:.2f}s "
+                f"(CPU {record.cpu_time:.2f}s, peak RSS {record.peak_rss_mib:.0f} MiB).")
+
+    def to_dict(self) -> dict:
+        """Return the trace in a JSON serializable form."""
+        return {
+            "script": self.script,
+            "started": self.started,
+            "wall_time": time.perf_counter() - self._start_time,
+            "parameters": self.parameters,
+            "stages": [stage.to_dict() for stage in self.stages]}
+
+    def save(self, output_file: str) -> str:
+        """Write the trace next to the given output file of the script. Return the trace's path.
+
+        Arguments:
+        output_file -- The path to the output file of the script, see `trace_file()`.
+        """
+        file_path = trace_file(output_file)
+        logging.info(f"Exporting trace to disk at {file_path}.")
+        with open(file_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4, default=str)
+
+        return file_path
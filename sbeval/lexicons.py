@@ -0,0 +1,53 @@
+import json
+
+from itertools import product
+from os import path
+
+# The WEAT test lexicons, with target words X and Y and attribute words A and B
+WEAT_TESTS_PATH = path.join("sbeval", "tests", "weat_tests.json")
+
+# Some of the original WEAT tests (7 and 8) switch the lists of target and attribute words
+SWAPPED_TESTS = ["test7", "test8"]
+
+
+def load_cooccurrence_tests(tests: list = None, file_path: str = WEAT_TESTS_PATH) -> dict:
+    """Load the WEAT test lexicons for co-occurrence analyses. Return them by test name.
+
+    All words are lowercased and the lists of target and attribute words of the `SWAPPED_TESTS`
+    are switched back, so that X and Y are always the target and A and B the attribute words. Their
+    descriptions, e.g. "Male vs. female names", are kept as `target_words` and `attribute_words`.
+
+    Arguments:
+    tests -- The numbers of the tests to load (from 1 to 10); all tests by default.
+    file_path -- The path to the WEAT test lexicons.
+    """
+    with open(file_path, "r") as f:
+        weat_tests = json.load(f)
+
+    if tests is not None:
+        weat_tests = {f"test{i}": weat_tests[f"test{i}"] for i in tests}
+
+    lexicons = {}
+    for test_name, test in weat_tests.items():
+        lexicon = {key: [word.lower() for word in test[key]] for key in ["X", "Y", "A", "B"]}
+        lexicon["target_words"] = test["target_words"]
+        lexicon["attribute_words"] = test["attribute_words"]
+        if test_name in SWAPPED_TESTS:
+            lexicon = {
+                "X": lexicon["A"], "Y": lexicon["B"], "A": lexicon["X"], "B": lexicon["Y"],
+                "target_words": lexicon["attribute_words"],
+                "attribute_words": lexicon["target_words"]}
+        lexicons[test_name] = lexicon
+
+    return lexicons
+
+
+def target_attribute_pairs(lexicons: dict) -> list:
+    """Return all unique (target, attribute) pairs of the given test lexicons, sorted.
+
+    Arguments:
+    lexicons -- The test lexicons, as returned by `load_cooccurrence_tests()`.
+    """
+    return sorted({
+        pair for lexicon in lexicons.values()
+        for pair in product([*lexicon["X"], *lexicon["Y"]], [*lexicon["A"], *lexicon["B"]])})
@@ -0,0 +1,139 @@
+import logging
+import numpy as np
+
+from sbeval.alignment import normalize_rows
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.glove_files import npy_words_file, read_npy_vectors
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+
+class NeighborIndex:
+    """An exact nearest neighbor index over the unit-length float32 vectors of a vocabulary.
+
+    Queries are answered in batches: the similarities of all query vectors to one block of the
+    vocabulary are computed with a single matrix product, and only the top k candidates of each
+    block are kept. This bounds the memory needed per query batch by the block size instead of the
+    vocabulary size.
+
+    Arguments:
+    words -- The vocabulary of the index.
+    vectors -- The vectors of the vocabulary, in the same order as the words.
+    block_size -- The number of vocabulary vectors that are compared to the queries at once.
+    normalized -- Whether the vectors are already normalized to unit length.
+    """
+
+    def __init__(
+            self,
+            words: list,
+            vectors: np.ndarray,
+            block_size: int = 65536,
+            normalized: bool = False):
+        self.words = list(words)
+        self.word_index = {word: i for i, word in enumerate(self.words)}
+        self.block_size = block_size
+
+        if normalized:
+            self.vectors = vectors
+        else:
+            self.vectors = np.empty(vectors.shape, dtype=np.float32)
+            for start in range(0, vectors.shape[0], block_size):
+                self.vectors[start:start + block_size] = normalize_rows(
+                    vectors[start:start + block_size])
+
+    @classmethod
+    def from_embeddings(cls, embeddings, block_size: int = 65536):
+        """Build an index over the vocabulary of a loaded embedding model. Return it.
+
+        Arguments:
+        embeddings -- The embedding model, e.g. `sbeval.word_vectors.CustomEmbeddings`, whose
+                      `VectorStore` is accessible as `embeddings.embeddings`.
+        block_size -- The number of vocabulary vectors that are compared to the queries at once.
+        """
+        store = embeddings.embeddings
+        return cls(store.words, store.vectors, block_size=block_size)
+
+    def save(self, index_path: str) -> None:
+        """Write the normalized vectors as `.npy` matrix and the vocabulary next to it.
+
+        Arguments:
+        index_path -- The path to the `.npy` file of the index.
+        """
+        np.save(index_path, np.ascontiguousarray(self.vectors, dtype=np.float32))
+        with open(npy_words_file(index_path), "w", encoding="utf-8") as f:
+            f.writelines(f"{word}\n" for word in self.words)
+
+    @classmethod
+    def load(cls, index_path: str, block_size: int = 65536, mmap: bool = True):
+        """Load an index written by `save()`. Return it.
+
+        Arguments:
+        index_path -- The path to the `.npy` file of the index.
+        block_size -- The number of vocabulary vectors that are compared to the queries at once.
+        mmap -- Whether to memory-map the vectors instead of reading them into memory.
+        """
+        words, vectors = read_npy_vectors(index_path, mmap=mmap)
+        return cls(words, vectors, block_size=block_size, normalized=True)
+
+    def search(self, queries: np.ndarray, k: int = 10, exclude: list = None) -> tuple:
+        """Find the k most similar vocabulary vectors for each of the given query vectors.
+
+        Return a tuple of two arrays of shape (queries, k): the indices of the neighbors in the
+        vocabulary and their cosine similarities, both sorted by descending similarity.
+
+        Arguments:
+        queries -- The matrix of query vectors.
+        k -- The number of neighbors to find per query.
+        exclude -- For each query, a vocabulary index that should not be returned (e.g. the query
+                   word itself), or -1.
+        """
+        queries = normalize_rows(np.atleast_2d(queries))
+        k = min(k, len(self.words))
+        rows = np.arange(queries.shape[0])[:, None]
+
+        best_indices = np.empty((queries.shape[0], 0), dtype=np.int64)
+        best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+        for start in range(0, len(self.words), self.block_size):
+            scores = np.dot(queries, self.vectors[start:start + self.block_size].T)
+            if exclude is not None:
+                excluded = np.asarray(exclude) - start
+                in_block = (excluded >= 0) & (excluded < scores.shape[1])
+                scores[np.flatnonzero(in_block), excluded[in_block]] = -np.inf
+
+            # Keep only the top k candidates of the current block, merged with the previous ones
+            block_k = min(k, scores.shape[1])
+            top = np.argpartition(-scores, block_k - 1, axis=1)[:, :block_k]
+            candidate_indices = np.concatenate([best_indices, top + start], axis=1)
+            candidate_scores = np.concatenate([best_scores, scores[rows, top]], axis=1)
+
+            if candidate_scores.shape[1] > k:
+                top = np.argpartition(-candidate_scores, k - 1, axis=1)[:, :k]
+                candidate_indices = candidate_indices[rows, top]
+                candidate_scores = candidate_scores[rows, top]
+            best_indices, best_scores = candidate_indices, candidate_scores
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return (best_indices[rows, order], best_scores[rows, order])
+
+    def neighbors(self, tokens: list, k: int = 10) -> dict:
+        """Find the k nearest neighbors of all given in-vocabulary tokens in a single batch.
+
+        Return a dictionary of the neighbors of each token, as lists of tuples of word and cosine
+        similarity. The token itself is not counted as its own neighbor; OOV tokens are ignored.
+
+        Arguments:
+        tokens -- The tokens whose neighbors should be found.
+        k -- The number of neighbors to find per token.
+        """
+        tokens = [token for token in dict.fromkeys(tokens) if token in self.word_index]
+        if not tokens:
+            return {}
+
+        indices = np.array([self.word_index[token] for token in tokens])
+        neighbor_indices, scores = self.search(self.vectors[indices], k=k, exclude=indices)
+
+        return {
+            token: [
+                (self.words[i], float(score))
+                for i, score in zip(neighbor_indices[j], scores[j]) if np.isfinite(score)]
+            for j, token in enumerate(tokens)}
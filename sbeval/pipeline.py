@@ -0,0 +1,292 @@
+import hashlib
+import json
+import logging
+import subprocess
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from os import environ, path, stat
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+
+class Stage:
+    """A single step of the pipeline, defined by the command it runs and the files it touches.
+
+    Stages that produce the input files of another stage are run before it. Stages without any file
+    dependency on each other can additionally be ordered with the `after` argument.
+
+    Arguments:
+    name -- A unique name of the stage.
+    command -- The command to run, as list of arguments.
+    inputs -- Paths to all files the stage reads.
+    outputs -- Paths to all files the stage writes.
+    params -- Additional parameters that should invalidate the cached result if they change.
+    cwd -- The working directory to run the command in.
+    cores -- The number of processing cores the command uses.
+    after -- Names of stages that need to finish before this stage can run.
+    env -- Additional environment variables of the command, e.g. for passwords, which should
+           neither be logged as part of the command nor invalidate the cached result.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            command: list,
+            inputs: list = None,
+            outputs: list = None,
+            params: dict = None,
+            cwd: str = None,
+            cores: int = 1,
+            after: list = None,
+            env: dict = None):
+        self.name = name
+        self.command = command
+        self.inputs = inputs or []
+        self.outputs = outputs or []
+        self.params = params or {}
+        self.cwd = cwd
+        self.cores = cores
+        self.after = after or []
+        self.env = env or {}
+
+    def __repr__(self):
+        return f"Stage('{self.name}')"
+
+
+class FileHashCache:
+    """Compute content hashes of files and remember them as long as the files are unchanged.
+
+    A file is considered unchanged as long as its size and modification time stay the same, which
+    avoids rehashing large corpora and vector files on every run.
+
+    Arguments:
+    known_hashes -- Previously computed hashes, as returned by `to_dict()`.
+    """
+
+    def __init__(self, known_hashes: dict = None):
+        self.known_hashes = known_hashes or {}
+
+    def hash(self, file_path: str) -> str:
+        """Return the SHA-256 hash of the given file's content.
+
+        Arguments:
+        file_path -- The path to the file to hash.
+        """
+        file_stat = stat(file_path)
+        signature = [file_stat.st_size, file_stat.st_mtime_ns]
+
+        known = self.known_hashes.get(file_path)
+        if known and known["signature"] == signature:
+            return known["sha256"]
+
+        logging.debug(f"Hashing '{file_path}'.")
+        content_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(2 ** 20), b""):
+                content_hash.update(chunk)
+
+        self.known_hashes[file_path] = {"signature": signature, "sha256": content_hash.hexdigest()}
+        return content_hash.hexdigest()
+
+    def to_dict(self) -> dict:
+        """Return all known hashes in a JSON serializable form."""
+        return self.known_hashes
+
+
+class Pipeline:
+    """Run a set of stages in dependency order and skip those whose result is already up to date.
+
+    A stage is skipped if the hashes of its input files, its command and its parameters are the
+    same as in its last successful run and all of its output files still exist. Independent stages
+    are run in parallel, as long as their combined number of cores fits into the core budget.
+
+    Arguments:
+    stages -- A list of all stages of the pipeline.
+    cache_file -- The path to the file that stores the state of previous runs.
+    """
+
+    def __init__(self, stages: list, cache_file: str):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_file = cache_file
+        self.dependencies = self._resolve_dependencies()
+
+    def _resolve_dependencies(self) -> dict:
+        """Determine the stages each stage depends on. Return them as dict of sets of names.
+
+        Raise a `ValueError` if two stages produce the same file, a stage depends on an unknown
+        stage or the dependencies contain a cycle.
+        """
+        producers = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(
+                        f"Both '{producers[output]}' and '{stage.name}' produce '{output}'.")
+                producers[output] = stage.name
+
+        dependencies = {}
+        for stage in self.stages.values():
+            unknown = [name for name in stage.after if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {unknown}.")
+
+            dependencies[stage.name] = {
+                producers[i] for i in stage.inputs if i in producers} | set(stage.after)
+
+        # Check for cycles by repeatedly removing stages without open dependencies
+        open_dependencies = {name: set(deps) for name, deps in dependencies.items()}
+        while open_dependencies:
+            ready = [name for name, deps in open_dependencies.items() if not deps]
+            if not ready:
+                raise ValueError(
+                    f"The stages {sorted(open_dependencies)} contain a dependency cycle.")
+            for name in ready:
+                del open_dependencies[name]
+            for deps in open_dependencies.values():
+                deps.difference_update(ready)
+
+        return dependencies
+
+    def _load_state(self) -> dict:
+        """Load the state of previous runs from the cache file. Return it."""
+        if not path.isfile(self.cache_file):
+            return {"stages": {}, "files": {}}
+
+        with open(self.cache_file, "r") as f:
+            return json.load(f)
+
+    def _save_state(self, state: dict) -> None:
+        """Write the given state to the cache file."""
+        with open(self.cache_file, "w") as f:
+            json.dump(state, f, indent=4)
+
+    def _fingerprint(self, stage: Stage, file_hashes: FileHashCache) -> str:
+        """Compute the fingerprint of a stage from its command, parameters and input hashes.
+
+        Raise a `FileNotFoundError` if one of the inputs does not exist.
+        """
+        missing = [i for i in stage.inputs if not path.isfile(i)]
+        if missing:
+            raise FileNotFoundError(f"Missing inputs of stage '{stage.name}': {missing}.")
+
+        return hashlib.sha256(json.dumps({
+            "command": stage.command,
+            "params": stage.params,
+            "inputs": {i: file_hashes.hash(i) for i in stage.inputs}},
+            sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _run_stage(self, stage: Stage) -> int:
+        """Run the command of the given stage. Return its exit code."""
+        logging.info(f"Running stage '{stage.name}'...")
+        logging.debug(f"$ {' '.join(stage.command)}")
+        try:
+            return subprocess.run(
+                stage.command,
+                cwd=stage.cwd,
+                env={**environ, **stage.env} if stage.env else None).returncode
+        except OSError as e:
+            logging.error(f"Could not run stage '{stage.name}': {e}")
+            return 127
+
+    def run(
+            self,
+            targets: list = None,
+            max_cores: int = 1,
+            force: bool = False,
+            dry_run: bool = False) -> dict:
+        """Run all stages needed for the given targets. Return the final status of each stage.
+
+        The status of a stage is one of 'cached', 'done', 'failed', 'skipped' (because a stage it
+        depends on failed) or 'pending' (in a dry run).
+
+        Arguments:
+        targets -- Names of the stages to bring up to date; all stages if `None`.
+        max_cores -- The maximum number of cores all concurrently running stages may use.
+        force -- Whether to run the stages even if their cached result is up to date.
+        dry_run -- Whether to only report which stages would run, without running them.
+        """
+        # Collect the target stages and everything they depend on
+        selected = set()
+        to_visit = list(targets or self.stages.keys())
+        while to_visit:
+            name = to_visit.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'.")
+            if name not in selected:
+                selected.add(name)
+                to_visit.extend(self.dependencies[name])
+
+        state = self._load_state()
+        file_hashes = FileHashCache(state["files"])
+        status = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max(max_cores, 1)) as executor:
+            while len(status) < len(selected):
+                # Start all stages whose dependencies are resolved, as long as cores are left
+                for name in sorted(selected - set(status) - set(running.values())):
+                    stage = self.stages[name]
+                    dependency_status = [status.get(d) for d in self.dependencies[name]]
+                    if any(s in ("failed", "skipped") for s in dependency_status):
+                        logging.warning(f"Skipping stage '{name}' as a dependency failed.")
+                        status[name] = "skipped"
+                        continue
+                    if not all(s in ("cached", "done", "pending") for s in dependency_status):
+                        continue
+
+                    # Stages whose dependencies will run cannot be fingerprinted in a dry run
+                    if dry_run and "pending" in dependency_status:
+                        status[name] = "pending"
+                        continue
+
+                    try:
+                        fingerprint = self._fingerprint(stage, file_hashes)
+                    except FileNotFoundError as e:
+                        logging.error(e)
+                        status[name] = "failed"
+                        continue
+
+                    outputs_exist = all(path.exists(o) for o in stage.outputs)
+                    if not force and outputs_exist \
+                            and state["stages"].get(name) == fingerprint:
+                        logging.info(f"Stage '{name}' is up to date.")
+                        status[name] = "cached"
+                        continue
+
+                    if dry_run:
+                        status[name] = "pending"
+                        continue
+
+                    cores_in_use = sum(self.stages[n].cores for n in running.values())
+                    if running and cores_in_use + stage.cores > max_cores:
+                        continue
+
+                    running[executor.submit(self._run_stage, stage)] = name
+                    state["stages"].pop(name, None)
+
+                if not running:
+                    continue
+
+                # Wait for at least one running stage to finish
+                finished, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.result() == 0:
+                        logging.info(f"Stage '{name}' finished.")
+                        status[name] = "done"
+                        state["stages"][name] = self._fingerprint(self.stages[name], file_hashes)
+                    else:
+                        logging.error(f"Stage '{name}' failed with exit code {future.result()}.")
+                        status[name] = "failed"
+
+                # Save the state after each finished stage, so that an abort loses no progress
+                state["files"] = file_hashes.to_dict()
+                self._save_state(state)
+
+        state["files"] = file_hashes.to_dict()
+        if not dry_run:
+            self._save_state(state)
+
+        return status
@@ -0,0 +1,171 @@
+import logging
+import numpy as np
+
+from scipy import sparse
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.cooccurrence import (
+    GLOVE_MIN_COUNT, GLOVE_WINDOW_SIZE, count_context_rows, count_vocab)
+from sbeval.glove_files import (
+    matching_vocab_file, read_cooccurrence_records, read_vocab_words, vocab_lookup)
+from sbeval.weat_test import effect_sizes
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+
+def ppmi_rows(counts: sparse.csr_matrix, row_ids: np.ndarray, marginals: np.ndarray):
+    """Calculate the positive pointwise mutual information (PPMI) of rows of co-occurrence counts.
+
+    Return a sparse matrix of the same shape, where each entry is
+    $max(0, log(X_{wc} \\cdot N / (X_w \\cdot X_c)))$ with the row sums $X_w$ and $X_c$ of the word
+    and the context and the sum $N$ of all co-occurrences. Only non-zero counts are evaluated, so
+    the result is as sparse as the counts.
+
+    Arguments:
+    counts -- The co-occurrence counts of the rows with all contexts of the vocabulary.
+    row_ids -- The index of the word of each row in `marginals`.
+    marginals -- The row sums of the full co-occurrence matrix, one per context.
+    """
+    counts = counts.tocoo()
+    pmi = np.log(
+        counts.data * marginals.sum() / (marginals[row_ids[counts.row]] * marginals[counts.col]))
+    positive = pmi > 0
+
+    return sparse.csr_matrix(
+        (pmi[positive], (counts.row[positive], counts.col[positive])), shape=counts.shape)
+
+
+def cooccurrence_file_ppmi(
+        bin_path: str,
+        words: list,
+        vocab_path: str = None,
+        chunk_records: int = 2 ** 22):
+    """Calculate the PPMI rows of the given words from a co-occurrence file written by GloVe.
+
+    The file is memory-mapped and scanned once, in chunks: the row sums of all words are
+    accumulated and the records of the given words are selected with vectorized lookups. Return a
+    sparse matrix with one row per word and one column per vocabulary id (the first one unused).
+
+    Arguments:
+    bin_path -- The path to the co-occurrence file (`$PREFIX-cooccurrence.bin`).
+    words -- The (unique) words of the rows; the rows of words that are not in the vocabulary are
+             empty.
+    vocab_path -- The path to the GloVe vocabulary file of the co-occurrence file. If `None`, a
+                  vocabulary file that matches the GloVe naming scheme is used.
+    chunk_records -- The number of records to process at once.
+    """
+    vocab_path = vocab_path or matching_vocab_file(bin_path)
+    if not vocab_path:
+        raise ValueError(f"No vocabulary file found for '{bin_path}'.")
+
+    vocab = read_vocab_words(vocab_path)
+    vocab_ids = {word: i + 1 for i, word in enumerate(vocab)}
+    row_lookup = vocab_lookup(words, vocab_ids, len(vocab))
+
+    records = read_cooccurrence_records(bin_path)
+    marginals = np.zeros(len(vocab) + 1, dtype=np.float64)
+    rows, columns, values = [], [], []
+    for start in range(0, len(records), chunk_records):
+        chunk = records[start:start + chunk_records]
+        marginals += np.bincount(chunk["word1"], weights=chunk["value"], minlength=len(marginals))
+
+        chunk_rows = row_lookup[chunk["word1"]]
+        selected = chunk_rows >= 0
+        rows.append(chunk_rows[selected])
+        columns.append(chunk["word2"][selected])
+        values.append(chunk["value"][selected])
+
+    # Duplicate records of the same pair are summed
+    counts = sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+        shape=(len(words), len(marginals)))
+    row_ids = np.array([vocab_ids.get(word, 0) for word in words], dtype=np.int64)
+
+    return ppmi_rows(counts, row_ids, marginals)
+
+
+def corpus_ppmi(
+        file_path: str,
+        words: list,
+        window_size: int = GLOVE_WINDOW_SIZE,
+        min_count: int = GLOVE_MIN_COUNT,
+        vocab: list = None,
+        chunk_bytes: int = 2 ** 25,
+        n_process: int = 1):
+    """Calculate the PPMI rows of the given words from a corpus, with the windows GloVe would use.
+
+    The corpus is streamed in chunks twice, to build the vocabulary (unless given) and to count the
+    contexts of the words, see `sbeval.cooccurrence.count_context_rows()`. Return a sparse matrix
+    with one row per word and one column per vocabulary word.
+
+    Arguments:
+    file_path -- The path to the corpus, with one document of whitespace separated tokens per line,
+                 e.g. a `--glove-format.txt` file.
+    words -- The (unique) words of the rows; the rows of words that are not in the vocabulary are
+             empty.
+    window_size -- The number of context words to the left and to the right of a word.
+    min_count -- The minimum number of occurrences of a word in the vocabulary.
+    vocab -- The vocabulary, e.g. read from GloVe's `-vocab.txt` file. If `None`, it is built from
+             the corpus with `min_count`.
+    chunk_bytes -- The approximate size of the chunks in bytes.
+    n_process -- The number of processes to count the chunks with.
+    """
+    if vocab is None:
+        logging.info(f"Building the vocabulary of {file_path}...")
+        vocab = count_vocab(file_path, min_count, chunk_bytes, n_process)
+
+    logging.info(f"Counting the contexts of {len(words)} words...")
+    pairs, counts, marginals = count_context_rows(
+        file_path, words, vocab, window_size, chunk_bytes, n_process)
+    counts = sparse.csr_matrix(
+        (counts, (pairs // len(vocab), pairs % len(vocab))), shape=(len(words), len(vocab)))
+
+    vocab_ids = {word: i for i, word in enumerate(vocab)}
+    row_ids = np.array([vocab_ids.get(word, 0) for word in words], dtype=np.int64)
+
+    return ppmi_rows(counts, row_ids, marginals)
+
+
+def ppmi_effect_size(
+        ppmi: sparse.csr_matrix,
+        words: list,
+        target_words_X: list,
+        target_words_Y: list,
+        attribute_words_a: list,
+        attribute_words_b: list) -> tuple:
+    """Calculate the WEAT effect size with the PPMI rows of the words instead of word vectors.
+
+    The cosine similarities of all target and attribute words are computed with a single sparse
+    matrix product of their normalized PPMI rows; the effect size is the same as in
+    `sbeval.weat_test.weat_score()`. Return a tuple of the effect size and the list of words
+    without any positive association, which are excluded like OOV words.
+
+    Arguments:
+    ppmi -- The PPMI rows of all words, e.g. as returned by `corpus_ppmi()`.
+    words -- The word of each row.
+    target_words_X -- List of target words in $X$.
+    target_words_Y -- List of target words in $Y$.
+    attribute_words_a -- List of all attribute words in $A$.
+    attribute_words_b -- List of all attribute words in $B$.
+    """
+    row_index = {word: i for i, word in enumerate(words)}
+    norms = np.sqrt(np.asarray(ppmi.multiply(ppmi).sum(axis=1)).ravel())
+
+    def lexicon_rows(lexicon: list) -> tuple:
+        rows = [row_index[word] for word in lexicon if word in row_index]
+        return (
+            [row for row in rows if norms[row] > 0],
+            [word for word in lexicon if word not in row_index or norms[row_index[word]] == 0])
+
+    (X, oov_x), (Y, oov_y), (A, oov_a), (B, oov_b) = (
+        lexicon_rows(lexicon)
+        for lexicon in [target_words_X, target_words_Y, attribute_words_a, attribute_words_b])
+
+    if len(X) == 0 or len(Y) == 0 or len(A) == 0 or len(B) == 0:
+        raise AttributeError("For at least one of the given lexicons all tokens are OOV.")
+
+    normalized = sparse.diags(1 / np.where(norms > 0, norms, 1)) @ ppmi
+    similarities = (normalized[X + Y] @ normalized[A + B].T).toarray()
+    associations = similarities[:, :len(A)].mean(axis=1) - similarities[:, len(A):].mean(axis=1)
+
+    return (float(effect_sizes(associations, len(X))), [*oov_x, *oov_y, *oov_a, *oov_b])
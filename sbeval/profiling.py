@@ -0,0 +1,221 @@
+import cProfile
+import logging
+import os
+import pstats
+import shutil
+import sys
+import threading
+
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import util
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+
+def add_profile_argument(parser) -> None:
+    """Add the `--profile` option shared by all scripts to the given argument parser.
+
+    Arguments:
+    parser -- The `argparse.ArgumentParser` of the script.
+    """
+    parser.add_argument(
+        "--profile",
+        default=None,
+        type=str,
+        help="Profile the script and write the deterministic profile (pstats) and the sampled "
+             "call stacks (collapsed stack format, e.g. for flamegraph.pl or speedscope) to the "
+             "given directory. Worker processes are profiled as well and merged into both files.",
+        metavar="PROFILE_DIR")
+
+
+def read_collapsed_stacks(file_path: str) -> Counter:
+    """Read a file in collapsed stack format. Return the number of samples by stack.
+
+    Arguments:
+    file_path -- The path to the file, with one stack per line, followed by its number of samples.
+    """
+    stacks = Counter()
+    with open(file_path, "r") as f:
+        for line in f:
+            stack, samples = line.rstrip("\n").rsplit(" ", 1)
+            stacks[stack] += int(samples)
+
+    return stacks
+
+
+def write_collapsed_stacks(file_path: str, stacks: Counter) -> None:
+    """Write the given number of samples by stack to a file in collapsed stack format.
+
+    Arguments:
+    file_path -- The path to the output file.
+    stacks -- The number of samples by stack; the frames of a stack are separated by semicolons.
+    """
+    with open(file_path, "w") as f:
+        f.writelines(f"{stack} {samples}\n" for stack, samples in sorted(stacks.items()))
+
+
+def _frame_label(frame) -> str:
+    """Return the label of a stack frame in the collapsed stack format."""
+    code = frame.f_code
+    return f"{code.co_name} ({path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample the call stacks of all threads of this process in regular intervals.
+
+    The stacks are counted in collapsed stack format, i.e. as semicolon separated frames from the
+    outermost to the innermost frame. The first frame names the process and thread, so that the
+    stacks of worker processes can be merged with the ones of the main process.
+
+    Arguments:
+    process -- The name of the process, e.g. 'main' or 'worker'.
+    interval -- The sampling interval in seconds.
+    """
+
+    def __init__(self, process: str, interval: float = 0.01):
+        self.process = process
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+
+    def _run(self) -> None:
+        own_thread = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_label(frame))
+                    frame = frame.f_back
+
+                root = f"{self.process}:{thread_names.get(thread_id, thread_id)}"
+                self.stacks[";".join([root, *reversed(frames)])] += 1
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stop sampling. Return the number of samples by stack."""
+        self._stopped.set()
+        self._thread.join()
+        return self.stacks
+
+
+class Profiler:
+    """Profile the current process and its `multiprocessing` workers, e.g. of a `Pool`.
+
+    Two complementary profiles are written: a deterministic profile of all function calls by
+    `cProfile` (`<name>-<timestamp>.pstats`) and the sampled call stacks of all threads
+    (`<name>-<timestamp>.collapsed`), from which flame graphs can be drawn. Worker processes write
+    their own profiles when they exit; these are merged into the profiles of the main process.
+
+    Workers are only profiled if they are forked (the default on Linux) and exit regularly, e.g.
+    after `Pool.close()` and `Pool.join()`, but not after `Pool.terminate()`.
+
+    Arguments:
+    output_dir -- The directory to write the profiles to; created if it does not exist.
+    name -- The name of the profiled script, used as prefix of the output files.
+    interval -- The sampling interval of the call stacks in seconds.
+    """
+
+    def __init__(self, output_dir: str, name: str, interval: float = 0.01):
+        self.interval = interval
+
+        dt = datetime.today().strftime("%Y%m%d%H%M%S")
+        self.basename = path.join(output_dir, f"{name}-{dt}")
+        self.worker_dir = f"{self.basename}-workers"
+
+        self._profile = None
+        self._sampler = None
+        self._active = False
+
+    def _start(self, process: str) -> None:
+        self._profile = cProfile.Profile()
+        self._sampler = StackSampler(process, self.interval)
+        self._sampler.start()
+        self._profile.enable()
+
+    def start(self) -> None:
+        """Start profiling this process and all workers forked from now on."""
+        os.makedirs(self.worker_dir, exist_ok=True)
+        util.register_after_fork(self, Profiler._start_worker)
+        self._active = True
+        self._start("main")
+
+    def _start_worker(self) -> None:
+        """Start profiling a forked worker; called by `multiprocessing` in the worker."""
+        if not self._active:
+            return
+
+        # The worker inherits the profiler of the thread it was forked from
+        self._profile.disable()
+        self._start("worker")
+
+        # Finalizers with an exit priority are run when the worker exits regularly
+        util.Finalize(None, self._stop_worker, exitpriority=10)
+
+    def _stop_worker(self) -> None:
+        self._profile.disable()
+        stacks = self._sampler.stop()
+
+        worker_file = path.join(self.worker_dir, str(os.getpid()))
+        self._profile.dump_stats(f"{worker_file}.pstats")
+        write_collapsed_stacks(f"{worker_file}.collapsed", stacks)
+
+    def stop(self) -> tuple:
+        """Stop profiling and merge the profiles of all workers into the ones of this process.
+
+        Return a tuple of the paths to the pstats file and the collapsed stacks file.
+        """
+        self._active = False
+        self._profile.disable()
+        stacks = self._sampler.stop()
+        stats = pstats.Stats(self._profile)
+
+        worker_files = sorted(os.listdir(self.worker_dir))
+        for worker_file in worker_files:
+            if worker_file.endswith(".pstats"):
+                stats.add(path.join(self.worker_dir, worker_file))
+            elif worker_file.endswith(".collapsed"):
+                stacks.update(read_collapsed_stacks(path.join(self.worker_dir, worker_file)))
+        shutil.rmtree(self.worker_dir)
+
+        n_workers = sum(worker_file.endswith(".pstats") for worker_file in worker_files)
+        logging.info(
+            f"Exporting profiles (including {n_workers} workers) to disk at "
+            f"{self.basename}.pstats and {self.basename}.collapsed.")
+        stats.dump_stats(f"{self.basename}.pstats")
+        write_collapsed_stacks(f"{self.basename}.collapsed", stacks)
+
+        return (f"{self.basename}.pstats", f"{self.basename}.collapsed")
+
+
+@contextmanager
+def profiled(output_dir: str, name: str):
+    """Profile the code run within the context, if an output directory is given; see `Profiler`.
+
+    Arguments:
+    output_dir -- The directory to write the profiles to, usually `args.profile`. If `None`, the
+                  code is not profiled.
+    name -- The name of the profiled script, used as prefix of the output files.
+    """
+    if output_dir is None:
+        yield
+        return
+
+    profiler = Profiler(output_dir, name)
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
@@ -0,0 +1,241 @@
+import json
+import logging
+import os
+import re
+
+from datetime import datetime
+from glob import glob
+from itertools import count
+from os import path
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+# Separator of the corpus name and the index of the split in the names of split models, as in
+# `debate_org-female__split3-vectors.txt`; see `GloVe/generate_ddo_models.sh`
+SPLIT_SEPARATOR = "__split"
+
+# Suffix of the vectors files written by `GloVe/generate_glove_model.sh`
+VECTORS_SUFFIX = "-vectors"
+
+# Pattern of the result files of `embedding_bias_evaluation.py`, with or without the model name
+EVALUATION_RESULTS_PATTERN = "embedding_bias_evaluation_results-*.json"
+
+# Pattern of the result files of `weat_cooccurrence_analysis.py` in a directory
+COOCCURRENCE_RESULTS_PATTERN = "weat-cooccurrence-analysis_results-*.json"
+
+
+def unique_results_file(
+        directory: str,
+        name: str,
+        model: str = None,
+        extension: str = ".json") -> str:
+    """Create a new, empty results file whose name contains the model and the current time.
+
+    If a file of the same name exists, e.g. since another run for the same model finished in the
+    same second, a counter is appended. The file is created exclusively, so that concurrent runs
+    never get the same file. Return its path.
+
+    Arguments:
+    directory -- The directory to create the file in.
+    name -- The name of the results, e.g. 'embedding_bias_evaluation_results'.
+    model -- The name or path of the evaluated model; only its basename without extension is used.
+    extension -- The extension of the file.
+    """
+    parts = [name, datetime.today().strftime("%Y%m%d%H%M%S")]
+    if model:
+        # Characters that are not safe in file names are replaced
+        parts.insert(1, re.sub(r"[^\w.-]", "_", path.splitext(path.basename(model))[0]))
+    stem = path.join(directory, "-".join(parts))
+
+    for i in count():
+        file_path = f"{stem}-{i}{extension}" if i else f"{stem}{extension}"
+        try:
+            os.close(os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return file_path
+        except FileExistsError:
+            continue
+
+
+def model_corpus_split(model: str) -> tuple:
+    """Determine the corpus and the split an embedding model was trained on from its name.
+
+    Return a tuple of the corpus and the index of the split, or `None` as index for models trained
+    on the whole corpus, e.g. ('debate_org-female', 3) for `debate_org-female__split3-vectors.txt`
+    and ('debate_org', None) for `debate_org-vectors.txt`.
+
+    Arguments:
+    model -- The name or path of the model, as in the `embeddings_model` field of the results.
+    """
+    name = path.basename(model)
+    for extension in [".txt", ".bin", ".npy"]:
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+    if name.endswith(VECTORS_SUFFIX):
+        name = name[:-len(VECTORS_SUFFIX)]
+
+    corpus, separator, split = name.rpartition(SPLIT_SEPARATOR)
+    if separator and split.isdigit():
+        return (corpus, int(split))
+
+    return (name, None)
+
+
+def cooccurrence_results_files(inputs: list) -> list:
+    """Expand the given results files and directories of results files. Return the sorted paths.
+
+    Arguments:
+    inputs -- Paths to results files of `weat_cooccurrence_analysis.py` or directories with them.
+    """
+    files = set()
+    for input_path in inputs:
+        if path.isdir(input_path):
+            files.update(glob(path.join(input_path, COOCCURRENCE_RESULTS_PATTERN)))
+        else:
+            files.add(input_path)
+
+    return sorted(path.abspath(file_path) for file_path in files)
+
+
+def lexicon_sets(weat_tests: dict) -> dict:
+    """Convert the given WEAT test lexicons into sets of words, for fast lookups. Return them.
+
+    Arguments:
+    weat_tests -- The test lexicons, as returned by `sbeval.lexicons.load_cooccurrence_tests()`.
+    """
+    return {
+        test_name: {key: set(lexicon[key]) for key in ["X", "Y", "A", "B"]}
+        for test_name, lexicon in weat_tests.items()}
+
+
+def accumulate_cooccurrence_counts(results: dict, weat_tests: dict, lexicons: dict = None) -> list:
+    """Accumulate the co-occurrence counts of a results file by test and target lexicon.
+
+    Return a list of table rows with the total counts of all target words of a lexicon with the
+    association words in A and in B.
+
+    Arguments:
+    results -- The contents of a results file of `weat_cooccurrence_analysis.py`.
+    weat_tests -- The test lexicons, as returned by `sbeval.lexicons.load_cooccurrence_tests()`.
+    lexicons -- The sets of the words of each test lexicon, see `lexicon_sets()`; computed from
+                `weat_tests` if `None`.
+    """
+    lexicons = lexicons or lexicon_sets(weat_tests)
+
+    rows = []
+    for test_name, test_results in results.items():
+        # Skip the name of the corpus and tests that are not in the lexicons
+        if test_name not in lexicons:
+            continue
+
+        lexicon = lexicons[test_name]
+        target_groups = weat_tests[test_name]["target_words"].split(" vs. ")
+        for target, target_group in zip(["X", "Y"], target_groups):
+            total_a = 0
+            total_b = 0
+            for target_word, counts in test_results.get(target, {}).items():
+                if target_word not in lexicon[target]:
+                    continue
+
+                total_a += sum(value for word, value in counts.items() if word in lexicon["A"])
+                total_b += sum(value for word, value in counts.items() if word in lexicon["B"])
+
+            rows.append({
+                "corpus": results["corpus"],
+                "test": test_name,
+                "target": target,
+                "target_group": target_group,
+                "association_a": total_a,
+                "association_b": total_b})
+
+    return rows
+
+
+def accumulate_results_files(
+        results_files: list,
+        weat_tests: dict,
+        known_files: set = frozenset()) -> list:
+    """Accumulate the co-occurrence counts of the given results files that are not known yet.
+
+    Return a list of table rows, see `accumulate_cooccurrence_counts()`, each with the absolute
+    path of its results file as `results_file`.
+
+    Arguments:
+    results_files -- Paths to results files of `weat_cooccurrence_analysis.py`.
+    weat_tests -- The test lexicons, as returned by `sbeval.lexicons.load_cooccurrence_tests()`.
+    known_files -- Absolute paths of results files that were accumulated before and are skipped.
+    """
+    lexicons = lexicon_sets(weat_tests)
+
+    rows = []
+    for file_path in map(path.abspath, results_files):
+        if file_path in known_files:
+            continue
+
+        logging.info(f"Accumulating the counts of {file_path}.")
+        with open(file_path, "r", encoding="utf-8") as f:
+            results = json.load(f)
+
+        rows.extend(
+            {**row, "results_file": file_path}
+            for row in accumulate_cooccurrence_counts(results, weat_tests, lexicons))
+
+    return rows
+
+
+def iter_weat_scores(results_files: list):
+    """Read the given evaluation results files one after another. Yield one row per model and test.
+
+    Tests without a result, e.g. since all words of a lexicon were OOV, have a score of NaN.
+
+    Arguments:
+    results_files -- Paths to result files of `embedding_bias_evaluation.py`.
+    """
+    for file_path in results_files:
+        with open(file_path, "r", encoding="utf-8") as f:
+            results = json.load(f)
+
+        corpus, split = model_corpus_split(results["embeddings_model"])
+        for test_name, result in results["weat"].items():
+            yield {
+                "model": results["embeddings_model"],
+                "corpus": corpus,
+                "split": split,
+                "test": test_name,
+                "score": result["score"] if isinstance(result, dict) else float("nan"),
+                "oov_tokens": len(result["oov_tokens"]) if isinstance(result, dict) else None,
+                "results_file": path.basename(file_path)}
+
+
+def aggregate_split_scores(scores):
+    """Aggregate the WEAT scores of the split models of each corpus. Return them as table.
+
+    Each row holds the mean, standard deviation and range of the scores of a test over the models
+    of the splits of a corpus, alongside the score of the model of the whole corpus. If a model was
+    evaluated multiple times, only its last row of each test is used.
+
+    Arguments:
+    scores -- The pandas table of the scores of all models and tests, see `iter_weat_scores()`, in
+              the order the models were evaluated.
+    """
+    scores = scores.drop_duplicates(["model", "test"], keep="last")
+
+    splits = scores[scores["split"].notna()]
+    aggregated = splits.groupby(["corpus", "test"])["score"].agg(
+        ["count", "mean", "std", "min", "max"]).reset_index()
+    aggregated["range"] = aggregated["max"] - aggregated["min"]
+    aggregated = aggregated.rename(columns={"count": "split_models"})
+
+    full_models = scores[scores["split"].isna()][["corpus", "test", "score"]]
+    aggregated = aggregated.merge(
+        full_models.rename(columns={"score": "full_corpus_score"}),
+        on=["corpus", "test"],
+        how="outer")
+    aggregated["split_models"] = aggregated["split_models"].fillna(0).astype(int)
+
+    # Sort tests by their number, so that test10 follows test9
+    aggregated["test_number"] = aggregated["test"].str.extract(r"(\d+)$", expand=False).astype(int)
+    aggregated = aggregated.sort_values(["corpus", "test_number"]).drop(columns="test_number")
+
+    return aggregated.reset_index(drop=True)
@@ -0,0 +1,228 @@
+import logging
+import numpy as np
+
+from collections import Counter
+from tqdm import tqdm
+
+from sbeval.constants import LOGGING_CONFIG
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+# Methods to find sentence boundaries with; the dependency parser is the most accurate, the
+# rule-based sentencizer (which splits on punctuation) the fastest
+SEGMENTERS = ["parser", "sentencizer"]
+
+# Pipeline components that are not needed to find sentence boundaries with the parser
+NON_PARSER_COMPONENTS = ["tagger", "ner", "textcat"]
+
+
+def load_segmenter(method: str = "parser", model: str = "en_core_web_sm"):
+    """Load a spacy pipeline that splits texts into sentences with the given method. Return it.
+
+    Arguments:
+    method -- One of `SEGMENTERS`: the dependency parser of the given model or a rule-based
+              sentencizer on top of a blank English pipeline, which has the same tokenizer.
+    model -- Name of the spacy model to load for the parser.
+    """
+    # spacy is imported on first use, as importing it takes about a second
+    import spacy
+
+    if method == "parser":
+        logging.debug(f"Loading spacy model '{model}' for sentence segmentation.")
+        return spacy.load(model, disable=NON_PARSER_COMPONENTS)
+
+    logging.debug("Building blank English pipeline with a sentencizer.")
+    nlp = spacy.blank("en")
+    try:
+        nlp.add_pipe("sentencizer")
+    except ValueError:
+        # spacy<3 expects the component itself instead of its name
+        nlp.add_pipe(nlp.create_pipe("sentencizer"))
+
+    return nlp
+
+
+def token_offsets(text: str) -> np.ndarray:
+    """Return the start character offset of each whitespace separated token of the given text.
+
+    Arguments:
+    text -- A text of tokens that are separated by single whitespaces.
+    """
+    lengths = np.array([len(token) + 1 for token in text.split(" ")], dtype=np.int64)
+    return np.concatenate([[0], np.cumsum(lengths[:-1])])
+
+
+def pair_words(pairs: set) -> tuple:
+    """Return the sets of the target and of the attribute words of the given pairs."""
+    return ({target for target, _ in pairs}, {attribute for _, attribute in pairs})
+
+
+def cooccurrence_windows(
+        tokens: list,
+        pairs: set,
+        window_size: int,
+        words: tuple = None) -> list:
+    """Find the spans around all pairs of words that are at most `window_size` tokens apart.
+
+    Each span reaches from `window_size` tokens before the first to `window_size` tokens after the
+    second word of a pair, so that the sentences of both words are most likely contained in full.
+    Return the spans as sorted list of non-overlapping (start, end) token indices; end exclusive.
+
+    Arguments:
+    tokens -- The tokens of a text.
+    pairs -- The pairs of words to look for, as (target, attribute) tuples.
+    window_size -- The maximum distance of the two words of a pair in tokens.
+    words -- The target and attribute words of the pairs, if already known, see `pair_words()`.
+    """
+    targets, attributes = words or pair_words(pairs)
+
+    target_hits = [(i, token) for i, token in enumerate(tokens) if token in targets]
+    attribute_hits = [(i, token) for i, token in enumerate(tokens) if token in attributes]
+
+    spans = sorted(
+        (max(min(i, j) - window_size, 0), min(max(i, j) + window_size + 1, len(tokens)))
+        for i, target in target_hits for j, attribute in attribute_hits
+        if abs(i - j) <= window_size and (target, attribute) in pairs)
+
+    # Merge overlapping spans, so that no sentence is split (and counted) twice
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def text_spans(
+        texts: list,
+        text_ids: list,
+        pairs: set = None,
+        window_size: int = None):
+    """Yield the character spans of the given texts that should be split into sentences.
+
+    Yield (text index, start, end) tuples: the whole texts, or if `window_size` is given, only the
+    spans around co-located pairs, see `cooccurrence_windows()`.
+
+    Arguments:
+    texts -- All texts, e.g. the posts of a corpus, with whitespace separated tokens.
+    text_ids -- The indices of the texts to yield spans of.
+    pairs -- The pairs of words to look for; only needed with `window_size`.
+    window_size -- The maximum distance of the two words of a pair in tokens. If `None`, the whole
+                   texts are yielded.
+    """
+    words = pair_words(pairs) if window_size is not None else None
+    for i in text_ids:
+        text = texts[i]
+        if window_size is None:
+            yield (i, 0, len(text))
+            continue
+
+        tokens = text.split(" ")
+        offsets = token_offsets(text)
+        for start, end in cooccurrence_windows(tokens, pairs, window_size, words):
+            yield (i, int(offsets[start]), int(offsets[end - 1]) + len(tokens[end - 1]))
+
+
+def sentence_offsets(
+        nlp,
+        texts: list,
+        text_ids: list,
+        pairs: set = None,
+        window_size: int = None,
+        n_process: int = 1) -> np.ndarray:
+    """Split the given texts, or only the spans around co-located pairs, into sentences.
+
+    Return an array with one row per sentence: the index of its text and its start and end
+    character offsets in the text.
+
+    Arguments:
+    nlp -- The spacy pipeline that finds the sentence boundaries, see `load_segmenter()`.
+    texts -- All texts, e.g. the posts of a corpus, with whitespace separated tokens.
+    text_ids -- The indices of the texts to split.
+    pairs -- The pairs of words to look for; only needed with `window_size`.
+    window_size -- If given, only the spans around pairs of words that are at most this many tokens
+                   apart are split, see `cooccurrence_windows()`.
+    n_process -- The number of processes to split the texts with.
+    """
+    spans = list(text_spans(texts, text_ids, pairs, window_size))
+    docs = nlp.pipe(
+        tqdm(((texts[i][start:end], (i, start)) for i, start, end in spans), total=len(spans)),
+        as_tuples=True,
+        n_process=n_process)
+
+    offsets = []
+    for doc, (i, span_start) in docs:
+        offsets.extend(
+            (i, span_start + sent.start_char, span_start + sent.end_char) for sent in doc.sents)
+
+    return np.array(offsets, dtype=np.int64).reshape(-1, 3)
+
+
+def pair_counts(sentences: list, pairs: set) -> Counter:
+    """Count the sentences each of the given pairs of words co-occurs in. Return the counts by pair.
+
+    Arguments:
+    sentences -- The sentences, with whitespace separated tokens.
+    pairs -- The pairs of words to count, as (target, attribute) tuples.
+    """
+    targets, attributes = pair_words(pairs)
+
+    counts = Counter()
+    for sentence in sentences:
+        tokens = set(sentence.split(" "))
+        for target in tokens & targets:
+            for attribute in tokens & attributes:
+                if (target, attribute) in pairs:
+                    counts[(target, attribute)] += 1
+
+    return counts
+
+
+def _segmented_spans(offsets: np.ndarray) -> list:
+    """Merge consecutive sentences of the same text into spans. Return (text, start, end) tuples."""
+    spans = []
+    for i, start, end in offsets:
+        if spans and spans[-1][0] == i and start <= spans[-1][2] + 1:
+            spans[-1][2] = end
+        else:
+            spans.append([i, start, end])
+
+    return [tuple(int(value) for value in span) for span in spans]
+
+
+def boundary_scores(reference: np.ndarray, offsets: np.ndarray) -> dict:
+    """Compare the sentence boundaries of a segmentation to those of a reference segmentation.
+
+    Only boundaries within the segmented spans are compared, i.e. the ends of sentences that are
+    followed by another sentence of the same span. Return their precision, recall and F1 score.
+
+    Arguments:
+    reference -- The sentence offsets of the reference segmentation of the whole texts, as returned
+                 by `sentence_offsets()`.
+    offsets -- The sentence offsets of the segmentation to evaluate.
+    """
+    def inner_boundaries(sentence_offsets: np.ndarray) -> set:
+        # A sentence ends at a boundary, if the next sentence of the same text starts right after
+        rows = sentence_offsets.tolist()
+        return {
+            (i, end) for (i, _, end), (next_i, next_start, _) in zip(rows[:-1], rows[1:])
+            if i == next_i and next_start <= end + 1}
+
+    predicted = inner_boundaries(offsets)
+
+    # Reference boundaries outside of the segmented spans cannot be found
+    spans_by_text = {}
+    for i, start, end in _segmented_spans(offsets):
+        spans_by_text.setdefault(i, []).append((start, end))
+    expected = {
+        (i, end) for i, end in inner_boundaries(reference)
+        if any(start < end < span_end for start, span_end in spans_by_text.get(i, []))}
+
+    true_positives = len(predicted & expected)
+    precision = true_positives / len(predicted) if predicted else 1.0
+    recall = true_positives / len(expected) if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+
+    return {"precision": precision, "recall": recall, "f1": f1}
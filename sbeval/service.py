@@ -0,0 +1,324 @@
+import asyncio
+import json
+import logging
+import numpy as np
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from sbeval.alignment import normalize_rows
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.vector_store import VectorStore
+from sbeval.weat_test import weat_score
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+# Reason phrases of the HTTP status codes the service responds with
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error"}
+
+
+class ServiceError(Exception):
+    """An error of a request, which is answered with the given HTTP status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def model_size(store: VectorStore) -> int:
+    """Return the number of bytes of the vectors of the given store that are held in memory.
+
+    Memory-mapped vectors, e.g. of `.npy` files, are paged in and out by the operating system and
+    thus don't count.
+    """
+    return 0 if isinstance(store.vectors, np.memmap) else store.vectors.nbytes
+
+
+class ModelCache:
+    """A cache of embedding models that are loaded once and kept warm for later requests.
+
+    If loading a model exceeds the memory budget, the least recently used models are evicted until
+    it fits. Requests that still use an evicted model keep it until they are done. Models are loaded
+    in the given executor, so that the event loop keeps serving other requests meanwhile.
+
+    Arguments:
+    models -- The paths to the models, by name.
+    memory_budget -- The maximum number of bytes of all models in memory, see `model_size()`.
+    executor -- The executor to load the models in.
+    glove_vectors -- Which vectors to use from GloVe's binary format, see `read_glove_binary()`.
+    """
+
+    def __init__(
+            self,
+            models: dict,
+            memory_budget: int,
+            executor: ThreadPoolExecutor,
+            glove_vectors: str = "sum"):
+        self.models = models
+        self.memory_budget = memory_budget
+        self.executor = executor
+        self.glove_vectors = glove_vectors
+
+        # Models by name, from the least to the most recently used
+        self._stores = OrderedDict()
+        self._loading = {}
+
+    def memory_usage(self) -> int:
+        """Return the number of bytes of all cached models."""
+        return sum(model_size(store) for store in self._stores.values())
+
+    def status(self) -> dict:
+        """Return the path, whether it is loaded and the size in MiB of each configured model."""
+        return {
+            name: {
+                "path": model_path,
+                "loaded": name in self._stores,
+                "size_mib": model_size(self._stores[name]) / 2 ** 20
+                if name in self._stores else None}
+            for name, model_path in self.models.items()}
+
+    def _evict(self, needed: int) -> None:
+        """Evict the least recently used models until the given number of bytes fit the budget."""
+        while self._stores and self.memory_usage() + needed > self.memory_budget:
+            name, _ = self._stores.popitem(last=False)
+            logging.info(f"Evicted model '{name}' from the cache.")
+
+    async def get(self, name: str) -> VectorStore:
+        """Get the model of the given name, loading it if it is not cached. Return it.
+
+        Raise a `ServiceError` if no model of the given name is configured.
+
+        Arguments:
+        name -- The name of the model.
+        """
+        if name not in self.models:
+            raise ServiceError(404, f"Unknown model '{name}'.")
+
+        if name in self._stores:
+            self._stores.move_to_end(name)
+            return self._stores[name]
+
+        # Concurrent requests for a model that is being loaded wait for the same load
+        if name not in self._loading:
+            self._loading[name] = asyncio.ensure_future(self._load(name))
+        try:
+            return await asyncio.shield(self._loading[name])
+        finally:
+            self._loading.pop(name, None)
+
+    async def _load(self, name: str) -> VectorStore:
+        logging.info(f"Loading model '{name}' from {self.models[name]}...")
+        store = await asyncio.get_event_loop().run_in_executor(
+            self.executor, VectorStore.load, self.models[name], self.glove_vectors)
+
+        size = model_size(store)
+        if size > self.memory_budget:
+            logging.warning(
+                f"Model '{name}' ({size / 2 ** 20:.0f} MiB) exceeds the memory budget on its own.")
+        self._evict(size)
+        self._stores[name] = store
+
+        return store
+
+
+def weat_request(store: VectorStore, payload: dict) -> dict:
+    """Calculate the WEAT score of the lexicons of a request with the given model. Return it.
+
+    Arguments:
+    store -- The vectors of the model.
+    payload -- The request, with the lists of words `X`, `Y`, `A` and `B` and, optionally,
+               `lowercase` to lowercase all of them.
+    """
+    lexicons = [_word_list(payload, key) for key in ["X", "Y", "A", "B"]]
+    if payload.get("lowercase", False):
+        lexicons = [[token.lower() for token in lexicon] for lexicon in lexicons]
+
+    try:
+        score, oov_tokens = weat_score(*lexicons, word_vector_getter=store)
+    except AttributeError as e:
+        raise ServiceError(422, f"No results possible: '{e}'")
+
+    return {"score": float(score), "oov_tokens": oov_tokens}
+
+
+def similarity_request(store: VectorStore, payload: dict) -> dict:
+    """Calculate the cosine similarities of all word pairs of a request with the given model.
+
+    Return them in the order of the pairs; the similarity of pairs with an OOV word is `None`.
+
+    Arguments:
+    store -- The vectors of the model.
+    payload -- The request, with the list of `pairs` of words.
+    """
+    pairs = payload.get("pairs")
+    if not isinstance(pairs, list) or not all(_is_word_pair(pair) for pair in pairs):
+        raise ServiceError(400, "Expected 'pairs' to be a list of pairs of words.")
+
+    # Each word is looked up only once, however often it appears in the pairs
+    tokens = sorted({token for pair in pairs for token in pair})
+    vectors, oov_mask = store.get_many(tokens)
+    index = {token: i for i, token in enumerate(t for t, oov in zip(tokens, oov_mask) if not oov)}
+    vectors = normalize_rows(vectors)
+
+    known = [i for i, (a, b) in enumerate(pairs) if a in index and b in index]
+    rows_a = vectors[[index[pairs[i][0]] for i in known]]
+    rows_b = vectors[[index[pairs[i][1]] for i in known]]
+
+    similarities = [None] * len(pairs)
+    for i, similarity in zip(known, np.einsum("ij,ij->i", rows_a, rows_b)):
+        similarities[i] = float(similarity)
+
+    return {"similarities": similarities}
+
+
+def _word_list(payload: dict, key: str) -> list:
+    """Return the list of words of the given key of a request; raise a `ServiceError` otherwise."""
+    words = payload.get(key)
+    if not isinstance(words, list) or not all(isinstance(word, str) for word in words):
+        raise ServiceError(400, f"Expected '{key}' to be a list of words.")
+
+    return words
+
+
+def _is_word_pair(pair) -> bool:
+    """Return whether the given element of a request is a list of two words."""
+    return isinstance(pair, list) and len(pair) == 2 and all(isinstance(w, str) for w in pair)
+
+
+class EvaluationService:
+    """An evaluation service that answers WEAT and similarity requests on warm embedding models.
+
+    Requests are JSON objects that name one of the configured models. The scoring runs in the
+    given executor; its threads share the cached models, and numpy releases the GIL in the
+    matrix products that dominate the scoring.
+
+    Arguments:
+    cache -- The cache of the models.
+    executor -- The executor to run the scoring in.
+    """
+
+    # Handlers of the POST requests, by path
+    HANDLERS = {"/weat": weat_request, "/similarity": similarity_request}
+
+    def __init__(self, cache: ModelCache, executor: ThreadPoolExecutor):
+        self.cache = cache
+        self.executor = executor
+
+    async def handle(self, method: str, target: str, body: bytes) -> tuple:
+        """Answer a single request. Return a tuple of the HTTP status code and the response.
+
+        Arguments:
+        method -- The HTTP method of the request.
+        target -- The path of the request.
+        body -- The body of the request, a JSON object for POST requests.
+        """
+        try:
+            if target == "/models":
+                if method != "GET":
+                    raise ServiceError(405, "Use GET to list the models.")
+                return (200, {
+                    "models": self.cache.status(),
+                    "memory_usage_mib": self.cache.memory_usage() / 2 ** 20,
+                    "memory_budget_mib": self.cache.memory_budget / 2 ** 20})
+
+            if target not in self.HANDLERS:
+                raise ServiceError(404, f"Unknown path '{target}'.")
+            if method != "POST":
+                raise ServiceError(405, f"Use POST for '{target}'.")
+
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except ValueError:
+                raise ServiceError(400, "The body of the request is not valid JSON.")
+            if not isinstance(payload, dict):
+                raise ServiceError(400, "The body of the request needs to be a JSON object.")
+
+            if not isinstance(payload.get("model"), str):
+                raise ServiceError(400, "Expected 'model' to be the name of a model.")
+
+            store = await self.cache.get(payload["model"])
+            result = await asyncio.get_event_loop().run_in_executor(
+                self.executor, self.HANDLERS[target], store, payload)
+            return (200, {"model": payload["model"], **result})
+        except ServiceError as e:
+            return (e.status, {"error": str(e)})
+        except Exception as e:
+            logging.exception(f"Request to '{target}' failed.")
+            return (500, {"error": str(e)})
+
+    async def _handle_connection(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        """Answer the HTTP/1.1 requests of a connection until the client closes it."""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+
+                method, target, headers, body = request
+                status, response = await self.handle(method, target, body)
+                _write_response(writer, status, response)
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            logging.debug(f"Closing connection after an invalid request: {e}")
+        finally:
+            writer.close()
+
+    async def start(self, host: str = None, port: int = None, socket_path: str = None):
+        """Start serving requests over TCP at the given host and port or at a Unix socket.
+
+        Return the server, see `asyncio.start_server()`.
+
+        Arguments:
+        host -- The host to listen at.
+        port -- The port to listen at.
+        socket_path -- The path of the Unix socket to listen at, instead of a host and port.
+        """
+        if socket_path:
+            server = await asyncio.start_unix_server(self._handle_connection, path=socket_path)
+            logging.info(f"Serving at unix://{socket_path}.")
+        else:
+            server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+            logging.info(f"Serving at http://{host}:{port}.")
+
+        return server
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple:
+    """Read an HTTP request. Return its method, path, headers and body, or `None` at the end."""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+
+    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+    return (method, target.split("?", 1)[0], headers, body)
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, response: dict) -> None:
+    """Write an HTTP response with the given status code and JSON body."""
+    body = json.dumps(response).encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
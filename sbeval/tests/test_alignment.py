@@ -0,0 +1,42 @@
+import numpy as np
+import tempfile
+import unittest
+
+from os import path
+
+from ..alignment import ProcrustesAligner
+
+
+class TestProcrustesAligner(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(42)
+        self.words = [f"word{i}" for i in range(50)]
+        self.vectors = random_state.normal(size=(50, 10)).astype(np.float32)
+
+        # A randomly rotated copy of the vectors, with the vocabulary in a different order
+        rotation, _ = np.linalg.qr(random_state.normal(size=(10, 10)))
+        self.rotated_words = self.words[::-1]
+        self.rotated_vectors = np.dot(self.vectors, rotation)[::-1]
+
+    def test_rotated_copy_is_not_displaced(self):
+        aligner = ProcrustesAligner("reference", self.words, self.vectors, chunk_size=7)
+        rotation = aligner.rotations({"rotated": (self.rotated_words, self.rotated_vectors)})
+        chunks = list(aligner.displacements(
+            self.rotated_words, self.rotated_vectors, rotation["rotated"]))
+
+        self.assertListEqual([w for words, _ in chunks for w in words], self.words)
+        np.testing.assert_allclose(
+            np.concatenate([d for _, d in chunks]), np.zeros(len(self.words)), atol=1e-5)
+
+    def test_cache_depends_on_glove_vectors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model_path = path.join(directory, "model-vectors.bin")
+            open(model_path, "w").close()
+
+            cache_files = {
+                ProcrustesAligner(
+                    model_path, self.words, self.vectors, cache_dir=directory,
+                    glove_vectors=glove_vectors)._cache_file(model_path)
+                for glove_vectors in ["sum", "word"]}
+
+            self.assertEqual(len(cache_files), 2)
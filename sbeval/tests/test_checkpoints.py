@@ -0,0 +1,38 @@
+import numpy as np
+import unittest
+
+from os import path
+from tempfile import TemporaryDirectory
+
+from ..checkpoints import Checkpoints, checkpoint_key
+
+
+class TestCheckpoints(unittest.TestCase):
+    def test_save_and_load(self):
+        with TemporaryDirectory() as tmp_dir:
+            checkpoints = Checkpoints(path.join(tmp_dir, "run"))
+            self.assertFalse(checkpoints.exists("candidates"))
+
+            checkpoints.save_array("candidates", np.arange(5))
+            checkpoints.save_json("counts-00000", [["she", "home", 3]])
+
+            self.assertTrue(checkpoints.exists("candidates"))
+            np.testing.assert_array_equal(checkpoints.load_array("candidates"), np.arange(5))
+            self.assertListEqual(checkpoints.load_json("counts-00000"), [["she", "home", 3]])
+
+            checkpoints.clear()
+            self.assertFalse(checkpoints.exists("candidates"))
+
+    def test_key_depends_on_inputs_and_params(self):
+        with TemporaryDirectory() as tmp_dir:
+            corpus = path.join(tmp_dir, "corpus.txt")
+            with open(corpus, "w") as f:
+                f.write("a post")
+
+            key = checkpoint_key([corpus], {"tests": [1, 2]})
+            self.assertEqual(key, checkpoint_key([corpus], {"tests": [1, 2]}))
+            self.assertNotEqual(key, checkpoint_key([corpus], {"tests": [1]}))
+
+            with open(corpus, "a") as f:
+                f.write(" and more")
+            self.assertNotEqual(key, checkpoint_key([corpus], {"tests": [1, 2]}))
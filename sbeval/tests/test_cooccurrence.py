@@ -0,0 +1,74 @@
+import numpy as np
+import tempfile
+import unittest
+
+from os import path
+
+from ..cooccurrence import count_window_cooccurrences, encode_lines, token_codes, window_counts
+
+
+def glove_cooccurrences(lines: list, words: list, window_size: int, vocab: set = None) -> tuple:
+    """Count co-occurrences with the loop of GloVe's `cooccur.c`, restricted to the given words."""
+    index = {word: i for i, word in enumerate(words)}
+    raw = np.zeros((len(words), len(words)))
+    weighted = np.zeros((len(words), len(words)))
+    for line in lines:
+        tokens = [t for t in line.replace("\t", " ").split(" ") if t]
+        history = [t for t in tokens if vocab is None or t in vocab]
+        for j, word in enumerate(history):
+            for k in range(max(j - window_size, 0), j):
+                if word in index and history[k] in index:
+                    for a, b in [(word, history[k]), (history[k], word)]:
+                        raw[index[a], index[b]] += 1
+                        weighted[index[a], index[b]] += 1.0 / (j - k)
+
+    return (raw, weighted)
+
+
+class TestWindowCooccurrences(unittest.TestCase):
+    words = ["man", "woman", "career", "family"]
+    lines = [
+        "the man went to his career and the woman\tto her family",
+        "man career  unknown family",
+        "",
+        "woman " + "x " * 20 + "career"]
+
+    def test_window_counts(self):
+        codes, default_code = token_codes(self.words)
+        raw, weighted = window_counts(*encode_lines(self.lines, codes, default_code), 4, 3)
+
+        # "man" and "career" are outside of the window in the first, but neighbours in the second
+        self.assertEqual(raw[0, 2], 1)
+        self.assertAlmostEqual(weighted[0, 2], 1.0)
+        np.testing.assert_array_equal(raw, raw.T)
+        np.testing.assert_array_equal(raw, glove_cooccurrences(self.lines, self.words, 3)[0])
+
+    def test_out_of_vocabulary_words_are_skipped(self):
+        vocab = {"the", "man", "went", "to", "his", "career", "and", "woman", "her", "family"}
+        codes, default_code = token_codes(self.words, vocab)
+        raw, weighted = window_counts(*encode_lines(self.lines, codes, default_code), 4, 2)
+
+        # Without "unknown", "career" and "family" are direct neighbours
+        self.assertEqual(weighted[2, 3], 1.0)
+        np.testing.assert_array_equal(
+            weighted, glove_cooccurrences(self.lines, self.words, 2, vocab)[1])
+
+    def test_chunks_match_glove(self):
+        random_generator = np.random.RandomState(42)
+        vocab = [*self.words, "a", "b", "c", "d", "e", "f"]
+        lines = [
+            " ".join(random_generator.choice(vocab, size=random_generator.randint(0, 60)))
+            for _ in range(200)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = path.join(directory, "corpus.txt")
+            with open(corpus, "w") as f:
+                f.write("\n".join(lines) + "\n")
+
+            raw, weighted = count_window_cooccurrences(
+                corpus, self.words, window_size=5, vocab=set(vocab[:-1]), chunk_bytes=500,
+                n_process=2)
+
+        expected_raw, expected_weighted = glove_cooccurrences(lines, self.words, 5, set(vocab[:-1]))
+        np.testing.assert_array_equal(raw, expected_raw)
+        np.testing.assert_allclose(weighted, expected_weighted)
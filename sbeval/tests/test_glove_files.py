@@ -0,0 +1,165 @@
+import numpy as np
+import tempfile
+import unittest
+
+from os import path
+
+from ..glove_files import (
+    COOCCURRENCE_RECORD, _StreamedVectorWriter, convert_text_vectors, cooccurrence_submatrix,
+    glove_binary_dimension, matching_vocab_file, read_glove_binary, read_npy_vectors,
+    read_text_vectors, read_vectors, read_word2vec_binary)
+
+
+class TestCooccurrenceFile(unittest.TestCase):
+    vocab = ["the", "man", "woman", "career", "family"]
+
+    def test_cooccurrence_submatrix(self):
+        # Vocabulary ids are 1-based; a pair may be split across multiple records
+        records = np.array([
+            (2, 4, 1.5), (4, 2, 1.5), (3, 5, 2.0), (2, 4, 0.5), (1, 4, 9.0), (2, 2, 3.0)],
+            dtype=COOCCURRENCE_RECORD)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with open(path.join(directory, "test-vocab.txt"), "w") as f:
+                f.write("".join(f"{word} 10\n" for word in self.vocab))
+            cooccurrence_file = path.join(directory, "test-cooccurrence.bin")
+            records.tofile(cooccurrence_file)
+
+            self.assertEqual(
+                matching_vocab_file(cooccurrence_file), path.join(directory, "test-vocab.txt"))
+            counts = cooccurrence_submatrix(
+                cooccurrence_file, ["man", "woman", "unknown"], ["career", "family"])
+
+        np.testing.assert_array_equal(counts, [[2.0, 0.0], [0.0, 2.0], [0.0, 0.0]])
+
+
+class TestGloveBinary(unittest.TestCase):
+    vocab = ["the", "man", "woman", "career"]
+
+    def setUp(self):
+        # Word vectors with their biases, followed by the context vectors with their biases
+        self.parameters = np.random.RandomState(42).normal(size=(2, len(self.vocab), 3 + 1))
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.bin_file = path.join(self.directory.name, "test-vectors.bin")
+        self.parameters.astype("<f8").tofile(self.bin_file)
+        with open(path.join(self.directory.name, "test-vocab.txt"), "w", encoding="utf-8") as f:
+            f.write("".join(f"{word} 10\n" for word in self.vocab))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_glove_binary_dimension(self):
+        self.assertEqual(glove_binary_dimension(self.bin_file), 3)
+
+        # A file whose size does not match the vocabulary is not a GloVe parameter file
+        other_file = path.join(self.directory.name, "other.bin")
+        self.parameters.ravel()[:-1].astype("<f8").tofile(other_file)
+        self.assertIsNone(glove_binary_dimension(other_file))
+        self.assertIsNone(glove_binary_dimension(
+            other_file, vocab_path=path.join(self.directory.name, "test-vocab.txt")))
+
+    def test_read_glove_binary(self):
+        words, vectors = read_glove_binary(self.bin_file, vectors="sum")
+        self.assertListEqual(words, self.vocab)
+        self.assertEqual(vectors.dtype, np.float32)
+        np.testing.assert_array_equal(
+            vectors, (self.parameters[0, :, :3] + self.parameters[1, :, :3]).astype(np.float32))
+
+        words, vectors = read_glove_binary(self.bin_file, vectors="word")
+        self.assertListEqual(words, self.vocab)
+        np.testing.assert_array_equal(vectors, self.parameters[0, :, :3].astype(np.float32))
+
+        # The format is detected from the file
+        np.testing.assert_array_equal(read_vectors(self.bin_file, glove_vectors="word")[1], vectors)
+
+
+class TestVectorConversion(unittest.TestCase):
+    # GloVe's text output has no header and ends with a vector for '<unk>', which is not in the
+    # vocabulary file
+    words = ["the", "man", "new_york", "<unk>"]
+    vectors = np.array(
+        [[0.5, -1.25, 2.0], [0.0, 1.0, -0.75], [3.5, -2.0, 0.125], [0.25, 0.25, 0.25]],
+        dtype=np.float32)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.text_file = self._write_text("test-vectors.txt", self.words)
+        with open(path.join(self.directory.name, "test-vocab.txt"), "w", encoding="utf-8") as f:
+            f.write("".join(f"{word} 10\n" for word in self.words[:-1]))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write_text(self, name: str, words: list, header: bool = False) -> str:
+        file_path = path.join(self.directory.name, name)
+        with open(file_path, "w", encoding="utf-8") as f:
+            if header:
+                f.write(f"{len(words)} {self.vectors.shape[1]}\n")
+            for word, vector in zip(words, self.vectors):
+                f.write(" ".join([word, *(str(value) for value in vector)]) + "\n")
+
+        return file_path
+
+    def assert_vectors_equal(self, words: list, vectors: np.ndarray, expected_words: list = None):
+        self.assertListEqual(words, expected_words or self.words)
+        np.testing.assert_array_equal(vectors, self.vectors)
+
+    def test_read_headerless_text(self):
+        # The number of rows is taken from the vocabulary file, plus one for '<unk>'
+        self.assert_vectors_equal(*read_text_vectors(self.text_file))
+
+        # Without a vocabulary file, the matrix grows while the file is read; words may contain
+        # whitespace, since lines are split from the right
+        words = ["the", "man", "new york", "<unk>"]
+        text_file = self._write_text("other.txt", words)
+        self.assertIsNone(matching_vocab_file(text_file))
+        self.assert_vectors_equal(*read_text_vectors(text_file), expected_words=words)
+
+    def test_word2vec_binary_round_trip(self):
+        output_file = path.join(self.directory.name, "test.w2v.bin")
+        self.assertEqual(convert_text_vectors(self.text_file, output_file, "word2vec"), 4)
+        self.assert_vectors_equal(*read_word2vec_binary(output_file))
+
+        # Words are terminated by a space in the binary word2vec format
+        with self.assertRaises(ValueError):
+            convert_text_vectors(
+                self._write_text("other.txt", ["the", "man", "new york", "<unk>"]),
+                output_file,
+                "word2vec")
+
+    def test_npy_round_trip(self):
+        output_file = path.join(self.directory.name, "test.npy")
+        self.assertEqual(convert_text_vectors(self.text_file, output_file, "npy"), 4)
+        words, vectors = read_npy_vectors(output_file, mmap=False)
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assert_vectors_equal(words, vectors)
+
+    def test_conversion_is_repeatable(self):
+        # A text file that has a word2vec header already converts to the same output
+        header_file = self._write_text("header.txt", self.words, header=True)
+
+        for output_format in ["word2vec", "npy"]:
+            outputs = []
+            for i, input_file in enumerate([self.text_file, self.text_file, header_file]):
+                output_file = path.join(self.directory.name, f"output{i}.{output_format}")
+                convert_text_vectors(input_file, output_file, output_format)
+                with open(output_file, "rb") as f:
+                    outputs.append(f.read())
+
+            self.assertEqual(len(set(outputs)), 1)
+
+
+class TestStreamedVectorWriter(unittest.TestCase):
+    def test_writer_without_header_cannot_be_instantiated(self):
+        class IncompleteWriter(_StreamedVectorWriter):
+            def write(self, word, vector):
+                pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            output_file = path.join(directory, "vectors.bin")
+            with self.assertRaises(TypeError):
+                IncompleteWriter(output_file, 16)
+
+            # The file is not even created
+            self.assertFalse(path.exists(output_file))
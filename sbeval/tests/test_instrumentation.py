@@ -0,0 +1,62 @@
+import json
+import time
+import unittest
+
+from multiprocessing import Pool
+from os import path
+from tempfile import TemporaryDirectory
+
+from ..instrumentation import Trace, trace_file
+
+
+def _busy(n: int) -> float:
+    """Keep a worker busy. Return the CPU time it took."""
+    start = time.process_time()
+    sum(i * i for i in range(n))
+    return time.process_time() - start
+
+
+class TestTrace(unittest.TestCase):
+    def test_stages_are_recorded(self):
+        trace = Trace("test", {"parameter": 1})
+        with trace.stage("first") as stage:
+            stage.items = 10
+        with trace.stage("second"):
+            pass
+
+        stages = trace.to_dict()["stages"]
+        self.assertListEqual([s["name"] for s in stages], ["first", "second"])
+        self.assertEqual(stages[0]["items"], 10)
+        self.assertIsNone(stages[1]["items_per_second"])
+        self.assertGreater(stages[0]["peak_rss_mib"], 0)
+
+    def test_cpu_time_includes_workers(self):
+        trace = Trace("test")
+        with trace.stage("pool"):
+            with Pool(2) as pool:
+                start = time.process_time()
+                workers_cpu_time = sum(pool.map(_busy, [2 * 10 ** 6] * 4))
+                parent_cpu_time = time.process_time() - start
+                pool.close()
+                pool.join()
+
+        # The parent process mostly waits, so most of the CPU time is spent in the workers; it is
+        # only counted once they are joined
+        stage = trace.stages[0]
+        self.assertLess(parent_cpu_time, workers_cpu_time / 2)
+        self.assertGreater(stage.cpu_time, 0.9 * workers_cpu_time)
+        self.assertGreater(stage.children_peak_rss_mib, 0)
+
+    def test_trace_is_saved_next_to_results(self):
+        trace = Trace("test")
+        with trace.stage("export"):
+            pass
+
+        with TemporaryDirectory() as tmp_dir:
+            output_file = path.join(tmp_dir, "test_results-20200101000000.json")
+            file_path = trace.save(output_file)
+
+            self.assertEqual(file_path, trace_file(output_file))
+            self.assertEqual(path.basename(file_path), "test_results-20200101000000.trace.json")
+            with open(file_path, "r") as f:
+                self.assertEqual(json.load(f)["stages"][0]["name"], "export")
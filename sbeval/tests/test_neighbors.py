@@ -0,0 +1,38 @@
+import numpy as np
+import unittest
+
+from os import path
+from tempfile import TemporaryDirectory
+
+from ..neighbors import NeighborIndex
+
+
+class TestNeighborIndex(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(42)
+        self.words = [f"word{i}" for i in range(100)]
+        self.vectors = random_state.normal(size=(100, 10)).astype(np.float32)
+
+    def _brute_force_neighbors(self, token: str, k: int) -> list:
+        normalized = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        similarities = np.dot(normalized, normalized[self.words.index(token)])
+        return [self.words[i] for i in np.argsort(-similarities)[1:k + 1]]
+
+    def test_blocked_search_is_exact(self):
+        index = NeighborIndex(self.words, self.vectors, block_size=7)
+        neighbors = index.neighbors(["word3", "word42", "oov"], k=5)
+
+        self.assertNotIn("oov", neighbors)
+        for token in ["word3", "word42"]:
+            self.assertListEqual(
+                [word for word, _ in neighbors[token]], self._brute_force_neighbors(token, 5))
+
+    def test_save_and_load(self):
+        index = NeighborIndex(self.words, self.vectors)
+        with TemporaryDirectory() as tmp_dir:
+            index_path = path.join(tmp_dir, "index.npy")
+            index.save(index_path)
+            loaded = NeighborIndex.load(index_path, block_size=16)
+
+            self.assertListEqual(loaded.words, self.words)
+            self.assertDictEqual(loaded.neighbors(["word0"], k=3), index.neighbors(["word0"], k=3))
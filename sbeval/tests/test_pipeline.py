@@ -0,0 +1,73 @@
+import sys
+import unittest
+
+from os import path
+from tempfile import TemporaryDirectory
+
+from ..pipeline import Pipeline, Stage
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.corpus_file = path.join(self.tmp_dir.name, "corpus.txt")
+        self.model_file = path.join(self.tmp_dir.name, "model.txt")
+        self.cache_file = path.join(self.tmp_dir.name, "cache.json")
+
+        with open(self.corpus_file, "w") as f:
+            f.write("some text")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _pipeline(self):
+        copy_file = "import shutil, sys; shutil.copy(sys.argv[1], sys.argv[2])"
+        return Pipeline([
+            Stage(
+                "model",
+                [sys.executable, "-c", copy_file, self.corpus_file, self.model_file],
+                inputs=[self.corpus_file],
+                outputs=[self.model_file]),
+            Stage(
+                "evaluation",
+                [sys.executable, "-c", "pass"],
+                inputs=[self.model_file])],
+            self.cache_file)
+
+    def test_dependency_order(self):
+        self.assertSetEqual(self._pipeline().dependencies["evaluation"], {"model"})
+
+    def test_unchanged_stages_are_cached(self):
+        self.assertDictEqual(
+            self._pipeline().run(), {"model": "done", "evaluation": "done"})
+        self.assertDictEqual(
+            self._pipeline().run(), {"model": "cached", "evaluation": "cached"})
+
+        # Changing the corpus reruns both the model and its evaluation
+        with open(self.corpus_file, "w") as f:
+            f.write("some other text")
+        self.assertDictEqual(
+            self._pipeline().run(), {"model": "done", "evaluation": "done"})
+
+    def test_failed_dependency_skips_stage(self):
+        pipeline = Pipeline([
+            Stage("fail", [sys.executable, "-c", "raise SystemExit(1)"]),
+            Stage("next", [sys.executable, "-c", "pass"], after=["fail"])],
+            self.cache_file)
+
+        self.assertDictEqual(pipeline.run(), {"fail": "failed", "next": "skipped"})
+
+    def test_environment_is_passed_but_not_logged(self):
+        # The command only knows how to build the secret, so that it is not part of the command
+        check_env = "import os; raise SystemExit(os.environ['SECRET'] != 'pass' + 'word')"
+        pipeline = Pipeline(
+            [Stage("secret", [sys.executable, "-c", check_env], env={"SECRET": "password"})],
+            self.cache_file)
+
+        with self.assertLogs(level="DEBUG") as logs:
+            self.assertDictEqual(pipeline.run(), {"secret": "done"})
+        self.assertFalse(any("password" in line for line in logs.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import numpy as np
+import tempfile
+import unittest
+
+from os import path
+
+from ..cooccurrence import count_window_cooccurrences
+from ..glove_files import COOCCURRENCE_RECORD
+from ..ppmi import cooccurrence_file_ppmi, corpus_ppmi, ppmi_effect_size
+
+
+class TestPPMI(unittest.TestCase):
+    words = ["he", "she", "work", "home"]
+    lines = [
+        "he went to work and he likes the office",
+        "she stays at home with the family at home",
+        "he is at work today and she is at home",
+        "the office is far from home"] * 3
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.corpus = path.join(self.directory.name, "corpus.txt")
+        with open(self.corpus, "w") as f:
+            f.write("\n".join(self.lines) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_corpus_ppmi_matches_dense_ppmi(self):
+        vocab = sorted({token for line in self.lines for token in line.split(" ")})
+        ppmi = corpus_ppmi(self.corpus, self.words, window_size=3, vocab=vocab, chunk_bytes=100)
+
+        # The full co-occurrence matrix of the vocabulary, which is only feasible for tiny corpora
+        _, counts = count_window_cooccurrences(self.corpus, vocab, window_size=3)
+        marginals = counts.sum(axis=1)
+        with np.errstate(divide="ignore"):
+            expected = np.maximum(
+                np.log(counts * counts.sum() / np.outer(marginals, marginals)), 0)
+
+        rows = [vocab.index(word) for word in self.words]
+        np.testing.assert_allclose(ppmi.toarray(), expected[rows])
+
+    def test_cooccurrence_file_ppmi_matches_corpus_ppmi(self):
+        vocab = sorted({token for line in self.lines for token in line.split(" ")})
+        _, counts = count_window_cooccurrences(self.corpus, vocab, window_size=3)
+
+        # GloVe's records have 1-based vocabulary ids, and a pair may be split across records
+        word1, word2 = np.nonzero(counts)
+        values = counts[word1, word2]
+        records = np.concatenate([
+            np.array(list(zip(word1 + 1, word2 + 1, values / 4)), dtype=COOCCURRENCE_RECORD),
+            np.array(list(zip(word1 + 1, word2 + 1, values * 3 / 4)), dtype=COOCCURRENCE_RECORD)])
+        records = records[np.random.RandomState(42).permutation(len(records))]
+
+        records.tofile(path.join(self.directory.name, "corpus-cooccurrence.bin"))
+        with open(path.join(self.directory.name, "corpus-vocab.txt"), "w") as f:
+            f.write("".join(f"{word} 10\n" for word in vocab))
+
+        words = [*self.words, "unknown"]
+        ppmi = cooccurrence_file_ppmi(
+            path.join(self.directory.name, "corpus-cooccurrence.bin"), words, chunk_records=7)
+        expected = corpus_ppmi(self.corpus, words, window_size=3, vocab=vocab)
+
+        # The first column is unused, since there is no vocabulary id 0
+        self.assertEqual(ppmi.shape, (len(words), len(vocab) + 1))
+        self.assertEqual(ppmi[:, 0].nnz, 0)
+        np.testing.assert_allclose(ppmi.toarray()[:, 1:], expected.toarray())
+
+    def test_ppmi_effect_size(self):
+        ppmi = corpus_ppmi(self.corpus, [*self.words, "unknown"], window_size=3, min_count=1)
+        score, oov = ppmi_effect_size(
+            ppmi, [*self.words, "unknown"], ["he"], ["she", "unknown"], ["work"], ["home"])
+
+        self.assertAlmostEqual(score, 2.0)
+        self.assertListEqual(oov, ["unknown"])
+        with self.assertRaises(AttributeError):
+            ppmi_effect_size(ppmi, self.words, ["he"], ["she"], ["work"], ["unknown"])
@@ -0,0 +1,33 @@
+import pstats
+import unittest
+
+from multiprocessing import Pool
+from tempfile import TemporaryDirectory
+
+from ..profiling import Profiler, read_collapsed_stacks
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+class TestProfiler(unittest.TestCase):
+    def test_worker_profiles_are_merged(self):
+        with TemporaryDirectory() as tmp_dir:
+            profiler = Profiler(tmp_dir, "test", interval=0.001)
+            profiler.start()
+
+            pool = Pool(2)
+            pool.map(_busy, [10 ** 5] * 4)
+            pool.close()
+            pool.join()
+
+            pstats_file, collapsed_file = profiler.stop()
+
+            # `_busy` is only ever called in the workers
+            functions = {function for _, _, function in pstats.Stats(pstats_file).stats.keys()}
+            self.assertIn("_busy", functions)
+
+            stacks = read_collapsed_stacks(collapsed_file)
+            self.assertTrue(any(stack.startswith("main:MainThread;") for stack in stacks))
+            self.assertTrue(any(stack.startswith("worker:") for stack in stacks))
@@ -0,0 +1,123 @@
+import json
+import numpy as np
+import pandas as pd
+import tempfile
+import unittest
+
+from os import path
+
+from ..lexicons import load_cooccurrence_tests
+from ..results import (
+    accumulate_cooccurrence_counts, accumulate_results_files, aggregate_split_scores,
+    cooccurrence_results_files, model_corpus_split, unique_results_file)
+
+# WEAT lexicons with a regular and a swapped test, whose target and attribute words are switched
+WEAT_TESTS = {
+    "test1": {
+        "X": ["Aster", "Clover"], "Y": ["Ant"], "A": ["Freedom"], "B": ["Abuse", "Crash"],
+        "target_words": "Flowers vs. insects", "attribute_words": "Pleasant vs. unpleasant"},
+    "test7": {
+        "X": ["Math"], "Y": ["Art"], "A": ["male", "man"], "B": ["female"],
+        "target_words": "Math vs. arts", "attribute_words": "Male vs. female terms"}}
+
+# Co-occurrence counts as written by `weat_cooccurrence_analysis.py`, with the swapped test switched
+# back; 'rose' and 'ant' are not in the target and attribute lexicons they appear under
+COOCCURRENCE_RESULTS = {
+    "corpus": "corpus",
+    "test1": {
+        "X": {
+            "aster": {"freedom": 2, "abuse": 1, "ant": 50},
+            "clover": {"crash": 4},
+            "rose": {"freedom": 100}},
+        "Y": {"ant": {"freedom": 1, "abuse": 3, "crash": 5}}},
+    "test7": {
+        "X": {"male": {"math": 3, "art": 1}, "man": {"math": 2}},
+        "Y": {"female": {"math": 1, "art": 6, "male": 9}}}}
+
+
+class TestResults(unittest.TestCase):
+    def test_model_corpus_split(self):
+        self.assertTupleEqual(
+            model_corpus_split("output/glove/splits/debate_org-female__split3-vectors.txt"),
+            ("debate_org-female", 3))
+        self.assertTupleEqual(model_corpus_split("debate_org-vectors.bin"), ("debate_org", None))
+        self.assertTupleEqual(model_corpus_split("glove.840B.300d.txt"), ("glove.840B.300d", None))
+
+    def test_unique_results_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = "output/glove/debate_org__split0-vectors.txt"
+            files = [unique_results_file(directory, "results", model) for _ in range(3)]
+
+            self.assertEqual(len(set(files)), 3)
+            self.assertTrue(all(path.isfile(f) for f in files))
+            self.assertTrue(
+                path.basename(files[0]).startswith("results-debate_org__split0-vectors-"))
+
+    def test_aggregate_split_scores(self):
+        def row(model, test, score):
+            corpus, split = model_corpus_split(model)
+            return {"model": model, "corpus": corpus, "split": split, "test": test, "score": score}
+
+        scores = pd.DataFrame([
+            # An earlier run of a model, which is replaced by its later run
+            row("ddo__split0-vectors.txt", "test9", 100.0),
+            *[row(f"ddo__split{i}-vectors.txt", "test9", score)
+              for i, score in enumerate([1.0, 2.0, 3.0])],
+            row("ddo-vectors.txt", "test9", 1.5),
+            # A test that has no score for the model of the whole corpus
+            *[row(f"ddo__split{i}-vectors.txt", "test10", 0.5) for i in range(2)],
+            # A corpus without split models
+            row("cmv-vectors.txt", "test9", -1.0)])
+
+        aggregated = aggregate_split_scores(scores)
+
+        # Tests are sorted by their number
+        self.assertListEqual(
+            list(zip(aggregated["corpus"], aggregated["test"])),
+            [("cmv", "test9"), ("ddo", "test9"), ("ddo", "test10")])
+        self.assertListEqual(aggregated["split_models"].tolist(), [0, 3, 2])
+        np.testing.assert_array_equal(aggregated["mean"], [np.nan, 2.0, 0.5])
+        np.testing.assert_array_equal(aggregated["std"], [np.nan, 1.0, 0.0])
+        np.testing.assert_array_equal(aggregated["range"], [np.nan, 2.0, 0.0])
+        np.testing.assert_array_equal(aggregated["full_corpus_score"], [-1.0, 1.5, np.nan])
+
+
+class TestCooccurrenceResults(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        tests_file = path.join(self.directory.name, "weat_tests.json")
+        with open(tests_file, "w") as f:
+            json.dump(WEAT_TESTS, f)
+        self.weat_tests = load_cooccurrence_tests(file_path=tests_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_accumulate_cooccurrence_counts(self):
+        rows = accumulate_cooccurrence_counts(COOCCURRENCE_RESULTS, self.weat_tests)
+
+        # The totals A:B of the original accumulation script
+        self.assertListEqual(
+            [(r["test"], r["target"], r["target_group"], r["association_a"], r["association_b"])
+             for r in rows],
+            [("test1", "X", "Flowers", 2, 5),
+             ("test1", "Y", "insects", 1, 8),
+             ("test7", "X", "Male", 5, 1),
+             ("test7", "Y", "female terms", 1, 6)])
+
+    def test_known_results_files_are_skipped(self):
+        results_file = path.join(
+            self.directory.name, "weat-cooccurrence-analysis_results-20201101000000.json")
+        with open(results_file, "w") as f:
+            json.dump(COOCCURRENCE_RESULTS, f)
+
+        results_files = cooccurrence_results_files([self.directory.name])
+        self.assertListEqual(results_files, [path.abspath(results_file)])
+
+        rows = accumulate_results_files(results_files, self.weat_tests)
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row["results_file"] == results_files[0] for row in rows))
+
+        known_files = {row["results_file"] for row in rows}
+        self.assertListEqual(
+            accumulate_results_files(results_files, self.weat_tests, known_files), [])
@@ -0,0 +1,36 @@
+import unittest
+
+from ..segmentation import (
+    boundary_scores, cooccurrence_windows, load_segmenter, pair_counts, sentence_offsets)
+
+
+class TestWindowedSegmentation(unittest.TestCase):
+    texts = [
+        "this is a man . he went home . the weather is nice today and so on . she is at work .",
+        "no pair here ."]
+    pairs = {("man", "home"), ("she", "work")}
+
+    def test_cooccurrence_windows(self):
+        tokens = self.texts[0].split(" ")
+
+        self.assertListEqual(cooccurrence_windows(tokens, self.pairs, 2), [])
+        # Overlapping spans are merged; each span is extended by the window size on both sides
+        self.assertListEqual(
+            cooccurrence_windows(tokens, {("man", "home"), ("he", "home")}, 4), [(0, 12)])
+        self.assertListEqual(cooccurrence_windows(tokens, self.pairs, 3), [(15, 23)])
+        self.assertListEqual(cooccurrence_windows(tokens, self.pairs, 4), [(0, 12), (14, 23)])
+
+    def test_windows_match_whole_texts(self):
+        nlp = load_segmenter("sentencizer")
+        reference = sentence_offsets(nlp, self.texts, [0, 1])
+        offsets = sentence_offsets(nlp, self.texts, [0, 1], self.pairs, window_size=4)
+
+        def sentences(sentence_offsets):
+            return [self.texts[i][start:end] for i, start, end in sentence_offsets]
+
+        self.assertListEqual(sentences(reference)[:2], ["this is a man .", "he went home ."])
+        self.assertEqual(
+            pair_counts(sentences(reference), self.pairs),
+            pair_counts(sentences(offsets), self.pairs))
+        self.assertDictEqual(
+            boundary_scores(reference, offsets), {"precision": 1.0, "recall": 1.0, "f1": 1.0})
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import tempfile
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+from ..service import EvaluationService, ModelCache
+
+# Vectors of a tiny model, 16 bytes each as float32
+VECTORS = {
+    "man": [1, 0, 0, 0],
+    "woman": [0, 1, 0, 0],
+    "career": [1, 0.2, 0, 0],
+    "family": [0.2, 1, 0, 0]}
+
+
+class TestService(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.models = {}
+        for name in ["first", "second"]:
+            self.models[name] = path.join(self.directory.name, f"{name}-vectors.txt")
+            with open(self.models[name], "w", encoding="utf-8") as f:
+                for word, vector in VECTORS.items():
+                    f.write(" ".join([word] + [str(value) for value in vector]) + "\n")
+
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.directory.cleanup()
+
+    def test_least_recently_used_model_is_evicted(self):
+        # Each model takes 64 bytes, so that only one of them fits
+        cache = ModelCache(self.models, memory_budget=100, executor=self.executor)
+
+        async def requests():
+            first = await cache.get("first")
+            self.assertIs(await cache.get("first"), first)
+            await cache.get("second")
+            return cache.status()
+
+        status = asyncio.run(requests())
+        self.assertFalse(status["first"]["loaded"])
+        self.assertTrue(status["second"]["loaded"])
+        self.assertEqual(cache.memory_usage(), 64)
+
+    def test_requests_over_unix_socket(self):
+        cache = ModelCache(self.models, memory_budget=2 ** 20, executor=self.executor)
+        service = EvaluationService(cache, self.executor)
+        socket_path = path.join(self.directory.name, "service.sock")
+
+        async def request(reader, writer, target, payload):
+            body = json.dumps(payload).encode("utf-8")
+            writer.write(
+                f"POST {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            line = await reader.readline()
+            while line != b"\r\n":
+                name, _, value = line.decode().partition(":")
+                headers[name.lower()] = value.strip()
+                line = await reader.readline()
+            return (status, json.loads(await reader.readexactly(int(headers["content-length"]))))
+
+        async def requests():
+            server = await service.start(socket_path=socket_path)
+            async with server:
+                # Several requests are sent over the same connection
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                responses = [
+                    await request(reader, writer, "/weat", {
+                        "model": "first", "X": ["man"], "Y": ["Woman"],
+                        "A": ["career"], "B": ["family", "oov"], "lowercase": True}),
+                    await request(reader, writer, "/similarity", {
+                        "model": "first", "pairs": [["man", "career"], ["man", "oov"]]}),
+                    await request(reader, writer, "/weat", {
+                        "model": "first", "X": ["oov"], "Y": ["man"], "A": ["man"], "B": ["man"]}),
+                    await request(reader, writer, "/similarity", {
+                        "model": "first", "pairs": [[["man"], "career"]]}),
+                    await request(reader, writer, "/weat", {"model": ["first"]}),
+                    await request(reader, writer, "/weat", {"model": "third"})]
+                writer.close()
+            return responses
+
+        weat, similarity, oov, invalid, invalid_model, unknown = asyncio.run(requests())
+
+        self.assertEqual(weat[0], 200)
+        self.assertGreater(weat[1]["score"], 0)
+        self.assertListEqual(weat[1]["oov_tokens"], ["oov"])
+        self.assertEqual(similarity[0], 200)
+        self.assertAlmostEqual(similarity[1]["similarities"][0], 1 / 1.04 ** 0.5, places=6)
+        self.assertIsNone(similarity[1]["similarities"][1])
+        self.assertEqual(oov[0], 422)
+        self.assertEqual(invalid[0], 400)
+        self.assertEqual(invalid_model[0], 400)
+        self.assertEqual(unknown[0], 404)
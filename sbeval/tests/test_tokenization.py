@@ -0,0 +1,28 @@
+import unittest
+
+from spacy.util import is_package
+
+from ..tokenization import load_tokenizer, tokenize_texts
+
+
+@unittest.skipUnless(is_package("en_core_web_sm"), "The spacy model 'en_core_web_sm' is missing.")
+class TestBlankTokenizerParity(unittest.TestCase):
+    # Sample of texts with the typical quirks of debate portal posts
+    texts = [
+        "I don't think that's true. Women and men should be paid equally!",
+        "Check out https://www.debate.org/ or mail me at someone@example.com :)",
+        "The U.S. gov't spent $3.5bn in 2016 -- that's 10% more than in '15.",
+        "African-American voters (and European-Americans, too) said \"no\"...",
+        "CON: Pro's arguments are weak;i.e. they're based on hearsay &amp; rumors.",
+        "   multiple   spaces\tand tabs, emojis 😀 and dashes—everywhere   ",
+        ""]
+
+    def test_token_output(self):
+        model_tokenized = list(tokenize_texts(self.texts, load_tokenizer()))
+        blank_tokenized = list(tokenize_texts(self.texts, load_tokenizer(blank=True)))
+
+        self.assertListEqual(model_tokenized, blank_tokenized)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import numpy as np
+import unittest
+
+from ..vector_store import VectorStore
+
+
+class TestVectorStore(unittest.TestCase):
+    def setUp(self):
+        self.store = VectorStore(
+            ["social", "bias", "word"],
+            np.array([[1, 0], [0, 1], [1, 1]], dtype=np.float64))
+
+    def test_get_many_matches_getitem(self):
+        tokens = ["word", "oov", "social-bias", "social oov", "bias"]
+        matrix, oov_mask = self.store.get_many(tokens)
+
+        self.assertListEqual(oov_mask.tolist(), [False, True, False, True, False])
+        self.assertEqual(matrix.dtype, np.float32)
+        for vector, token in zip(matrix, [t for t, oov in zip(tokens, oov_mask) if not oov]):
+            np.testing.assert_array_equal(vector, self.store[token])
+
+    def test_oov_token(self):
+        with self.assertRaises(KeyError):
+            self.store["social oov"]
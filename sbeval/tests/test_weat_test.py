@@ -0,0 +1,36 @@
+import numpy as np
+import unittest
+
+from ..vector_store import VectorStore
+from ..weat_test import effect_sizes, joint_associations, weat_difference_test, weat_score
+
+
+class TestWeatTest(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(42)
+        self.lexicons = {
+            "X": ["x0", "x1", "x2"], "Y": ["y0", "y1"], "A": ["a0", "a1"], "B": ["b0", "b1", "b2"]}
+        words = [word for lexicon in self.lexicons.values() for word in lexicon]
+        self.store = VectorStore(words, random_state.normal(size=(len(words), 5)))
+
+    def _associations(self, store: VectorStore) -> np.ndarray:
+        return joint_associations(*[
+            store.get_many(self.lexicons[key])[0] for key in ["X", "Y", "A", "B"]])
+
+    def test_effect_sizes_match_weat_score(self):
+        score, _ = weat_score(
+            *[self.lexicons[key] for key in ["X", "Y", "A", "B"]], word_vector_getter=self.store)
+
+        self.assertAlmostEqual(effect_sizes(self._associations(self.store), 3), score, places=6)
+
+        # Any number of association vectors are evaluated at once
+        batch = np.stack([self._associations(self.store)] * 4)
+        np.testing.assert_allclose(effect_sizes(batch, 3), [score] * 4, rtol=1e-6)
+
+    def test_identical_associations_do_not_differ(self):
+        associations = self._associations(self.store)
+        difference, p_value = weat_difference_test(
+            associations, associations.copy(), 3, n_permutations=100, batch_size=30)
+
+        self.assertEqual(difference, 0)
+        self.assertEqual(p_value, 1)
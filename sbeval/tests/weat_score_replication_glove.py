@@ -8,7 +8,7 @@ from ..weat_test import weat_score
 
 class TestWeatGloVe(unittest.TestCase):
     # Load test data from file
-    with open("ddo/tests/weat_tests.json", "r") as f:
+    with open("sbeval/tests/weat_tests.json", "r") as f:
         weat_tests = json.load(f)
 
     # Loading word vectors
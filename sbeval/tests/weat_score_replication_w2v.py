@@ -10,7 +10,7 @@ from ..weat_test import weat_score
 
 class TestWeatWord2vec(unittest.TestCase):
     # Load test data from file
-    with open(path.join("ddo", "tests", "weat_tests.json"), "r") as f:
+    with open(path.join("sbeval", "tests", "weat_tests.json"), "r") as f:
         weat_tests = json.load(f)
 
     # Load word vectors
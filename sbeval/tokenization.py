@@ -0,0 +1,79 @@
+import logging
+
+from tqdm import tqdm
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.utils import CorpusWriter
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+# Pipeline components that are not needed to split texts into tokens
+NON_TOKENIZER_COMPONENTS = ["tagger", "parser", "ner", "textcat"]
+
+
+def load_tokenizer(model: str = "en_core_web_sm", blank: bool = False):
+    """Load a spacy pipeline that only tokenizes texts. Return it.
+
+    By default, the given spacy model is loaded with all components but the tokenizer disabled.
+    If `blank` is set, only the rule-based tokenizer of the model's language is built instead, which
+    avoids loading the model weights altogether and keeps worker startup cheap.
+
+    Arguments:
+    model -- Name of the spacy model to load.
+    blank -- Whether to build a blank English pipeline instead of loading the model.
+    """
+    # spacy is imported on first use, as importing it takes about a second
+    import spacy
+
+    if blank:
+        logging.debug("Building blank English pipeline as tokenizer.")
+        return spacy.blank("en")
+
+    logging.debug(f"Loading spacy model '{model}' as tokenizer-only pipeline.")
+    return spacy.load(model, disable=NON_TOKENIZER_COMPONENTS)
+
+
+def tokenize_texts(texts: list, nlp, batch_size: int = 1000, n_process: int = 1):
+    """Tokenize and lowercase the given texts. Yield them as whitespace-joined token strings.
+
+    Texts are streamed through `nlp.pipe`, so that only the documents of the current batches are
+    kept in memory. The order of the yielded texts is the same as the order of the input texts.
+
+    Arguments:
+    texts -- An iterable of texts that should be tokenized.
+    nlp -- The spacy pipeline used to tokenize the texts.
+    batch_size -- The number of texts to send to a process at once.
+    n_process -- The number of processes to tokenize the texts with.
+    """
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield " ".join([token.text.lower() for token in doc])
+
+
+def export_tokenized_corpus(
+        texts: list,
+        nlp,
+        output_path: str,
+        filename: str,
+        n_splits: int = 0,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        random_state: int = 42) -> None:
+    """Tokenize the given texts and write them to a corpus file and its random splits.
+
+    Tokenized texts are written as soon as they leave the spacy pipeline; the full corpus file and
+    all split files are written in the same pass.
+
+    Arguments:
+    texts -- A list of texts that should be tokenized and exported.
+    nlp -- The spacy pipeline used to tokenize the texts.
+    output_path -- The path to save the output files to.
+    filename -- The base filename of the output files.
+    n_splits -- The number of random splits to output additionally.
+    batch_size -- The number of texts to send to a process at once.
+    n_process -- The number of processes to tokenize the texts with.
+    random_state -- The seed to be used for generating the random splits.
+    """
+    with CorpusWriter(output_path, filename, len(texts), n_splits, random_state) as writer:
+        for text in tqdm(
+                tokenize_texts(texts, nlp, batch_size, n_process), total=len(texts)):
+            writer.write(text)
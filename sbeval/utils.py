@@ -1,5 +1,5 @@
-from os import mkdir, path
-from random import shuffle
+from os import makedirs, path
+from random import Random, shuffle
 
 
 def split_corpus(corpus: list, n: int, output_path: str, filename: str, random_state: int = 42):
@@ -22,11 +22,85 @@ def split_corpus(corpus: list, n: int, output_path: str, filename: str, random_s
     # Write splits to files
     for i, split in enumerate(shuffled_splits):
         split_dir = path.join(output_path, "splits")
-        # Check if 'splits' sub-directory exists; create it if it doesn't
-        if not path.isdir(split_dir):
-            mkdir(split_dir)
+        # Create the 'splits' sub-directory; it may exist already or be created concurrently
+        makedirs(split_dir, exist_ok=True)
 
         # Acutally do the write operation
         output_file = path.join(split_dir, f"{filename}__split{i}.txt")
         with open(output_file, "w") as f:
             f.write("\n".join(split).lower())
+
+
+class CorpusWriter:
+    """Write texts to a corpus file and, in the same pass, to $n$ random splits of that corpus.
+
+    Texts are assigned to splits the same way as in `split_corpus()`: each text goes to the split
+    given by its position in a random permutation of the corpus, modulo $n$. Thus, the total number
+    of texts needs to be known beforehand. The files are written in the same layout as
+    `split_corpus()` uses, i.e. newline separated, with the splits in a 'splits' sub-directory.
+
+    Arguments:
+    output_path -- The path to save the output files to.
+    filename -- The base filename of the output files.
+    n_texts -- The total number of texts that will be written.
+    n_splits -- The number of random splits to output additionally. No splits are written if 0.
+    random_state -- The seed to be used for generating the random splits.
+    buffer_size -- The buffer size of each of the open files in bytes.
+    """
+
+    def __init__(
+            self,
+            output_path: str,
+            filename: str,
+            n_texts: int,
+            n_splits: int = 0,
+            random_state: int = 42,
+            buffer_size: int = 2 ** 20):
+        self.n_splits = n_splits
+        self.n_written = 0
+
+        # Position of each text in a shuffled version of the corpus
+        self._positions = list(range(n_texts))
+        Random(random_state).shuffle(self._positions)
+
+        # Other writers may create the same directories concurrently, e.g. in the pipeline
+        makedirs(output_path, exist_ok=True)
+        self._corpus_file = open(
+            path.join(output_path, f"{filename}.txt"), "w", buffering=buffer_size)
+        self._split_files = []
+        if n_splits > 0:
+            split_dir = path.join(output_path, "splits")
+            makedirs(split_dir, exist_ok=True)
+
+            self._split_files = [
+                open(
+                    path.join(split_dir, f"{filename}__split{i}.txt"), "w",
+                    buffering=buffer_size)
+                for i in range(n_splits)]
+        self._split_started = [False] * n_splits
+
+    def write(self, text: str) -> None:
+        """Write the given text to the corpus file and to the split it was assigned to.
+
+        Arguments:
+        text -- The text that should be written. It must not contain any newlines.
+        """
+        self._corpus_file.write(f"\n{text}" if self.n_written > 0 else text)
+
+        if self.n_splits > 0:
+            split = self._positions[self.n_written] % self.n_splits
+            self._split_files[split].write(f"\n{text}" if self._split_started[split] else text)
+            self._split_started[split] = True
+
+        self.n_written += 1
+
+    def close(self) -> None:
+        """Flush and close all open files."""
+        for f in [self._corpus_file, *self._split_files]:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
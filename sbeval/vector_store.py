@@ -0,0 +1,114 @@
+import logging
+import numpy as np
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.glove_files import read_vectors
+
+logging.basicConfig(**LOGGING_CONFIG)
+
+
+class VectorStore:
+    """A lightweight store of word vectors: a vocabulary dict and a contiguous float32 matrix.
+
+    Tokens that are not in the vocabulary, but consist of several hyphen or space separated words,
+    are represented by the mean vector of their words, if all of them are in the vocabulary.
+
+    Arguments:
+    words -- The vocabulary, in the order of the matrix rows. Only the first occurrence of a word
+             that appears multiple times is used.
+    vectors -- The matrix of word vectors; memory-mapped matrices are used as they are.
+    """
+
+    def __init__(self, words: list, vectors: np.ndarray):
+        self.words = list(words)
+        self.vectors = vectors if isinstance(vectors, np.memmap) \
+            else np.ascontiguousarray(vectors, dtype=np.float32)
+
+        self.vocab = {}
+        for i, word in enumerate(self.words):
+            self.vocab.setdefault(word, i)
+
+    @classmethod
+    def load(cls, file_path: str, glove_vectors: str = "sum"):
+        """Load the word vectors of the given file, in any format of `read_vectors()`. Return them.
+
+        Arguments:
+        file_path -- The path to the word vector file.
+        glove_vectors -- Which vectors to use from GloVe's binary format, see `read_glove_binary()`.
+        """
+        return cls(*read_vectors(file_path, glove_vectors=glove_vectors))
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.vocab
+
+    def _split_token(self, token: str) -> list:
+        """Return the vocabulary indices of the hyphen or space separated parts of a token.
+
+        Raise a `KeyError` if the token cannot be split or one of its parts is OOV.
+        """
+        if " " in token:
+            tokens = token.split(" ")
+        elif "-" in token:
+            tokens = token.split("-")
+        else:
+            raise KeyError(token)
+
+        return [self.vocab[t] for t in tokens]
+
+    def __getitem__(self, token: str) -> np.ndarray:
+        """Get the vector for the given token string.
+
+        Return the vector as numpy array. OOV tokens that are hyphen or space separated get the mean
+        vector of their parts; raise a `KeyError` if one of the parts is OOV as well.
+
+        Arguments:
+        token -- The token for which a vector should be returned.
+        """
+        index = self.vocab.get(token)
+        if index is not None:
+            return self.vectors[index]
+
+        logging.debug("Couldn't find token. Trying to split it by hyphen or space.")
+        return np.mean(self.vectors[self._split_token(token)], axis=0)
+
+    def get_many(self, tokens: list) -> tuple:
+        """Get the vectors of all given tokens at once.
+
+        Return a tuple of the matrix of the vectors of all in-vocabulary tokens, in the given order,
+        and a boolean mask that is `True` for each OOV token.
+
+        Arguments:
+        tokens -- The tokens for which vectors should be returned.
+        """
+        indices = np.array([self.vocab.get(token, -1) for token in tokens], dtype=np.int64)
+        oov_mask = indices < 0
+        matrix = self.vectors[indices[~oov_mask]]
+
+        # Tokens that are OOV as a whole may still be composed of in-vocabulary words
+        for i in np.flatnonzero(oov_mask):
+            try:
+                vector = np.mean(self.vectors[self._split_token(tokens[i])], axis=0)
+            except KeyError:
+                logging.debug(f"Token '{tokens[i]}' is OOV. Ignoring.")
+                continue
+
+            position = i - np.sum(oov_mask[:i])
+            matrix = np.insert(matrix, position, vector, axis=0)
+            oov_mask[i] = False
+
+        return (matrix, oov_mask)
+
+    def to_keyed_vectors(self):
+        """Wrap the vectors into gensim's `KeyedVectors`, which requires gensim. Return them."""
+        from gensim.models import KeyedVectors
+
+        keyed_vectors = KeyedVectors(self.vectors.shape[1])
+
+        # gensim>=4 renamed `add()` to `add_vectors()`
+        add_vectors = getattr(keyed_vectors, "add_vectors", None) or keyed_vectors.add
+        add_vectors(self.words, np.asarray(self.vectors))
+
+        return keyed_vectors
@@ -10,7 +10,6 @@
 import logging
 import numpy as np
 
-from scipy.spatial.distance import cdist
 from sys import intern
 
 from sbeval.constants import LOGGING_CONFIG
@@ -19,6 +18,24 @@ from sbeval.word_vectors import WordVectors
 logging.basicConfig(**LOGGING_CONFIG)
 
 
+def _cosine_distances(vectors_1: np.ndarray, vectors_2: np.ndarray) -> np.ndarray:
+    """Calculate the cosine distances between all rows of two matrices. Return them as matrix.
+
+    This is the same calculation as `scipy.spatial.distance.cdist(..., metric="cosine")`, in double
+    precision, without importing scipy.
+
+    Arguments:
+    vectors_1 -- Matrix of word vectors, one per row.
+    vectors_2 -- Matrix of word vectors, one per row.
+    """
+    vectors_1 = np.asarray(vectors_1, dtype=np.float64)
+    vectors_2 = np.asarray(vectors_2, dtype=np.float64)
+    norms_1 = np.linalg.norm(vectors_1, axis=1)
+    norms_2 = np.linalg.norm(vectors_2, axis=1)
+
+    return 1 - np.dot(vectors_1, vectors_2.T) / np.outer(norms_1, norms_2)
+
+
 def _association_test(
         word_vectors: np.ndarray,
         attributes_a: np.ndarray,
@@ -40,8 +57,8 @@ def _association_test(
     attributes_a -- Matrix of word vectors for all attribute words in $A$.
     attributes_b -- Matrix of word vectors for all attribute words in $B$.
     """
-    association_values_a = np.mean(cdist(word_vectors, attributes_a, metric="cosine"), axis=1)
-    association_values_b = np.mean(cdist(word_vectors, attributes_b, metric="cosine"), axis=1)
+    association_values_a = np.mean(_cosine_distances(word_vectors, attributes_a), axis=1)
+    association_values_b = np.mean(_cosine_distances(word_vectors, attributes_b), axis=1)
 
     return np.subtract(association_values_a, association_values_b) * -1
 
@@ -81,16 +98,21 @@ def _differential_association_test(
 
 
 def _embed_token_list(token_list: list, word_vector_getter) -> tuple:
-    """Transform a list of tokens to a list of word vectors. Return the list.
+    """Transform a list of tokens to a matrix of word vectors. Return the matrix.
 
     If a token is found to be out-of-vocabulary, it will be added to a separate list that is
-    returned alongside the list of vectors; the token will be excluded from the latter.
+    returned alongside the matrix of vectors; the token will be excluded from the latter.
 
     Arguments:
     token_list -- A list of tokens that should be transformed.
-    word_vector_getter -- An object that returns a vector given a word as parameter to the
-                          `__getitem__()` function.
+    word_vector_getter -- An object that returns the vectors of many tokens at once from a
+                          `get_many()` function, like `sbeval.vector_store.VectorStore`, or a
+                          vector given a word as parameter to the `__getitem__()` function.
     """
+    if hasattr(word_vector_getter, "get_many"):
+        vectors, oov_mask = word_vector_getter.get_many(token_list)
+        return (vectors, [token for token, oov in zip(token_list, oov_mask) if oov])
+
     vector_list = []
     oov = []
     for token in token_list:
@@ -100,7 +122,7 @@ def _embed_token_list(token_list: list, word_vector_getter) -> tuple:
             logging.debug(f"Token '{token}' is OOV. Ignoring.")
             oov.append(token)
 
-    return (vector_list, oov)
+    return (np.array(vector_list), oov)
 
 
 def weat_score(
@@ -129,7 +151,8 @@ def weat_score(
     target_words_Y -- List of target words in $Y$.
     attribute_words_a -- List of all attribute words in $A$.
     attribute_words_b -- List of all attribute words in $B$.
-    word_vector_getter -- An object that returns a vector given a word as parameter to the
+    word_vector_getter -- An object that returns the vectors of many tokens at once from a
+                          `get_many()` function or a vector given a word as parameter to the
                           `__getitem__()` function. If `None`, the default is to use word2vec
                           embeddings, as loaded by the `WordVectors` class.
     """
@@ -154,3 +177,84 @@ def weat_score(
     denominator = np.std(np.concatenate((association_X, association_Y), axis=0))
 
     return (numerator / denominator, [*oov_x, *oov_y, *oov_a, *oov_b])
+
+
+def joint_associations(
+        word_vectors_X: np.ndarray,
+        word_vectors_Y: np.ndarray,
+        attributes_a: np.ndarray,
+        attributes_b: np.ndarray) -> np.ndarray:
+    """Calculate the associations $s(w, A, B)$ of all target words $w\in X\cup Y$.
+
+    Return them as a single vector, with the associations of the words in $X$ first.
+
+    Arguments:
+    word_vectors_X -- Matrix of word vectors for all target words in $X$.
+    word_vectors_Y -- Matrix of word vectors for all target words in $Y$.
+    attributes_a -- Matrix of word vectors for all attribute words in $A$.
+    attributes_b -- Matrix of word vectors for all attribute words in $B$.
+    """
+    return np.concatenate((
+        _association_test(word_vectors_X, attributes_a, attributes_b),
+        _association_test(word_vectors_Y, attributes_a, attributes_b)), axis=0)
+
+
+def effect_sizes(associations: np.ndarray, n_x: int) -> np.ndarray:
+    """Calculate the WEAT effect size of each of the given joint association vectors. Return them.
+
+    This is the same calculation as in `weat_score()`, vectorized over the last axis, so that any
+    number of (e.g. permuted) association vectors, as returned by `joint_associations()`, can be
+    evaluated at once.
+
+    Arguments:
+    associations -- Array of joint association vectors, in its last axis.
+    n_x -- The number of target words in $X$, i.e. the number of leading associations of each
+           vector that belong to $X$.
+    """
+    numerator = np.subtract(
+        np.mean(associations[..., :n_x], axis=-1), np.mean(associations[..., n_x:], axis=-1))
+    return numerator / np.std(associations, axis=-1)
+
+
+def weat_difference_test(
+        associations_1: np.ndarray,
+        associations_2: np.ndarray,
+        n_x: int,
+        n_permutations: int = 10000,
+        random_state: int = 42,
+        batch_size: int = 10000) -> tuple:
+    """Test whether the WEAT effect sizes of two embedding models differ significantly.
+
+    Return a tuple of the difference of the effect sizes (first minus second model) and its
+    two-sided p-value.
+
+    Both association vectors need to be calculated on the same target and attribute words. Under
+    the null hypothesis that both models associate the target words equally, the associations of a
+    word are exchangeable between the two models. Thus, the null distribution is sampled by randomly
+    swapping the associations of each word between the models; all permutations of a batch are
+    evaluated at once.
+
+    Arguments:
+    associations_1 -- The joint association vector of the first model.
+    associations_2 -- The joint association vector of the second model.
+    n_x -- The number of target words in $X$.
+    n_permutations -- The number of random permutations to sample.
+    random_state -- The seed to be used for sampling the permutations.
+    batch_size -- The number of permutations to evaluate at once.
+    """
+    difference = effect_sizes(associations_1, n_x) - effect_sizes(associations_2, n_x)
+
+    random_generator = np.random.RandomState(random_state)
+    n_extreme = 0
+    for batch_start in range(0, n_permutations, batch_size):
+        n_batch = min(batch_size, n_permutations - batch_start)
+
+        # Each row swaps the associations of a random subset of words between the models
+        swaps = random_generator.randint(0, 2, size=(n_batch, associations_1.shape[0])) == 1
+        permuted_1 = np.where(swaps, associations_2, associations_1)
+        permuted_2 = np.where(swaps, associations_1, associations_2)
+
+        permuted_differences = effect_sizes(permuted_1, n_x) - effect_sizes(permuted_2, n_x)
+        n_extreme += np.sum(np.abs(permuted_differences) >= np.abs(difference))
+
+    return (difference, (n_extreme + 1) / (n_permutations + 1))
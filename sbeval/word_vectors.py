@@ -2,10 +2,10 @@ import logging
 import numpy as np
 
 from abc import ABC, abstractmethod
-from gensim.models import KeyedVectors
 from os import path
 
 from sbeval.constants import LOGGING_CONFIG, WORD_VECTOR_DIR
+from sbeval.vector_store import VectorStore
 
 logging.basicConfig(**LOGGING_CONFIG)
 
@@ -28,6 +28,10 @@ class WordVectors:
         """Get a vector for the corresponding token string."""
         return self.embeddings[token]
 
+    def get_many(self, tokens: list) -> tuple:
+        """Get the vectors of all given tokens at once, see `VectorStore.get_many()`."""
+        return self.embeddings.get_many(tokens)
+
 
 class BaseEmbeddings(ABC):
     """The base class for all embedding classes."""
@@ -42,6 +46,17 @@ class BaseEmbeddings(ABC):
         """Abstract class for retrieving a vector for a given token string."""
         pass
 
+    def get_many(self, tokens: list) -> tuple:
+        """Get the vectors of all given tokens at once.
+
+        Return a tuple of the matrix of the vectors of all in-vocabulary tokens and a boolean mask
+        that is `True` for each OOV token, see `VectorStore.get_many()`.
+
+        Arguments:
+        tokens -- The tokens for which vectors should be returned.
+        """
+        return self.embeddings.get_many(tokens)
+
 
 class Word2VecEmbeddings(BaseEmbeddings):
     """Class that provides easy access to the 300-dimensional GoogleNews word2vec embeddings."""
@@ -51,16 +66,16 @@ class Word2VecEmbeddings(BaseEmbeddings):
         self.embeddings = self._load_embeddings(
             path.join(WORD_VECTOR_DIR, "GoogleNews-vectors-negative300.bin"))
 
-    def _load_embeddings(self, path: str) -> None:
-        """Load the pretrained word2vec embeddings from the given path using gensim.
+    def _load_embeddings(self, path: str) -> VectorStore:
+        """Load the pretrained word2vec embeddings from the given path.
 
-        Return the embeddings objects that is able to handle calls to __getitem__.
+        Return the `VectorStore` of the embeddings.
 
         Arguments:
         path -- The path to the word vector file.
         """
         logging.debug("Loading word2vec embeddings.")
-        return KeyedVectors.load_word2vec_format(path, binary=True)
+        return VectorStore.load(path)
 
     def __getitem__(self, token: str) -> np.ndarray:
         """Get the vector for the given token string.
@@ -71,23 +86,7 @@ class Word2VecEmbeddings(BaseEmbeddings):
         token -- The token for which a vector should be returned.
         """
         logging.debug(f"Retrieving and returning word2vec vector for '{token}'.")
-        try:
-            return self.embeddings[token]
-        except KeyError as e:
-            logging.debug("Couldn't find token. Trying to split it by hyphen or space.")
-            if " " in token:
-                tokens = token.split(" ")
-            elif "-" in token:
-                tokens = token.split("-")
-            else:
-                raise e
-
-            # If token as either hyphen or space separated,
-            # return the mean vector of both embeddings
-            logging.debug("Successfully split token by hyphen or space. \
-                Will return mean of both vectors, if possible.")
-            token_embeds = [self.embeddings[t] for t in tokens]
-            return np.mean(token_embeds, axis=0)
+        return self.embeddings[token]
 
 
 class GloVeEmbeddings(BaseEmbeddings):
@@ -104,16 +103,16 @@ class GloVeEmbeddings(BaseEmbeddings):
         self.embeddings = self._load_embeddings(
             path.join(WORD_VECTOR_DIR, "glove.840B.300d_word2vec-format.txt"))
 
-    def _load_embeddings(self, path: str) -> None:
-        """Load the pretrained GloVe embeddings from the given path using gensim.
+    def _load_embeddings(self, path: str) -> VectorStore:
+        """Load the pretrained GloVe embeddings from the given path.
 
-        Return the embeddings objects that is able to handle calls to __getitem__.
+        Return the `VectorStore` of the embeddings.
 
         Arguments:
         path -- The path to the word vector file.
         """
         logging.debug("Loading GloVe embeddings.")
-        return KeyedVectors.load_word2vec_format(path)
+        return VectorStore.load(path)
 
     def __getitem__(self, token: str) -> np.ndarray:
         """Get the vector for the given token string.
@@ -124,23 +123,7 @@ class GloVeEmbeddings(BaseEmbeddings):
         token -- The token for which a vector should be returned.
         """
         logging.debug(f"Retrieving and returning glove vector for '{token}'.")
-        try:
-            return self.embeddings[token]
-        except KeyError as e:
-            logging.debug("Couldn't find token. Trying to split it by hyphen or space.")
-            if " " in token:
-                tokens = token.split(" ")
-            elif "-" in token:
-                tokens = token.split("-")
-            else:
-                raise e
-
-            # If token as either hyphen or space separated,
-            # return the mean vector of both embeddings
-            logging.debug("Successfully split token by hyphen or space. \
-                Will return mean of both vectors, if possible.")
-            token_embeds = [self.embeddings[t] for t in tokens]
-            return np.mean(token_embeds, axis=0)
+        return self.embeddings[token]
 
 
 class ConceptNetNumberbatchEmbeddings(BaseEmbeddings):
@@ -151,16 +134,16 @@ class ConceptNetNumberbatchEmbeddings(BaseEmbeddings):
         self.embeddings = self._load_embeddings(
             path.join(WORD_VECTOR_DIR, "numberbatch-en.txt"))
 
-    def _load_embeddings(self, path: str) -> None:
-        """Load the pretrained conceptnet embeddings from the given path using gensim.
+    def _load_embeddings(self, path: str) -> VectorStore:
+        """Load the pretrained conceptnet embeddings from the given path.
 
-        Return the embeddings objects that is able to handle calls to __getitem__.
+        Return the `VectorStore` of the embeddings.
 
         Arguments:
         path -- The path to the word vector file.
         """
         logging.debug("Loading conceptnet embeddings.")
-        return KeyedVectors.load_word2vec_format(path, binary=False)
+        return VectorStore.load(path)
 
     def __getitem__(self, token: str) -> np.ndarray:
         """Get the vector for the given token string.
@@ -171,51 +154,36 @@ class ConceptNetNumberbatchEmbeddings(BaseEmbeddings):
         token -- The token for which a vector should be returned.
         """
         logging.debug(f"Retrieving and returning conceptnet vector for '{token}'.")
-        try:
-            return self.embeddings[token]
-        except KeyError as e:
-            logging.debug("Couldn't find token. Trying to split it by hyphen or space.")
-            if " " in token:
-                tokens = token.split(" ")
-            elif "-" in token:
-                tokens = token.split("-")
-            else:
-                raise e
-
-            # If token as either hyphen or space separated,
-            # return the mean vector of both embeddings
-            logging.debug("Successfully split token by hyphen or space. \
-                Will return mean of both vectors, if possible.")
-            token_embeds = [self.embeddings[t] for t in tokens]
-            return np.mean(token_embeds, axis=0)
+        return self.embeddings[token]
 
 
 class CustomEmbeddings(BaseEmbeddings):
-    """Class that provides easy access to loading custom embeddings in word2vec text format.
+    """Class that provides easy access to loading custom embeddings.
 
     Arguments:
     embeddings_path -- Path to the embeddings file. Vectors are expected to be present in word2vec
-                       format and in non-binary text format.
+                       format (binary or text), in GloVe text format (i.e. without header), in
+                       GloVe's binary format (alongside its `-vocab.txt` file) or as `.npy` matrix
+                       written by `sbeval.glove_files.NpyWriter`.
+    glove_vectors -- Which vectors to use from GloVe's binary format; either 'sum' for the sum of
+                     word and context vectors or 'word' for the word vectors alone.
     """
 
-    def __init__(self, embeddings_path: str):
+    def __init__(self, embeddings_path: str, glove_vectors: str = "sum"):
         logging.debug("Initialized custom embeddings.")
+        self.glove_vectors = glove_vectors
         self.embeddings = self._load_embeddings(embeddings_path)
 
-    def _load_embeddings(self, embeddings_path: str) -> None:
-        """Load the pretrained custom embeddings from the given path using gensim.
+    def _load_embeddings(self, embeddings_path: str) -> VectorStore:
+        """Load the pretrained custom embeddings from the given path.
 
-        Return the embeddings objects that is able to handle calls to __getitem__.
+        Return the `VectorStore` of the embeddings.
 
         Arguments:
         embeddings_path -- The path to the word vector file.
         """
         logging.debug("Loading custom embeddings.")
-
-        # Determine if the format is bianry or not, based on the file extension
-        binary_format = path.splitext(embeddings_path)[1] == ".bin"
-
-        return KeyedVectors.load_word2vec_format(embeddings_path, binary=binary_format)
+        return VectorStore.load(embeddings_path, glove_vectors=self.glove_vectors)
 
     def __getitem__(self, token: str) -> np.ndarray:
         """Get the vector for the given token string.
@@ -226,20 +194,4 @@ class CustomEmbeddings(BaseEmbeddings):
         token -- The token for which a vector should be returned.
         """
         logging.debug(f"Retrieving and returning custom vector for '{token}'.")
-        try:
-            return self.embeddings[token]
-        except KeyError as e:
-            logging.debug("Couldn't find token. Trying to split it by hyphen or space.")
-            if " " in token:
-                tokens = token.split(" ")
-            elif "-" in token:
-                tokens = token.split("-")
-            else:
-                raise e
-
-            # If token as either hyphen or space separated,
-            # return the mean vector of both embeddings
-            logging.debug("Successfully split token by hyphen or space. \
-                Will return mean of both vectors, if possible.")
-            token_embeds = [self.embeddings[t] for t in tokens]
-            return np.mean(token_embeds, axis=0)
+        return self.embeddings[token]
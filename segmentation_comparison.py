@@ -0,0 +1,178 @@
+import argparse
+import json
+import logging
+import numpy as np
+
+from datetime import datetime
+from itertools import product
+from os import cpu_count, path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.lexicons import load_cooccurrence_tests, target_attribute_pairs
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.segmentation import (
+    SEGMENTERS, boundary_scores, load_segmenter, pair_counts, pair_words, sentence_offsets)
+
+
+def count_agreement(reference: dict, counts: dict) -> dict:
+    """Compare the co-occurrence counts of all pairs to the ones of a reference segmentation.
+
+    Return the total counts, the fraction of pairs with the same count and the sum of the absolute
+    differences of all pairs.
+
+    Arguments:
+    reference -- The counts by pair of the reference segmentation.
+    counts -- The counts by pair of the segmentation to evaluate.
+    """
+    all_pairs = set(reference.keys()) | set(counts.keys())
+    differences = [abs(reference.get(pair, 0) - counts.get(pair, 0)) for pair in all_pairs]
+
+    return {
+        "total_count": sum(counts.values()),
+        "reference_total_count": sum(reference.values()),
+        "equal_pairs": sum(d == 0 for d in differences) / len(all_pairs) if all_pairs else 1.0,
+        "absolute_difference": sum(differences)}
+
+
+def main():
+    trace = Trace("segmentation_comparison", vars(args))
+
+    # Read all posts from the given text file; assuming that posts are newline separated
+    with trace.stage("loading") as stage:
+        with open(args.data, "r") as f:
+            posts = f.read().split("\n")
+        stage.items = len(posts)
+
+    pairs = set(target_attribute_pairs(load_cooccurrence_tests(args.tests)))
+
+    # Only posts that contain at least one of the pairs are segmented by the analysis
+    logging.info("Sampling candidate posts...")
+    with trace.stage("candidate_posts") as stage:
+        targets, attributes = pair_words(pairs)
+        candidate_ids = []
+        for i, post in enumerate(posts):
+            tokens = set(post.split(" "))
+            if any(pair in pairs for pair in product(tokens & targets, tokens & attributes)):
+                candidate_ids.append(i)
+        random_generator = np.random.RandomState(args.seed)
+        sample_ids = sorted(random_generator.choice(
+            candidate_ids, size=min(args.sample, len(candidate_ids)), replace=False))
+        stage.items = len(posts)
+
+    # The dependency parser on the whole posts is the reference all other modes are compared to
+    modes = [
+        (segmenter, window_size) for window_size in [None, args.window_size]
+        for segmenter in SEGMENTERS]
+
+    results = {}
+    for segmenter, window_size in modes:
+        mode = f"{segmenter}-{'windows' if window_size else 'posts'}"
+        logging.info(f"Splitting {len(sample_ids)} candidate posts with mode '{mode}'...")
+        nlp = load_segmenter(segmenter)
+
+        with trace.stage(mode) as stage:
+            offsets = sentence_offsets(
+                nlp, posts, sample_ids, pairs, window_size, n_process=args.processing_cores)
+            stage.items = len(sample_ids)
+
+        counts = pair_counts([posts[i][start:end] for i, start, end in offsets], pairs)
+        if not results:
+            reference_offsets, reference_counts = offsets, counts
+
+        results[mode] = {
+            "segmenter": segmenter,
+            "window_size": window_size,
+            "seconds": stage.wall_time,
+            "speedup": results["parser-posts"]["seconds"] / stage.wall_time if results else 1.0,
+            "segmented_characters": int(np.sum(offsets[:, 2] - offsets[:, 1])),
+            "sentences": len(offsets),
+            "boundaries": boundary_scores(reference_offsets, offsets),
+            "counts": count_agreement(reference_counts, counts)}
+
+    for mode, result in results.items():
+        logging.info(
+            f"{mode}: {result['seconds']:.2f}s ({result['speedup']:.1f}x), boundary F1 "
+            f"{result['boundaries']['f1']:.3f}, equal pair counts "
+            f"{result['counts']['equal_pairs']:.3f}")
+
+    # Export the results to disk
+    dt = datetime.today().strftime("%Y%m%d%H%M%S")
+    output_file = path.join(args.output, f"segmentation_comparison_results-{dt}.json")
+    logging.info(f"Exporting results to disk at {output_file}.")
+    with open(output_file, "w") as f:
+        json.dump({
+            "corpus": path.basename(args.data),
+            "posts": len(sample_ids),
+            "reference": "parser-posts",
+            "modes": results}, f, indent=4)
+
+    trace.save(output_file)
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to compare the sentence segmentation modes of the WEAT co-occurrence analysis "
+        "in speed and accuracy, with the dependency parser on whole posts as reference.")
+
+    parser.add_argument(
+        "-d",
+        "--data",
+        required=True,
+        type=str,
+        help="Path to the corpus. Expects one whitespace separated post per line.",
+        metavar="DATA_PATH")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=str,
+        help="Path to the directory where the result file should be saved to.",
+        metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "-t",
+        "--tests",
+        required=True,
+        nargs='+',
+        help="A list of test numbers (from 1 to 10) whose pairs should be searched for "
+             "(whitespace separated).",
+        type=int,
+        metavar="TESTS_TO_INCLUDE")
+    parser.add_argument(
+        "-n",
+        "--sample",
+        default=1000,
+        type=int,
+        help="The number of randomly sampled candidate posts to segment.",
+        metavar="SAMPLE_SIZE")
+    parser.add_argument(
+        "-w",
+        "--window_size",
+        default=50,
+        type=int,
+        help="The window size of the modes that only segment the spans around co-located pairs.",
+        metavar="WINDOW_SIZE")
+    parser.add_argument(
+        "--seed",
+        default=42,
+        type=int,
+        help="The seed to be used for sampling the candidate posts.",
+        metavar="SEED")
+    parser.add_argument(
+        "-c",
+        "--processing_cores",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of processing cores to use for the segmentation.",
+        metavar="PROCESSING_CORES")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    with profiled(args.profile, "segmentation_comparison"):
+        main()
+    print("Done.")
@@ -1,19 +1,23 @@
 import argparse
 import json
 import logging
-import spacy
+import numpy as np
 
 from datetime import datetime
-from itertools import product
 from multiprocessing import Pool
 from os import cpu_count, path
 from tqdm import tqdm
 
+from sbeval.checkpoints import Checkpoints, checkpoint_key
 from sbeval.constants import LOGGING_CONFIG
+from sbeval.instrumentation import Trace
+from sbeval.lexicons import load_cooccurrence_tests, target_attribute_pairs
+from sbeval.profiling import add_profile_argument, profiled
+from sbeval.segmentation import SEGMENTERS, load_segmenter, sentence_offsets
 
 
 def _get_candidate_posts(pair: tuple) -> list:
-    """Find all posts that contain both words in the given pair. Return them afterwards.
+    """Find all posts that contain both words in the given pair. Return their indices afterwards.
 
     If no candidate posts are found, return None.
 
@@ -23,14 +27,14 @@ def _get_candidate_posts(pair: tuple) -> list:
     global posts
 
     candidates = []
-    for post in posts:
+    for i, post in enumerate(posts):
         # Split the post by whitespace into a list of tokens
         # Note: the input text is supposed to be whitespace tokenized already
         p_split = post.split(" ")
 
         # Check if both of the tokens are present in the resulting token list
         if pair[0] in p_split and pair[1] in p_split:
-            candidates.append(post)
+            candidates.append(i)
 
     # Only return a list if there are any candidate post to return
     if len(candidates) > 0:
@@ -40,7 +44,7 @@ def _get_candidate_posts(pair: tuple) -> list:
 
 
 def calculate_candidate_posts(pairs_to_test: list) -> list:
-    """Find candidate posts that contain at least of the given pairs of words.
+    """Find candidate posts that contain at least of the given pairs of words. Return their indices.
 
     This is mainly a wrapper function that distributes the search across all available cores.
 
@@ -67,28 +71,21 @@ def calculate_candidate_posts(pairs_to_test: list) -> list:
     return [c for c_list in candidates if c_list is not None for c in c_list]
 
 
-def get_sentences_from_posts(posts: list) -> list:
-    """Split the given posts into sentences. Return a flat list of all sentences.
+def unique_posts(post_ids: list) -> np.ndarray:
+    """Remove duplicates from the given post indices, including posts with the same text.
+
+    Return the sorted indices of the first occurrence of each post text.
 
     Arguments:
-    posts -- A list of all posts that should be split into sentences.
+    post_ids -- The indices of the posts.
     """
-    global args
-    global nlp
-
-    # Define a spacy processing pipe for all posts to disable unnecessary components
-    posts_pipe = nlp.pipe(
-        tqdm(posts),
-        disable=["ner", "textcat"],
-        n_process=args.processing_cores)
+    global posts
 
-    all_sentences = []
-    for post in posts_pipe:
-        # Split post into sentences and extend the sentence list
-        post_sents = [sent.text for sent in list(post.sents)]
-        all_sentences.extend(post_sents)
+    first_ids = {}
+    for i in sorted(set(post_ids)):
+        first_ids.setdefault(posts[i], i)
 
-    return all_sentences
+    return np.array(sorted(first_ids.values()), dtype=np.int64)
 
 
 def _get_cooccurrence_sentences(pair: tuple) -> tuple:
@@ -143,122 +140,160 @@ def main():
     global posts
     global sentences
 
-    # Read all posts from the given text file; assuming that posts are newline separated
-    with open(args.data, "r") as f:
-        posts = f.read().split("\n")
-
-    # Read all target and associaton tests
-    with open("sbeval/tests/weat_tests.json", "r") as f:
-        weat_tests = json.load(f)
+    trace = Trace("weat_cooccurrence_analysis", vars(args))
+
+    # Intermediate results are checkpointed, so that a crashed run can be resumed; they are only
+    # valid for the same corpus, tests, segmentation and chunk sizes
+    key = checkpoint_key([args.data], {
+        "tests": sorted(args.tests),
+        "segmenter": args.segmenter,
+        "window_size": args.window_size,
+        "post_chunk_size": args.post_chunk_size,
+        "pair_chunk_size": args.pair_chunk_size})
+    checkpoints = Checkpoints(
+        path.join(args.output, "checkpoints", f"weat-cooccurrence-analysis-{key}"))
+    if args.restart:
+        checkpoints.clear()
 
-        # Some of the original WEAT (7 and 8) tests switch the lists of target and association words
-        # For this analysis, we will switch them back again to make the code more streamlined
-        tests_in_wrong_order = [7, 8]
-        for test_number in tests_in_wrong_order:
-            test_X = weat_tests[f"test{test_number}"]["X"]
-            test_Y = weat_tests[f"test{test_number}"]["Y"]
-            test_A = weat_tests[f"test{test_number}"]["A"]
-            test_B = weat_tests[f"test{test_number}"]["B"]
-
-            weat_tests[f"test{test_number}"] = {"X": test_A, "Y": test_B, "A": test_X, "B": test_Y}
-
-        # Include only the specified tests, discard the rest
-        weat_tests = {f"test{i}": weat_tests[f"test{i}"] for i in args.tests}
-
-    # Generate pairs of all target/association word combinations that should be evaluated
-    logging.info("Generating target-association test pairs...")
-    pairs_to_test = []
-    for test in weat_tests.values():
-        associations_A = [a.lower() for a in test["A"]]
-        associations_B = [a.lower() for a in test["B"]]
-        target_x = [t.lower() for t in test["X"]]
-        target_y = [t.lower() for t in test["Y"]]
-
-        combinations_x = product(target_x, [*associations_A, *associations_B])
-        combinations_y = product(target_y, [*associations_A, *associations_B])
-
-        pairs_to_test = [*pairs_to_test, *combinations_x, *combinations_y]
-
-    # Remove duplicate pairs (we only need each pair once)
-    pairs_to_test = list(set(pairs_to_test))
+    # Read all posts from the given text file; assuming that posts are newline separated
+    with trace.stage("loading") as stage:
+        with open(args.data, "r") as f:
+            posts = f.read().split("\n")
+        stage.items = len(posts)
+
+    # Read all target and association tests; the target and association words of the tests that
+    # switch them are switched back, to make the code more streamlined
+    weat_tests = load_cooccurrence_tests(args.tests)
+
+    # Generate pairs of all target/association word combinations that should be evaluated; sorted,
+    # so that the chunks of pairs are the same when a run is resumed
+    with trace.stage("pairs") as stage:
+        logging.info("Generating target-association test pairs...")
+        pairs_to_test = target_attribute_pairs(weat_tests)
+        stage.items = len(pairs_to_test)
 
     # Retrieve candidate posts to make following sentenization easier
-    logging.info("Extracting candidate posts...")
-    candidates = calculate_candidate_posts(pairs_to_test)
-
+    with trace.stage("candidate_posts") as stage:
+        if checkpoints.exists("candidates"):
+            logging.info("Resuming from the checkpointed candidate posts.")
+            candidate_ids = checkpoints.load_array("candidates")
+        else:
+            logging.info("Extracting candidate posts...")
+            # Some candidate posts might contain multiple pairs; thus we need to prune duplicates
+            # before splitting them into sentences
+            candidate_ids = unique_posts(calculate_candidate_posts(pairs_to_test))
+            checkpoints.save_array("candidates", candidate_ids)
+        stage.items = len(posts)
+
+    # Split the candidate posts (or only the windows around co-located pairs) chunk by chunk; only
+    # the sentence offsets are checkpointed
     logging.info("Splitting candidate posts into sentences...")
-    # Some candidate posts might contain multiple pairs; thus we need to prune duplicates before
-    # splitting them into sentences
-    unique_candidates = set(candidates)
-    sentences = get_sentences_from_posts(unique_candidates)
-
-    # Get cooccurrence sentences for each pair
+    with trace.stage("sentence_splitting") as stage:
+        offset_chunks = []
+        for chunk, start in enumerate(range(0, len(candidate_ids), args.post_chunk_size)):
+            name = f"sentences-{chunk:05d}"
+            if checkpoints.exists(name):
+                logging.info(f"Resuming from the checkpointed sentences of chunk {chunk}.")
+            else:
+                checkpoints.save_array(name, sentence_offsets(
+                    nlp,
+                    posts,
+                    candidate_ids[start:start + args.post_chunk_size],
+                    pairs=set(pairs_to_test),
+                    window_size=args.window_size,
+                    n_process=args.processing_cores))
+            offset_chunks.append(checkpoints.load_array(name))
+
+        sentences = [
+            posts[i][start:end] for chunk_offsets in offset_chunks
+            for i, start, end in chunk_offsets]
+        stage.items = len(candidate_ids)
+
+    # Count the cooccurrence sentences of each pair, chunk by chunk
     logging.info("Calculating sentence-based cooccurrences...")
-    cooccurrences_by_pair = calculate_cooccurrences(pairs_to_test)
+    with trace.stage("cooccurrences") as stage:
+        cooccurrences_by_pair = []
+        for chunk, start in enumerate(range(0, len(pairs_to_test), args.pair_chunk_size)):
+            name = f"counts-{chunk:05d}"
+            if checkpoints.exists(name):
+                logging.info(f"Resuming from the checkpointed counts of chunk {chunk}.")
+            else:
+                checkpoints.save_json(name, [
+                    [*pair, len(pair_sentences)]
+                    for pair, pair_sentences in calculate_cooccurrences(
+                        pairs_to_test[start:start + args.pair_chunk_size])])
+            cooccurrences_by_pair.extend(checkpoints.load_json(name))
+        stage.items = len(sentences)
 
     # Unpack cooccurrences
     logging.info("Unpacking cooccurrences into a more useful format...")
-    cooccurrences_by_target = {}
-    # For each pair with cooccurrence sentences...
-    for cooccurrence in cooccurrences_by_pair:
-        # Note: this assumes that the order of the word pairs did not change in previous processing
-        # steps and that the first word of the tuple represents a target word
-        target_word = cooccurrence[0][0]
-        association_word = cooccurrence[0][1]
-
-        # If the target word does not yet have an entry in the cooccurrence dict, add one
-        if target_word not in cooccurrences_by_target.keys():
-            cooccurrences_by_target[target_word] = {}
-
-        # Count the number of sentences the target and association word cooccur with each other
-        cooccurrences_by_target[target_word][association_word] = len(cooccurrence[1])
-
-    # Sort co-occurrence counts by weat tests
-    cooccurrences_by_test = {}
-    for i in args.tests:
-        test_data = weat_tests[f"test{i}"]
-        test_associations = [assoc.lower() for assoc in [*test_data["A"], *test_data["B"]]]
-
-        # Lowercase all target words
-        test_data["X"] = [x.lower() for x in test_data["X"]]
-        test_data["Y"] = [y.lower() for y in test_data["Y"]]
-
-        target_x_associations = {}
-        target_y_associations = {}
-
-        # For each X target word in the current test...
-        for x in test_data["X"]:
-            # If current word has any sentence co-occurrences, add it to the final dictionary
-            if x in cooccurrences_by_target.keys():
-                target_associations = {
-                    key: value
-                    for key, value in cooccurrences_by_target[x].items()
-                    if key in test_associations}
-
-                if len(target_associations.keys()) > 0:
-                    target_x_associations[x] = target_associations
-
-        # For each Y target word in the current test...
-        for y in test_data["Y"]:
-            # If current word has any sentence co-occurrences, add it to the final dictionary
-            if y in cooccurrences_by_target.keys():
-                target_associations = {
-                    key: value
-                    for key, value in cooccurrences_by_target[y].items()
-                    if key in test_associations}
-
-                if len(target_associations.keys()) > 0:
-                    target_y_associations[y] = target_associations
-
-        cooccurrences_by_test[f"test{i}"] = {"X": target_x_associations, "Y": target_y_associations}
+    with trace.stage("aggregation") as stage:
+        cooccurrences_by_target = {}
+        # For each pair with cooccurrence sentences...
+        # Note: this assumes that the order of the word pairs did not change in previous
+        # processing steps and that the first word of the pair represents a target word
+        for target_word, association_word, count in cooccurrences_by_pair:
+            # If the target word does not yet have an entry in the cooccurrence dict, add one
+            if target_word not in cooccurrences_by_target.keys():
+                cooccurrences_by_target[target_word] = {}
+
+            # Count the number of sentences the target and association word cooccur with each other
+            cooccurrences_by_target[target_word][association_word] = count
+
+        # Sort co-occurrence counts by weat tests
+        cooccurrences_by_test = {}
+        for i in args.tests:
+            test_data = weat_tests[f"test{i}"]
+            test_associations = [assoc.lower() for assoc in [*test_data["A"], *test_data["B"]]]
+
+            # Lowercase all target words
+            test_data["X"] = [x.lower() for x in test_data["X"]]
+            test_data["Y"] = [y.lower() for y in test_data["Y"]]
+
+            target_x_associations = {}
+            target_y_associations = {}
+
+            # For each X target word in the current test...
+            for x in test_data["X"]:
+                # If current word has any sentence co-occurrences, add it to the final dictionary
+                if x in cooccurrences_by_target.keys():
+                    target_associations = {
+                        key: value
+                        for key, value in cooccurrences_by_target[x].items()
+                        if key in test_associations}
+
+                    if len(target_associations.keys()) > 0:
+                        target_x_associations[x] = target_associations
+
+            # For each Y target word in the current test...
+            for y in test_data["Y"]:
+                # If current word has any sentence co-occurrences, add it to the final dictionary
+                if y in cooccurrences_by_target.keys():
+                    target_associations = {
+                        key: value
+                        for key, value in cooccurrences_by_target[y].items()
+                        if key in test_associations}
+
+                    if len(target_associations.keys()) > 0:
+                        target_y_associations[y] = target_associations
+
+            cooccurrences_by_test[f"test{i}"] = {
+                "X": target_x_associations, "Y": target_y_associations}
+        stage.items = len(cooccurrences_by_pair)
 
     # Export statistics to file
     dt = datetime.today().strftime("%Y%m%d%H%M%S")
     output_file = path.join(args.output, f"weat-cooccurrence-analysis_results-{dt}.json")
 
     logging.info(f"Exporting results to disk at {output_file}.")
-    with open(output_file, "w") as f:
-        json.dump({"corpus": path.basename(args.data), **cooccurrences_by_test}, f, indent=4)
+    with trace.stage("export"):
+        with open(output_file, "w") as f:
+            json.dump({"corpus": path.basename(args.data), **cooccurrences_by_test}, f, indent=4)
+
+    trace.save(output_file)
+
+    # The run is complete, so its intermediate results are not needed anymore
+    checkpoints.clear()
 
 
 if __name__ == "__main__":
@@ -298,6 +333,45 @@ if __name__ == "__main__":
              "(whitespace separated).",
         type=int,
         metavar="TESTS_TO_INCLUDE")
+    parser.add_argument(
+        "-s",
+        "--segmenter",
+        default="parser",
+        choices=SEGMENTERS,
+        help="How to find sentence boundaries: with spacy's dependency parser or with its faster, "
+             "rule-based sentencizer, which splits on punctuation only. See "
+             "'segmentation_comparison.py' for how much the results differ.",
+        metavar="SEGMENTER")
+    parser.add_argument(
+        "-w",
+        "--window_size",
+        default=None,
+        type=int,
+        help="If given, only the spans around target and association words that are at most this "
+             "many tokens apart are split into sentences, instead of the whole candidate posts. "
+             "Co-occurrences in the same sentence, but further apart, are not counted.",
+        metavar="WINDOW_SIZE")
+    parser.add_argument(
+        "--post_chunk_size",
+        default=10000,
+        type=int,
+        help="The number of candidate posts that are split into sentences and checkpointed at "
+             "once.",
+        metavar="POST_CHUNK_SIZE")
+    parser.add_argument(
+        "--pair_chunk_size",
+        default=1000,
+        type=int,
+        help="The number of pairs whose co-occurrences are counted and checkpointed at once.",
+        metavar="PAIR_CHUNK_SIZE")
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Discard the checkpoints of a previous, incomplete run with the same corpus and "
+             "parameters instead of resuming it. Checkpoints are stored in a 'checkpoints' "
+             "directory in the output directory and removed after a run completed.")
+
+    add_profile_argument(parser)
 
     args = parser.parse_args()
 
@@ -307,7 +381,8 @@ if __name__ == "__main__":
         "Please make sure that your input texts are whitespace separated tokens. The script might "
         "not work correctly otherwise.")
 
-    nlp = spacy.load("en_core_web_sm")
+    nlp = load_segmenter(args.segmenter)
 
-    main()
+    with profiled(args.profile, "weat_cooccurrence_analysis"):
+        main()
     print("Done.")
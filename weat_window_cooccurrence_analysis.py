@@ -0,0 +1,163 @@
+import argparse
+import json
+import logging
+
+from datetime import datetime
+from os import cpu_count, path
+
+from sbeval.constants import LOGGING_CONFIG
+from sbeval.cooccurrence import GLOVE_WINDOW_SIZE, count_window_cooccurrences
+from sbeval.glove_files import cooccurrence_submatrix, read_vocab_words
+from sbeval.instrumentation import Trace
+from sbeval.lexicons import load_cooccurrence_tests
+from sbeval.profiling import add_profile_argument, profiled
+
+
+def main():
+    trace = Trace("weat_window_cooccurrence_analysis", vars(args))
+
+    # The target and association words of the tests that switch them are switched back
+    weat_tests = load_cooccurrence_tests(args.tests)
+    words = sorted({
+        word for test in weat_tests.values() for key in ["X", "Y", "A", "B"] for word in test[key]})
+    index = {word: i for i, word in enumerate(words)}
+
+    if args.cooccurrence_file:
+        # GloVe's co-occurrence file already holds the weighted counts of the whole vocabulary
+        logging.info(f"Reading co-occurrences from {args.cooccurrence_file}...")
+        with trace.stage("cooccurrences") as stage:
+            weighted = cooccurrence_submatrix(args.cooccurrence_file, words, words, args.vocab)
+            raw = None
+            stage.items = len(words)
+    else:
+        # Words that are not in the vocabulary of the GloVe model are skipped, just as `cooccur`
+        # does
+        vocab = None
+        if args.vocab:
+            with trace.stage("vocab") as stage:
+                logging.info(f"Reading vocabulary from {args.vocab}...")
+                vocab = set(read_vocab_words(args.vocab))
+                stage.items = len(vocab)
+
+        logging.info(f"Counting co-occurrences in a window of {args.window_size} words...")
+        with trace.stage("cooccurrences") as stage:
+            raw, weighted = count_window_cooccurrences(
+                args.data,
+                words,
+                window_size=args.window_size,
+                vocab=vocab,
+                chunk_bytes=args.chunk_size * 2 ** 20,
+                n_process=args.processing_cores)
+            stage.items = len(words)
+
+    # Sort co-occurrence counts by weat tests; only pairs that co-occur at all are listed
+    cooccurrences_by_test = {}
+    for test_name, test in weat_tests.items():
+        associations = [*test["A"], *test["B"]]
+        cooccurrences_by_test[test_name] = {}
+        for target_key in ["X", "Y"]:
+            target_associations = {}
+            for target in test[target_key]:
+                counts = {}
+                for association in associations:
+                    i, j = index[target], index[association]
+                    if weighted[i, j] > 0:
+                        # The raw counts are not available from GloVe's co-occurrence file
+                        counts[association] = {"weighted": float(weighted[i, j])} if raw is None \
+                            else {"count": int(raw[i, j]), "weighted": float(weighted[i, j])}
+                if counts:
+                    target_associations[target] = counts
+            cooccurrences_by_test[test_name][target_key] = target_associations
+
+    # Export statistics to file
+    dt = datetime.today().strftime("%Y%m%d%H%M%S")
+    output_file = path.join(args.output, f"weat-window-cooccurrence-analysis_results-{dt}.json")
+
+    logging.info(f"Exporting results to disk at {output_file}.")
+    with open(output_file, "w") as f:
+        json.dump({
+            "corpus": path.basename(args.data or args.cooccurrence_file),
+            "window_size": None if args.cooccurrence_file else args.window_size,
+            "vocab": path.basename(args.vocab) if args.vocab else None,
+            **cooccurrences_by_test}, f, indent=4)
+
+    trace.save(output_file)
+
+
+if __name__ == "__main__":
+    # Add cli parameters
+    parser = argparse.ArgumentParser(
+        "A script to count the co-occurrences of the WEAT target and association words within the "
+        "same context window as GloVe, both raw and weighted by the inverse distance of the words.")
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "-d",
+        "--data",
+        type=str,
+        help="Path to the corpus. Expects one whitespace separated post per line.",
+        metavar="DATA_PATH")
+    source.add_argument(
+        "-b",
+        "--cooccurrence_file",
+        type=str,
+        help="Path to the co-occurrence file GloVe wrote for the corpus "
+             "(`$PREFIX-cooccurrence.bin`). Only the weighted counts, with the window size GloVe "
+             "was run with, are available then.",
+        metavar="COOCCURRENCE_FILE")
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=str,
+        help="Path to the directory where the result file should be saved to.",
+        metavar="OUTPUT_DIR")
+    parser.add_argument(
+        "-t",
+        "--tests",
+        required=True,
+        nargs='+',
+        help="A list of test numbers (from 1 to 10) whose pairs should be counted "
+             "(whitespace separated).",
+        type=int,
+        metavar="TESTS_TO_INCLUDE")
+    parser.add_argument(
+        "-w",
+        "--window_size",
+        default=GLOVE_WINDOW_SIZE,
+        type=int,
+        help="The number of context words to the left and to the right of a word; the default is "
+             "the window size the GloVe models are trained with.",
+        metavar="WINDOW_SIZE")
+    parser.add_argument(
+        "-v",
+        "--vocab",
+        default=None,
+        type=str,
+        help="Path to the vocabulary file of the GloVe model trained on the corpus. If given, "
+             "words that are not in the vocabulary are skipped before counting, as GloVe does. "
+             "Defaults to the matching `$PREFIX-vocab.txt` for a co-occurrence file.",
+        metavar="VOCAB_FILE")
+    parser.add_argument(
+        "-c",
+        "--processing_cores",
+        default=cpu_count() - 1,
+        type=int,
+        help="The number of processing cores to count the chunks of the corpus with.",
+        metavar="PROCESSING_CORES")
+    parser.add_argument(
+        "--chunk_size",
+        default=32,
+        type=int,
+        help="The size of the chunks of the corpus that are counted at once, in MiB.",
+        metavar="CHUNK_SIZE")
+
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(**LOGGING_CONFIG)
+
+    with profiled(args.profile, "weat_window_cooccurrence_analysis"):
+        main()
+    print("Done.")